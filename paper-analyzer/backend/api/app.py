@@ -4,19 +4,34 @@ FastAPI Application - Main API Server
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
+import os
 import shutil
+import threading
+import time
 import uuid
 from pathlib import Path
 import json
 from datetime import datetime
 
 from config import settings
-from parsers import PaperParser, ParsedPaper
+from parsers import PaperParser, ParsedPaper, ParsedPaperCache, ParseSandbox, ParseFailure, copy_and_hash
 from visualization_engine import VisualizationEngine
 from extractors import (
     get_llm_client,
+    get_llm_stats,
+    get_llm_limiter_stats,
+    get_llm_retry_stats,
+    get_llm_usage_stats,
+    get_llm_cache_stats,
+    invalidate_llm_cache,
+    close_llm_client,
+    ContextBudget,
     ContributionExtractor,
     ExperimentExtractor,
     ArchitectureExtractor,
@@ -53,12 +68,38 @@ from extractors import (
     KeyClaim
 )
 from aggregation import AggregationEngine
+from ingest import BulkIngester, PaperIndex, write_paper_metadata
+from api.single_flight import SingleFlight
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """App startup/shutdown hooks"""
+    global _parse_executor, _readiness_task
+    if settings.llm_readiness_probe:
+        # Off the request path: the first extraction finds the client built
+        _readiness_task = asyncio.create_task(probe_llm_readiness())
+    yield
+    if _readiness_task is not None:
+        _readiness_task.cancel()
+        _readiness_task = None
+    # Release parser worker processes
+    if _paper_parser is not None:
+        _paper_parser.close()
+    if _parse_sandbox is not None:
+        _parse_sandbox.close()
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False)
+        _parse_executor = None
+    # Close pooled LLM connections
+    await close_llm_client()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Research Paper Analyzer API",
     description="AI-powered paper analysis using AWS Bedrock + LangChain",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Middleware
@@ -78,6 +119,17 @@ EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize components (lazy loading)
 _paper_parser = None
+_paper_index = None
+_bulk_ingester = None
+_parse_executor = None
+_parse_sandbox = None
+_parse_jobs: Dict[str, Dict[str, Any]] = {}  # job_id -> status of background parses (see prune_parse_jobs())
+_parse_tasks: Dict[str, asyncio.Task] = {}  # paper_id -> running background parse (also keeps it referenced)
+_pending_uploads: Dict[str, str] = {}  # content_hash -> paper_id of uploads stored but not yet indexed
+_pending_uploads_lock = threading.Lock()
+_single_flight = None
+_readiness_task = None
+_llm_readiness: Dict[str, Any] = {"status": "disabled"}  # see probe_llm_readiness()
 _contribution_extractor = None
 _experiment_extractor = None
 _architecture_extractor = None
@@ -101,10 +153,97 @@ def get_paper_parser() -> PaperParser:
     """Get or create paper parser"""
     global _paper_parser
     if _paper_parser is None:
-        _paper_parser = PaperParser()
+        _paper_parser = PaperParser(
+            cache=ParsedPaperCache(settings.parse_cache_dir),
+            workers=settings.parse_workers,
+            parallel_min_pages=settings.parse_parallel_min_pages,
+            disk_text=settings.parse_disk_text
+        )
     return _paper_parser
 
 
+def get_parse_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded pool that runs uploads/parsing off the event loop"""
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ThreadPoolExecutor(
+            max_workers=settings.parse_executor_workers,
+            thread_name_prefix="parse"
+        )
+    return _parse_executor
+
+
+def get_parse_sandbox() -> ParseSandbox:
+    """Get or create the supervised worker processes that parse uploaded PDFs"""
+    global _parse_sandbox
+    if _parse_sandbox is None:
+        _parse_sandbox = ParseSandbox(
+            workers=settings.parse_sandbox_workers,
+            timeout=settings.parse_timeout_seconds,
+            max_rss_mb=settings.parse_max_rss_mb,
+            max_jobs_per_worker=settings.parse_worker_max_jobs
+        )
+    return _parse_sandbox
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create the coalescer for concurrent requests of the same extraction"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight(EXTRACTED_DIR / ".locks")
+    return _single_flight
+
+
+def parse_pdf_file(pdf_path: Path, paper_id: str, content_hash: Optional[str] = None) -> ParsedPaper:
+    """
+    Full parse of an uploaded PDF (blocking)
+    
+    Runs in the parse sandbox unless PARSE_SANDBOX is off, so a PDF that hangs
+    PyMuPDF or balloons its memory fails with ParseFailure instead of taking
+    the API process down.
+    """
+    parser = get_paper_parser()
+    if not settings.parse_sandbox:
+        return parser.parse_pdf(str(pdf_path), paper_id, content_hash)
+    return get_parse_sandbox().parse_pdf(parser, str(pdf_path), paper_id, content_hash)
+
+
+def quick_parse_file(pdf_path: Path, paper_id: str) -> ParsedPaper:
+    """Leading-page parse of an uploaded PDF, sandboxed like parse_pdf_file (blocking)"""
+    parser = get_paper_parser()
+    if not settings.parse_sandbox:
+        return parser.quick_parse(str(pdf_path), paper_id, settings.quick_parse_pages)
+    return get_parse_sandbox().quick_parse(parser, str(pdf_path), paper_id, settings.quick_parse_pages)
+
+
+async def run_in_parse_executor(func, *args):
+    """Await a blocking call (file I/O, PDF parsing) on the parse pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), func, *args)
+
+
+def get_paper_index() -> PaperIndex:
+    """Get or create content-hash index of ingested papers"""
+    global _paper_index
+    if _paper_index is None:
+        _paper_index = PaperIndex(EXTRACTED_DIR / "paper_index.json")
+    return _paper_index
+
+
+def get_bulk_ingester() -> BulkIngester:
+    """Get or create bulk ingester"""
+    global _bulk_ingester
+    if _bulk_ingester is None:
+        _bulk_ingester = BulkIngester(
+            upload_dir=UPLOAD_DIR,
+            extracted_dir=EXTRACTED_DIR,
+            cache_dir=settings.parse_cache_dir,
+            index=get_paper_index(),
+            workers=settings.ingest_workers
+        )
+    return _bulk_ingester
+
+
 def get_contribution_extractor() -> ContributionExtractor:
     """Get or create contribution extractor"""
     global _contribution_extractor
@@ -253,6 +392,8 @@ class PaperResponse(BaseModel):
     authors: List[str]
     num_pages: int
     status: str = "processed"
+    duplicate: bool = False  # True if this PDF was already uploaded
+    extractions: Dict[str, Any] = {}  # cached extractions of the existing paper
 
 
 class ContributionResponse(BaseModel):
@@ -303,18 +444,225 @@ class VisualizeRequest(BaseModel):
 # Helper Functions
 # ============================================================================
 
+def copy_to_path(src, dest: Path) -> None:
+    """Copy an uploaded file object to disk (blocking)"""
+    with dest.open("wb") as buffer:
+        shutil.copyfileobj(src, buffer)
+
+
+def store_upload(src, paper_id: str, filename: str) -> tuple:
+    """
+    Stream an upload to disk while hashing it (blocking)
+    
+    A new PDF is recorded as pending under its hash until its full parse is
+    indexed (or fails, see release_pending_upload()), so the same PDF
+    uploaded again meanwhile maps to this paper instead of being parsed twice.
+    
+    Returns:
+        (content_hash, PaperResponse of the existing paper if this PDF was uploaded before)
+    """
+    file_path = UPLOAD_DIR / f"{paper_id}.pdf"
+    
+    # Save uploaded file, hashing it as it streams to disk
+    partial_path = file_path.with_suffix(".pdf.part")
+    try:
+        with partial_path.open("wb") as buffer:
+            content_hash = copy_and_hash(src, buffer)
+    except Exception as e:
+        partial_path.unlink(missing_ok=True)
+        raise HTTPException(500, f"Failed to save file: {str(e)}")
+    
+    # Same bytes uploaded before, or still being parsed: reuse that paper and everything extracted from it
+    with _pending_uploads_lock:
+        pending_id = _pending_uploads.get(content_hash)
+        existing_id = pending_id or get_paper_index().get(content_hash)
+        existing = load_parsed_paper(existing_id) if existing_id else None
+        if not existing and not pending_id:
+            _pending_uploads[content_hash] = paper_id
+    if existing or pending_id:
+        partial_path.unlink()
+        print(f"♻️  Duplicate upload of {existing_id} ({filename})")
+        if not existing:
+            # Its quick parse has not saved metadata yet
+            return content_hash, PaperResponse(paper_id=existing_id, title="", abstract="", authors=[],
+                                               num_pages=0, status="parsing", duplicate=True)
+        extractions = {name: items for name, items in load_all_extractions(existing_id).items() if items}
+        return content_hash, PaperResponse(
+            paper_id=existing_id,
+            title=existing["title"],
+            abstract=existing["abstract"],
+            authors=existing["authors"],
+            num_pages=existing["num_pages"],
+            status="parsing" if existing.get("metadata", {}).get("partial") else "processed",
+            duplicate=True,
+            extractions=extractions
+        )
+    
+    partial_path.replace(file_path)
+    return content_hash, None
+
+
+def release_pending_upload(content_hash: str, paper_id: str) -> None:
+    """Stop answering uploads of content_hash with paper_id from the pending map (indexed or failed)"""
+    with _pending_uploads_lock:
+        if _pending_uploads.get(content_hash) == paper_id:
+            del _pending_uploads[content_hash]
+
+
+def quick_parse_upload(paper_id: str, content_hash: str, filename: str) -> PaperResponse:
+    """Parse only the leading pages of a stored upload and save that metadata (blocking)"""
+    file_path = UPLOAD_DIR / f"{paper_id}.pdf"
+    try:
+        paper = quick_parse_file(file_path, paper_id)
+        save_parsed_paper(paper)
+    except ParseFailure as e:
+        file_path.unlink()
+        release_pending_upload(content_hash, paper_id)
+        raise HTTPException(422, f"Failed to parse PDF: {str(e)}")
+    except Exception as e:
+        file_path.unlink()  # Clean up file
+        release_pending_upload(content_hash, paper_id)
+        raise HTTPException(500, f"Failed to parse PDF: {str(e)}")
+    
+    print(f"⚡ Quick-parsed {filename} ({paper.num_pages} pages), full parse continues in background")
+    return PaperResponse(
+        paper_id=paper.paper_id,
+        title=paper.title,
+        abstract=paper.abstract,
+        authors=paper.authors,
+        num_pages=paper.num_pages,
+        status="parsing"
+    )
+
+
+def parse_upload(paper_id: str, content_hash: str, filename: str) -> PaperResponse:
+    """Parse a stored upload, save its metadata and index it (blocking)"""
+    file_path = UPLOAD_DIR / f"{paper_id}.pdf"
+    try:
+        paper = parse_pdf_file(file_path, paper_id, content_hash)
+        save_parsed_paper(paper)
+        get_paper_index().add(content_hash, paper_id, source=filename)
+    except ParseFailure as e:
+        file_path.unlink()
+        raise HTTPException(422, f"Failed to parse PDF: {str(e)}")
+    except Exception as e:
+        file_path.unlink()  # Clean up file
+        raise HTTPException(500, f"Failed to parse PDF: {str(e)}")
+    finally:
+        # Indexed or gone: either way the index now answers for this hash
+        release_pending_upload(content_hash, paper_id)
+    
+    return PaperResponse(
+        paper_id=paper.paper_id,
+        title=paper.title,
+        abstract=paper.abstract,
+        authors=paper.authors,
+        num_pages=paper.num_pages,
+        status="processed"
+    )
+
+
+async def run_parse_job(job_id: str, paper_id: str, content_hash: str, filename: str) -> None:
+    """Background parse for 202-style uploads; records the outcome in _parse_jobs"""
+    job = _parse_jobs[job_id]
+    job["status"] = "running"
+    try:
+        result = await run_in_parse_executor(parse_upload, paper_id, content_hash, filename)
+        job.update(status="processed", result=result.model_dump())
+    except HTTPException as e:
+        job.update(status="failed", error=e.detail)
+    except Exception as e:
+        job.update(status="failed", error=str(e))
+    job["finished_at"] = time.time()
+    if job["status"] == "failed":
+        # Drop quick-parse metadata that would otherwise stay "parsing" forever
+        (EXTRACTED_DIR / f"{paper_id}_paper.json").unlink(missing_ok=True)
+        print(f"❌ Background parse of {paper_id} failed: {job['error']}")
+
+
+def prune_parse_jobs() -> None:
+    """Forget finished jobs older than PARSE_JOB_TTL_SECONDS, and the oldest beyond PARSE_JOB_MAX_FINISHED"""
+    now = time.time()
+    finished = sorted((job["finished_at"], job_id) for job_id, job in _parse_jobs.items() if "finished_at" in job)
+    excess = len(finished) - settings.parse_job_max_finished
+    for i, (finished_at, job_id) in enumerate(finished):
+        if i < excess or now - finished_at > settings.parse_job_ttl_seconds:
+            del _parse_jobs[job_id]
+
+
+def start_parse_job(paper_id: str, content_hash: str, filename: str) -> Dict[str, Any]:
+    """Schedule a full parse on the parse pool; the job id is the paper id"""
+    prune_parse_jobs()
+    _parse_jobs[paper_id] = {"job_id": paper_id, "paper_id": paper_id, "status": "queued"}
+    task = asyncio.create_task(run_parse_job(paper_id, paper_id, content_hash, filename))
+    _parse_tasks[paper_id] = task
+    task.add_done_callback(lambda _: _parse_tasks.pop(paper_id, None))
+    return _parse_jobs[paper_id]
+
+
+async def load_full_paper(paper_id: str, pdf_path: Path) -> ParsedPaper:
+    """
+    Fully parsed paper for extraction
+    
+    Waits for the paper's background parse if one is still running, so the
+    result comes from the parse cache instead of parsing the PDF twice.
+    """
+    pending = _parse_tasks.get(paper_id)
+    if pending is not None:
+        await asyncio.wait({pending})
+    paper = await run_in_parse_executor(parse_pdf_file, pdf_path, paper_id)
+    
+    # Background parse lost (e.g. server restart): replace the quick-parse metadata now
+    paper_data = load_parsed_paper(paper_id)
+    if paper_data and paper_data.get("metadata", {}).get("partial"):
+        save_parsed_paper(paper)
+    return paper
+
+
+async def extract_once(paper_id: str, pdf_path: Path, extractor: Any,
+                       load: Callable[[str], Optional[List[Any]]],
+                       save: Callable[[str, List[Any]], None]) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Run an extractor on a paper once, however many requests ask for it concurrently
+    
+    Requests for the same (paper, extractor, version) share one extraction,
+    in this worker and across workers (see SingleFlight).
+    
+    Args:
+        paper_id: Paper to extract from
+        pdf_path: The paper's PDF
+        extractor: LLMExtractor instance
+        load: The extraction's load_* function (dicts or dataclass items)
+        save: The extraction's save_* function
+        
+    Returns:
+        (items as dicts, True if another worker had already saved them)
+    """
+    def saved() -> Optional[List[Dict[str, Any]]]:
+        items = load(paper_id)
+        return [item if isinstance(item, dict) else item.to_dict() for item in items] if items else None
+    
+    async def compute() -> List[Dict[str, Any]]:
+        paper = await load_full_paper(paper_id, pdf_path)
+        items = await extractor.extract_async(paper)
+        save(paper_id, items)
+        return [item.to_dict() for item in items]
+    
+    key = (paper_id, type(extractor).__name__, extractor.VERSION)
+    return await get_single_flight().run(key, compute, saved)
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temporary file, so concurrent readers never see a partial file"""
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 def save_parsed_paper(paper: ParsedPaper) -> None:
     """Save parsed paper metadata to JSON"""
-    paper_file = EXTRACTED_DIR / f"{paper.paper_id}_paper.json"
-    with open(paper_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            "paper_id": paper.paper_id,
-            "title": paper.title,
-            "authors": paper.authors,
-            "abstract": paper.abstract,
-            "num_pages": paper.num_pages,
-            "metadata": paper.metadata
-        }, f, indent=2, ensure_ascii=False)
+    write_paper_metadata(EXTRACTED_DIR, paper)
 
 
 def load_parsed_paper(paper_id: str) -> Optional[Dict]:
@@ -329,8 +677,7 @@ def load_parsed_paper(paper_id: str) -> Optional[Dict]:
 def save_contributions(paper_id: str, contributions: List[Contribution]) -> None:
     """Save contributions to JSON"""
     contrib_file = EXTRACTED_DIR / f"{paper_id}_contributions.json"
-    with open(contrib_file, 'w', encoding='utf-8') as f:
-        json.dump([c.to_dict() for c in contributions], f, indent=2, ensure_ascii=False)
+    write_json_atomic(contrib_file, [c.to_dict() for c in contributions])
 
 
 def load_contributions(paper_id: str) -> Optional[List[Dict]]:
@@ -345,8 +692,7 @@ def load_contributions(paper_id: str) -> Optional[List[Dict]]:
 def save_experiments(paper_id: str, experiments: List[Experiment]) -> None:
     """Save experiments to JSON"""
     exp_file = EXTRACTED_DIR / f"{paper_id}_experiments.json"
-    with open(exp_file, 'w', encoding='utf-8') as f:
-        json.dump([e.to_dict() for e in experiments], f, indent=2, ensure_ascii=False)
+    write_json_atomic(exp_file, [e.to_dict() for e in experiments])
 
 
 def load_experiments(paper_id: str) -> Optional[List[Dict]]:
@@ -361,8 +707,7 @@ def load_experiments(paper_id: str) -> Optional[List[Dict]]:
 def save_architectures(paper_id: str, architectures: List[Architecture]) -> None:
     """Save architectures to JSON"""
     arch_file = EXTRACTED_DIR / f"{paper_id}_architectures.json"
-    with open(arch_file, 'w', encoding='utf-8') as f:
-        json.dump([a.to_dict() for a in architectures], f, indent=2, ensure_ascii=False)
+    write_json_atomic(arch_file, [a.to_dict() for a in architectures])
 
 
 def load_architectures(paper_id: str) -> Optional[List[Architecture]]:
@@ -378,8 +723,7 @@ def load_architectures(paper_id: str) -> Optional[List[Architecture]]:
 def save_hyperparameters(paper_id: str, hyperparams: List[HyperparameterSet]) -> None:
     """Save hyperparameters to JSON"""
     hyper_file = EXTRACTED_DIR / f"{paper_id}_hyperparameters.json"
-    with open(hyper_file, 'w', encoding='utf-8') as f:
-        json.dump([h.to_dict() for h in hyperparams], f, indent=2, ensure_ascii=False)
+    write_json_atomic(hyper_file, [h.to_dict() for h in hyperparams])
 
 
 def load_hyperparameters(paper_id: str) -> Optional[List[HyperparameterSet]]:
@@ -395,8 +739,7 @@ def load_hyperparameters(paper_id: str) -> Optional[List[HyperparameterSet]]:
 def save_ablations(paper_id: str, ablations: List[AblationStudy]) -> None:
     """Save ablation studies to JSON"""
     abl_file = EXTRACTED_DIR / f"{paper_id}_ablations.json"
-    with open(abl_file, 'w', encoding='utf-8') as f:
-        json.dump([a.to_dict() for a in ablations], f, indent=2, ensure_ascii=False)
+    write_json_atomic(abl_file, [a.to_dict() for a in ablations])
 
 
 def load_ablations(paper_id: str) -> Optional[List[AblationStudy]]:
@@ -412,8 +755,7 @@ def load_ablations(paper_id: str) -> Optional[List[AblationStudy]]:
 def save_baselines(paper_id: str, baselines: List[Baseline]) -> None:
     """Save baselines to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_baselines.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([b.to_dict() for b in baselines], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [b.to_dict() for b in baselines])
 
 
 def load_baselines(paper_id: str) -> Optional[List[Baseline]]:
@@ -429,8 +771,7 @@ def load_baselines(paper_id: str) -> Optional[List[Baseline]]:
 def save_equations(paper_id: str, equations: List[Equation]) -> None:
     """Save equations to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_equations.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([e.to_dict() for e in equations], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [e.to_dict() for e in equations])
 
 
 def load_equations(paper_id: str) -> Optional[List[Equation]]:
@@ -446,8 +787,7 @@ def load_equations(paper_id: str) -> Optional[List[Equation]]:
 def save_algorithms(paper_id: str, algorithms: List[Algorithm]) -> None:
     """Save algorithms to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_algorithms.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([a.to_dict() for a in algorithms], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [a.to_dict() for a in algorithms])
 
 
 def load_algorithms(paper_id: str) -> Optional[List[Algorithm]]:
@@ -463,8 +803,7 @@ def load_algorithms(paper_id: str) -> Optional[List[Algorithm]]:
 def save_limitations(paper_id: str, limitations: List[Limitation]) -> None:
     """Save limitations to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_limitations.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([l.to_dict() for l in limitations], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [l.to_dict() for l in limitations])
 
 
 def load_limitations(paper_id: str) -> Optional[List[Limitation]]:
@@ -480,8 +819,7 @@ def load_limitations(paper_id: str) -> Optional[List[Limitation]]:
 def save_future_work(paper_id: str, items: List[FutureWorkItem]) -> None:
     """Save future work to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_future_work.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([i.to_dict() for i in items], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [i.to_dict() for i in items])
 
 
 def load_future_work(paper_id: str) -> Optional[List[FutureWorkItem]]:
@@ -497,8 +835,7 @@ def load_future_work(paper_id: str) -> Optional[List[FutureWorkItem]]:
 def save_code_resources(paper_id: str, resources: List[CodeResource]) -> None:
     """Save code resources to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_code_resources.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([r.to_dict() for r in resources], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [r.to_dict() for r in resources])
 
 
 def load_code_resources(paper_id: str) -> Optional[List[CodeResource]]:
@@ -514,8 +851,7 @@ def load_code_resources(paper_id: str) -> Optional[List[CodeResource]]:
 def save_datasets(paper_id: str, datasets: List[Dataset]) -> None:
     """Save datasets to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_datasets.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([d.to_dict() for d in datasets], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [d.to_dict() for d in datasets])
 
 
 def load_datasets(paper_id: str) -> Optional[List[Dataset]]:
@@ -531,8 +867,7 @@ def load_datasets(paper_id: str) -> Optional[List[Dataset]]:
 def save_loss_functions(paper_id: str, losses: List[LossFunction]) -> None:
     """Save loss functions to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_loss_functions.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([l.to_dict() for l in losses], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [l.to_dict() for l in losses])
 
 
 def load_loss_functions(paper_id: str) -> Optional[List[LossFunction]]:
@@ -548,8 +883,7 @@ def load_loss_functions(paper_id: str) -> Optional[List[LossFunction]]:
 def save_metrics(paper_id: str, metrics: List[EvaluationMetric]) -> None:
     """Save evaluation metrics to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_metrics.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([m.to_dict() for m in metrics], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [m.to_dict() for m in metrics])
 
 
 def load_metrics(paper_id: str) -> Optional[List[EvaluationMetric]]:
@@ -565,8 +899,7 @@ def load_metrics(paper_id: str) -> Optional[List[EvaluationMetric]]:
 def save_training(paper_id: str, procedures: List[TrainingProcedure]) -> None:
     """Save training procedures to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_training.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([p.to_dict() for p in procedures], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [p.to_dict() for p in procedures])
 
 
 def load_training(paper_id: str) -> Optional[List[TrainingProcedure]]:
@@ -582,8 +915,7 @@ def load_training(paper_id: str) -> Optional[List[TrainingProcedure]]:
 def save_related_work(paper_id: str, works: List[RelatedWork]) -> None:
     """Save related work to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_related_work.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([w.to_dict() for w in works], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [w.to_dict() for w in works])
 
 
 def load_related_work(paper_id: str) -> Optional[List[RelatedWork]]:
@@ -599,8 +931,7 @@ def load_related_work(paper_id: str) -> Optional[List[RelatedWork]]:
 def save_claims(paper_id: str, claims: List[KeyClaim]) -> None:
     """Save key claims to JSON"""
     file_path = EXTRACTED_DIR / f"{paper_id}_claims.json"
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump([c.to_dict() for c in claims], f, indent=2, ensure_ascii=False)
+    write_json_atomic(file_path, [c.to_dict() for c in claims])
 
 
 def load_claims(paper_id: str) -> Optional[List[KeyClaim]]:
@@ -613,6 +944,36 @@ def load_claims(paper_id: str) -> Optional[List[KeyClaim]]:
         return [KeyClaim(**item) for item in data]
 
 
+# Extraction name -> loader, in the order they are reported
+EXTRACTION_LOADERS = {
+    "contributions": load_contributions,
+    "experiments": load_experiments,
+    "architectures": load_architectures,
+    "hyperparameters": load_hyperparameters,
+    "ablations": load_ablations,
+    "baselines": load_baselines,
+    "datasets": load_datasets,
+    "limitations": load_limitations,
+    "future_work": load_future_work,
+    "algorithms": load_algorithms,
+    "equations": load_equations,
+    "training": load_training,
+    "metrics": load_metrics,
+    "loss_functions": load_loss_functions,
+    "related_work": load_related_work,
+    "claims": load_claims,
+    "code_resources": load_code_resources,
+}
+
+
+def load_all_extractions(paper_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Load every cached extraction of a paper as plain dicts (empty list if not extracted)"""
+    return {
+        name: [item.to_dict() if hasattr(item, 'to_dict') else item for item in (loader(paper_id) or [])]
+        for name, loader in EXTRACTION_LOADERS.items()
+    }
+
+
 # ============================================================================
 # API Routes
 # ============================================================================
@@ -628,9 +989,32 @@ def root():
     }
 
 
+async def probe_llm_readiness() -> None:
+    """
+    Build the LLM client and check the provider in the background, until it answers
+    
+    Client construction does no network I/O, so this is what finds bad
+    credentials or an unreachable provider before the first extraction
+    does; /health reports the outcome (status pending, ready or unavailable).
+    """
+    global _llm_readiness
+    _llm_readiness = {"status": "pending"}
+    while True:
+        try:
+            result = await run_in_threadpool(lambda: get_llm_client().probe())
+        except Exception as e:
+            result = {"ready": False, "detail": f"{type(e).__name__}: {e}", "seconds": 0.0}
+        _llm_readiness = {"status": "ready" if result["ready"] else "unavailable", **result,
+                          "checked_at": datetime.now().isoformat()}
+        if result["ready"] or settings.llm_readiness_retry_seconds <= 0:
+            return
+        print(f"⚠️  LLM provider not ready: {result['detail']}")
+        await asyncio.sleep(settings.llm_readiness_retry_seconds)
+
+
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (never waits for the LLM; llm_readiness is the background probe's last result)"""
     if settings.llm_provider.lower() == "deepseek":
         llm_info = f"DeepSeek - {settings.deepseek_model}"
     else:
@@ -639,15 +1023,58 @@ def health_check():
     return {
         "status": "healthy",
         "llm": llm_info,
-        "provider": settings.llm_provider
+        "provider": settings.llm_provider,
+        "llm_readiness": _llm_readiness
     }
 
 
-@app.post("/api/papers", response_model=PaperResponse)
-async def upload_paper(file: UploadFile = File(...)):
+@app.get("/api/metrics")
+def get_metrics() -> Dict[str, Any]:
+    """Runtime metrics (cache effectiveness etc.)"""
+    parser = get_paper_parser()
+    metrics = {
+        "parse_cache": parser.cache.stats()
+    }
+    if settings.parse_sandbox:
+        metrics["parse_sandbox"] = get_parse_sandbox().stats()
+    llm_stats = get_llm_stats()
+    if llm_stats is not None:
+        metrics["llm_connections"] = llm_stats
+    metrics["llm_limiter"] = get_llm_limiter_stats()
+    retry_stats = get_llm_retry_stats()
+    if retry_stats is not None:
+        metrics["llm_retries"] = retry_stats
+    usage_stats = get_llm_usage_stats()
+    if usage_stats is not None:
+        metrics["llm_usage"] = usage_stats
+    if _single_flight is not None:
+        metrics["extraction_single_flight"] = _single_flight.stats()
+    cache_stats = get_llm_cache_stats()
+    if cache_stats is not None:
+        metrics["llm_cache"] = cache_stats
+    return metrics
+
+
+@app.delete("/api/llm-cache")
+def clear_llm_cache(namespace: Optional[str] = None) -> Dict[str, Any]:
+    """Drop cached LLM responses of one namespace (e.g. ContributionExtractor), or all of them"""
+    return {"namespace": namespace, "removed": invalidate_llm_cache(namespace)}
+
+
+@app.post("/api/papers", response_model=PaperResponse,
+          responses={202: {"description": "Accepted - parsing continues in the background"}})
+async def upload_paper(file: UploadFile = File(...), background: bool = False):
     """
     Upload a paper PDF and parse it
     
+    File I/O and parsing run on the parse pool, never on the event loop.
+    With UPLOAD_QUICK_PARSE (default) only the leading pages are parsed before
+    responding with status "parsing"; the full parse then fills the parse
+    cache in the background (job id = paper id).
+    With ?background=true the endpoint returns 202 with a job id as soon as
+    the file is stored; poll GET /api/jobs/{job_id} for the result, which
+    is kept for PARSE_JOB_TTL_SECONDS once the job has finished.
+    
     Returns paper metadata
     """
     # Validate file type
@@ -656,32 +1083,75 @@ async def upload_paper(file: UploadFile = File(...)):
     
     # Generate paper ID
     paper_id = str(uuid.uuid4())
-    file_path = UPLOAD_DIR / f"{paper_id}.pdf"
     
-    # Save uploaded file
-    try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-    except Exception as e:
-        raise HTTPException(500, f"Failed to save file: {str(e)}")
+    content_hash, duplicate = await run_in_parse_executor(store_upload, file.file, paper_id, file.filename)
+    if duplicate:
+        return duplicate
+    
+    if background:
+        job = start_parse_job(paper_id, content_hash, file.filename)
+        return JSONResponse(status_code=202, content={
+            **job,
+            "status_url": f"/api/jobs/{job['job_id']}"
+        })
     
-    # Parse PDF
+    # Already in the parse cache: the full parse is as fast as a quick one
+    if settings.upload_quick_parse and not get_paper_parser().cache.contains(content_hash):
+        response = await run_in_parse_executor(quick_parse_upload, paper_id, content_hash, file.filename)
+        start_parse_job(paper_id, content_hash, file.filename)
+        return response
+    
+    return await run_in_parse_executor(parse_upload, paper_id, content_hash, file.filename)
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str) -> Dict[str, Any]:
+    """Status of a background parse job (finished jobs expire, see prune_parse_jobs())"""
+    prune_parse_jobs()
+    job = _parse_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
+
+
+@app.post("/api/papers/bulk")
+async def upload_papers_bulk(files: List[UploadFile] = File(...)) -> Dict[str, Any]:
+    """
+    Upload many paper PDFs at once
+    
+    Files are hashed and deduplicated (already-ingested PDFs return their
+    existing paper_id), then parsed through a bounded worker pool.
+    
+    Returns per-file results and throughput
+    """
+    staging_dir = UPLOAD_DIR / "staging"
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    
+    staged = []
+    rejected = []
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(file_path), paper_id)
-        save_parsed_paper(paper)
-    except Exception as e:
-        file_path.unlink()  # Clean up file
-        raise HTTPException(500, f"Failed to parse PDF: {str(e)}")
+        for file in files:
+            if not file.filename.endswith(".pdf"):
+                rejected.append({"source": file.filename, "status": "failed",
+                                 "error": "Only PDF files are supported"})
+                continue
+            staged_path = staging_dir / f"{uuid.uuid4()}.pdf"
+            staged.append((staged_path, file.filename))
+            await run_in_parse_executor(copy_to_path, file.file, staged_path)
+        
+        summary = await run_in_threadpool(get_bulk_ingester().ingest, [p for p, _ in staged])
+    finally:
+        for staged_path, _ in staged:
+            staged_path.unlink(missing_ok=True)
     
-    return PaperResponse(
-        paper_id=paper.paper_id,
-        title=paper.title,
-        abstract=paper.abstract,
-        authors=paper.authors,
-        num_pages=paper.num_pages,
-        status="processed"
-    )
+    # Report original filenames rather than staging paths
+    names = {str(p): name for p, name in staged}
+    for result in summary["results"]:
+        result["source"] = names.get(result["source"], result["source"])
+    summary["results"].extend(rejected)
+    summary["failed"] += len(rejected)
+    summary["total"] += len(rejected)
+    return summary
 
 
 @app.get("/api/papers/{paper_id}", response_model=PaperResponse)
@@ -691,7 +1161,8 @@ def get_paper(paper_id: str):
     if not paper_data:
         raise HTTPException(404, "Paper not found")
     
-    return PaperResponse(**paper_data, status="processed")
+    status = "parsing" if paper_data.get("metadata", {}).get("partial") else "processed"
+    return PaperResponse(**paper_data, status=status)
 
 
 @app.post("/api/papers/{paper_id}/extract/contributions")
@@ -717,21 +1188,14 @@ async def extract_contributions(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        # Parse paper (to get full content)
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
-        
-        # Extract contributions
         extractor = get_contribution_extractor()
-        contributions = extractor.extract(paper)
-        
-        # Save results
-        save_contributions(paper_id, contributions)
+        contributions, saved = await extract_once(paper_id, pdf_path, extractor,
+                                                  load_contributions, save_contributions)
         
         return {
             "paper_id": paper_id,
-            "contributions": [c.to_dict() for c in contributions],
-            "cached": False
+            "contributions": contributions,
+            "cached": saved
         }
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
@@ -760,21 +1224,14 @@ async def extract_experiments(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        # Parse paper
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
-        
-        # Extract experiments
         extractor = get_experiment_extractor()
-        experiments = extractor.extract(paper)
-        
-        # Save results
-        save_experiments(paper_id, experiments)
+        experiments, saved = await extract_once(paper_id, pdf_path, extractor,
+                                                load_experiments, save_experiments)
         
         return {
             "paper_id": paper_id,
-            "experiments": [e.to_dict() for e in experiments],
-            "cached": False
+            "experiments": experiments,
+            "cached": saved
         }
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
@@ -790,24 +1247,26 @@ async def query_paper(paper_id: str, request: QueryRequest) -> QueryResponse:
     
     try:
         # Parse paper
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
+        paper = await load_full_paper(paper_id, pdf_path)
         
         # Query LLM
         llm = get_llm_client()
-        prompt = f"""Answer the following question about this research paper.
+        header = f"""Answer the following question about this research paper.
 
 Paper Title: {paper.title}
 Paper Abstract: {paper.abstract}
 
-Paper Content (first 15000 chars):
-{paper.full_text[:15000]}
+Paper Content:
+"""
+        footer = f"""
 
 Question: {request.query}
 
 Provide a clear, concise answer based on the paper content."""
+        budget = ContextBudget.for_client(llm)
+        prompt = header + budget.fit(paper.llm_text, budget.available(header, footer)) + footer
         
-        response = llm.complete(prompt)
+        response = await llm.complete_async(prompt)
         
         return QueryResponse(
             paper_id=paper_id,
@@ -834,16 +1293,14 @@ async def extract_architecture(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_architecture_extractor()
-        architectures = extractor.extract(paper)
-        save_architectures(paper_id, architectures)
+        architectures, saved = await extract_once(paper_id, pdf_path, extractor,
+                                                  load_architectures, save_architectures)
         
         return {
             "paper_id": paper_id,
-            "architectures": [a.to_dict() for a in architectures],
-            "cached": False
+            "architectures": architectures,
+            "cached": saved
         }
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
@@ -865,16 +1322,14 @@ async def extract_hyperparameters(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_hyperparameter_extractor()
-        hyperparams = extractor.extract(paper)
-        save_hyperparameters(paper_id, hyperparams)
+        hyperparams, saved = await extract_once(paper_id, pdf_path, extractor,
+                                                load_hyperparameters, save_hyperparameters)
         
         return {
             "paper_id": paper_id,
-            "hyperparameters": [h.to_dict() for h in hyperparams],
-            "cached": False
+            "hyperparameters": hyperparams,
+            "cached": saved
         }
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
@@ -896,16 +1351,14 @@ async def extract_ablations(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_ablation_extractor()
-        ablations = extractor.extract(paper)
-        save_ablations(paper_id, ablations)
+        ablations, saved = await extract_once(paper_id, pdf_path, extractor,
+                                              load_ablations, save_ablations)
         
         return {
             "paper_id": paper_id,
-            "ablations": [a.to_dict() for a in ablations],
-            "cached": False
+            "ablations": ablations,
+            "cached": saved
         }
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
@@ -923,12 +1376,10 @@ async def extract_baselines(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_baselines_extractor()
-        baselines = extractor.extract(paper)
-        save_baselines(paper_id, baselines)
-        return {"paper_id": paper_id, "baselines": [b.to_dict() for b in baselines], "cached": False}
+        baselines, saved = await extract_once(paper_id, pdf_path, extractor,
+                                              load_baselines, save_baselines)
+        return {"paper_id": paper_id, "baselines": baselines, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -945,12 +1396,10 @@ async def extract_equations(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_equations_extractor()
-        equations = extractor.extract(paper)
-        save_equations(paper_id, equations)
-        return {"paper_id": paper_id, "equations": [e.to_dict() for e in equations], "cached": False}
+        equations, saved = await extract_once(paper_id, pdf_path, extractor,
+                                              load_equations, save_equations)
+        return {"paper_id": paper_id, "equations": equations, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -967,12 +1416,10 @@ async def extract_algorithms(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_algorithms_extractor()
-        algorithms = extractor.extract(paper)
-        save_algorithms(paper_id, algorithms)
-        return {"paper_id": paper_id, "algorithms": [a.to_dict() for a in algorithms], "cached": False}
+        algorithms, saved = await extract_once(paper_id, pdf_path, extractor,
+                                               load_algorithms, save_algorithms)
+        return {"paper_id": paper_id, "algorithms": algorithms, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -989,12 +1436,10 @@ async def extract_limitations(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_limitations_extractor()
-        limitations = extractor.extract(paper)
-        save_limitations(paper_id, limitations)
-        return {"paper_id": paper_id, "limitations": [l.to_dict() for l in limitations], "cached": False}
+        limitations, saved = await extract_once(paper_id, pdf_path, extractor,
+                                                load_limitations, save_limitations)
+        return {"paper_id": paper_id, "limitations": limitations, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1011,12 +1456,10 @@ async def extract_future_work(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_future_work_extractor()
-        items = extractor.extract(paper)
-        save_future_work(paper_id, items)
-        return {"paper_id": paper_id, "future_work": [f.to_dict() for f in items], "cached": False}
+        items, saved = await extract_once(paper_id, pdf_path, extractor,
+                                          load_future_work, save_future_work)
+        return {"paper_id": paper_id, "future_work": items, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1033,12 +1476,10 @@ async def extract_code_resources(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_code_resources_extractor()
-        resources = extractor.extract(paper)
-        save_code_resources(paper_id, resources)
-        return {"paper_id": paper_id, "code_resources": [r.to_dict() for r in resources], "cached": False}
+        resources, saved = await extract_once(paper_id, pdf_path, extractor,
+                                              load_code_resources, save_code_resources)
+        return {"paper_id": paper_id, "code_resources": resources, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1055,12 +1496,10 @@ async def extract_datasets(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_datasets_extractor()
-        datasets = extractor.extract(paper)
-        save_datasets(paper_id, datasets)
-        return {"paper_id": paper_id, "datasets": [d.to_dict() for d in datasets], "cached": False}
+        datasets, saved = await extract_once(paper_id, pdf_path, extractor,
+                                             load_datasets, save_datasets)
+        return {"paper_id": paper_id, "datasets": datasets, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1077,12 +1516,10 @@ async def extract_loss_functions(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_loss_functions_extractor()
-        losses = extractor.extract(paper)
-        save_loss_functions(paper_id, losses)
-        return {"paper_id": paper_id, "loss_functions": [l.to_dict() for l in losses], "cached": False}
+        losses, saved = await extract_once(paper_id, pdf_path, extractor,
+                                           load_loss_functions, save_loss_functions)
+        return {"paper_id": paper_id, "loss_functions": losses, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1099,12 +1536,10 @@ async def extract_metrics(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_metrics_extractor()
-        metrics = extractor.extract(paper)
-        save_metrics(paper_id, metrics)
-        return {"paper_id": paper_id, "metrics": [m.to_dict() for m in metrics], "cached": False}
+        metrics, saved = await extract_once(paper_id, pdf_path, extractor,
+                                            load_metrics, save_metrics)
+        return {"paper_id": paper_id, "metrics": metrics, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1121,12 +1556,10 @@ async def extract_training(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_training_extractor()
-        procedures = extractor.extract(paper)
-        save_training(paper_id, procedures)
-        return {"paper_id": paper_id, "training": [t.to_dict() for t in procedures], "cached": False}
+        procedures, saved = await extract_once(paper_id, pdf_path, extractor,
+                                               load_training, save_training)
+        return {"paper_id": paper_id, "training": procedures, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1143,12 +1576,10 @@ async def extract_related_work(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_related_work_extractor()
-        works = extractor.extract(paper)
-        save_related_work(paper_id, works)
-        return {"paper_id": paper_id, "related_work": [w.to_dict() for w in works], "cached": False}
+        works, saved = await extract_once(paper_id, pdf_path, extractor,
+                                          load_related_work, save_related_work)
+        return {"paper_id": paper_id, "related_work": works, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1165,12 +1596,10 @@ async def extract_claims(paper_id: str) -> Dict[str, Any]:
         raise HTTPException(404, "Paper PDF not found")
     
     try:
-        parser = get_paper_parser()
-        paper = parser.parse_pdf(str(pdf_path), paper_id)
         extractor = get_claims_extractor()
-        claims = extractor.extract(paper)
-        save_claims(paper_id, claims)
-        return {"paper_id": paper_id, "claims": [c.to_dict() for c in claims], "cached": False}
+        claims, saved = await extract_once(paper_id, pdf_path, extractor,
+                                           load_claims, save_claims)
+        return {"paper_id": paper_id, "claims": claims, "cached": saved}
     except Exception as e:
         raise HTTPException(500, f"Extraction failed: {str(e)}")
 
@@ -1198,48 +1627,14 @@ async def generate_visualization(request: VisualizeRequest) -> Dict[str, Any]:
         if not paper_data:
             continue
         
-        # Load all available extractions
-        contributions = load_contributions(paper_id)
-        experiments = load_experiments(paper_id)
-        architectures = load_architectures(paper_id)
-        hyperparameters = load_hyperparameters(paper_id)
-        ablations = load_ablations(paper_id)
-        baselines = load_baselines(paper_id)
-        datasets = load_datasets(paper_id)
-        limitations = load_limitations(paper_id)
-        future_work = load_future_work(paper_id)
-        algorithms = load_algorithms(paper_id)
-        equations = load_equations(paper_id)
-        training = load_training(paper_id)
-        metrics = load_metrics(paper_id)
-        loss_functions = load_loss_functions(paper_id)
-        related_work = load_related_work(paper_id)
-        claims = load_claims(paper_id)
-        code_resources = load_code_resources(paper_id)
-        
         all_data[paper_id] = {
             "paper": {
                 "title": paper_data.get("title", "Unknown"),
                 "authors": paper_data.get("authors", []),
                 "abstract": paper_data.get("abstract", "")
             },
-            "contributions": [c.to_dict() if hasattr(c, 'to_dict') else c for c in (contributions or [])],
-            "experiments": [e.to_dict() if hasattr(e, 'to_dict') else e for e in (experiments or [])],
-            "architectures": [a.to_dict() if hasattr(a, 'to_dict') else a for a in (architectures or [])],
-            "hyperparameters": [h.to_dict() if hasattr(h, 'to_dict') else h for h in (hyperparameters or [])],
-            "ablations": [a.to_dict() if hasattr(a, 'to_dict') else a for a in (ablations or [])],
-            "baselines": [b.to_dict() if hasattr(b, 'to_dict') else b for b in (baselines or [])],
-            "datasets": [d.to_dict() if hasattr(d, 'to_dict') else d for d in (datasets or [])],
-            "limitations": [l.to_dict() if hasattr(l, 'to_dict') else l for l in (limitations or [])],
-            "future_work": [f.to_dict() if hasattr(f, 'to_dict') else f for f in (future_work or [])],
-            "algorithms": [a.to_dict() if hasattr(a, 'to_dict') else a for a in (algorithms or [])],
-            "equations": [e.to_dict() if hasattr(e, 'to_dict') else e for e in (equations or [])],
-            "training": [t.to_dict() if hasattr(t, 'to_dict') else t for t in (training or [])],
-            "metrics": [m.to_dict() if hasattr(m, 'to_dict') else m for m in (metrics or [])],
-            "loss_functions": [l.to_dict() if hasattr(l, 'to_dict') else l for l in (loss_functions or [])],
-            "related_work": [r.to_dict() if hasattr(r, 'to_dict') else r for r in (related_work or [])],
-            "claims": [c.to_dict() if hasattr(c, 'to_dict') else c for c in (claims or [])],
-            "code_resources": [c.to_dict() if hasattr(c, 'to_dict') else c for c in (code_resources or [])]
+            # Load all available extractions
+            **load_all_extractions(paper_id)
         }
     
     if not all_data:
@@ -1250,7 +1645,9 @@ async def generate_visualization(request: VisualizeRequest) -> Dict[str, Any]:
     engine = VisualizationEngine(llm)
     
     try:
-        html, metadata = engine.generate_visualization(
+        # Multi-stage blocking pipeline - keep it off the event loop
+        html, metadata = await run_in_threadpool(
+            engine.generate_visualization,
             paper_ids=request.paper_ids,
             query=request.query,
             all_raw_data=all_data
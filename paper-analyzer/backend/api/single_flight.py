@@ -0,0 +1,118 @@
+"""
+Single Flight - Run each extraction once, however many requests ask for it at the same time
+
+Two requests for the same (paper, extractor, version) that both miss the
+saved result would otherwise both parse the PDF, both pay for the LLM
+call and race to write the result file. Within a worker the second
+request awaits the first one's task; across uvicorn workers an exclusive
+lock file serialises them, and whoever gets the lock second finds the
+saved result instead of extracting again.
+"""
+import asyncio
+import hashlib
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalescing stays within the worker
+    fcntl = None
+
+# How often a worker waiting for another worker's lock retries
+LOCK_POLL_INTERVAL = 0.1
+
+
+class SingleFlight:
+    """Coalesces concurrent calls per key, in-process by task and across processes by lock file"""
+
+    def __init__(self, lock_dir: Union[str, Path]):
+        """
+        Args:
+            lock_dir: Directory for the per-key lock files (shared by all workers)
+        """
+        self.lock_dir = Path(lock_dir)
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._counts = Counter()
+
+    def _lock_path(self, key: Hashable) -> Path:
+        return self.lock_dir / f"{hashlib.sha1(repr(key).encode('utf-8')).hexdigest()}.lock"
+
+    async def _acquire_file_lock(self, key: Hashable) -> Optional[int]:
+        """Exclusive lock on the key's file, polled so the event loop keeps running; None without fcntl"""
+        if fcntl is None:
+            return None
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._lock_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        waited = False
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    if waited:
+                        self._counts["waited_for_other_worker"] += 1
+                    return fd
+                except BlockingIOError:
+                    waited = True
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+        except BaseException:
+            os.close(fd)
+            raise
+
+    @staticmethod
+    def _release_file_lock(fd: Optional[int]) -> None:
+        # The file itself stays: unlinking a lock file another worker has open would split the lock
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    async def _lead(self, key: Hashable, compute: Callable[[], Awaitable[Any]],
+                    saved: Callable[[], Optional[Any]]) -> Tuple[Any, bool]:
+        fd = await self._acquire_file_lock(key)
+        try:
+            # Another worker may have finished while this one waited for the lock
+            result = saved()
+            if result is not None:
+                self._counts["found_saved"] += 1
+                return result, True
+            self._counts["computed"] += 1
+            return await compute(), False
+        finally:
+            self._release_file_lock(fd)
+            self._flights.pop(key, None)
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]],
+                  saved: Callable[[], Optional[Any]]) -> Tuple[Any, bool]:
+        """
+        Result of compute() for key, shared with every concurrent caller
+
+        Args:
+            key: Identity of the work, e.g. (paper_id, extractor, version)
+            compute: Does the work and saves its result
+            saved: Returns the saved result, or None if there is none yet
+
+        Returns:
+            (result, True if it was found saved instead of computed)
+        """
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._lead(key, compute, saved))
+            # Retrieve the exception even if every waiter was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._flights[key] = task
+        else:
+            self._counts["coalesced"] += 1
+        # A cancelled request (client gone) must not cancel the work others are waiting for
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counts since the process started"""
+        return {
+            "in_flight": len(self._flights),
+            "computed": self._counts["computed"],
+            "coalesced": self._counts["coalesced"],
+            "found_saved": self._counts["found_saved"],
+            "waited_for_other_worker": self._counts["waited_for_other_worker"],
+            "cross_process": fcntl is not None
+        }
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Concurrent extraction throughput of one API worker: blocking vs async LLM calls
+
+Two routes on one FastAPI app (one event loop, like one uvicorn worker)
+run the same ExperimentExtractor against a local mock LLM server that takes
+--latency seconds per completion:
+    /blocking  extractor.extract(paper) inside an async route (the old routes)
+    /async     await extractor.extract_async(paper)
+
+Usage:
+    python benchmark_async_extraction.py [--requests 32] [--concurrency 16] [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+from fastapi import FastAPI
+from extractors import ExperimentExtractor
+from extractors.deepseek_client import DeepSeekClient
+from parsers import ParsedPaper
+from test_llm_pool import MockLLMServer
+
+
+def build_app(extractor: ExperimentExtractor, paper: ParsedPaper) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/blocking")
+    async def blocking():
+        return {"experiments": len(extractor.extract(paper))}
+
+    @app.post("/async")
+    async def non_blocking():
+        return {"experiments": len(await extractor.extract_async(paper))}
+
+    return app
+
+
+async def run_load(app: FastAPI, path: str, requests: int, concurrency: int) -> dict:
+    """Fire requests with bounded concurrency; measure how long the event loop stalls meanwhile"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://worker") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await client.post(path)
+                response.raise_for_status()
+
+        stalls = []
+        done = asyncio.Event()
+
+        async def probe():
+            # Anything else on the worker (health checks, uploads) waits as long as a 10 ms sleep overshoots
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.01)
+                stalls.append(time.perf_counter() - start - 0.01)
+
+        prober = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await prober
+    return {"elapsed": elapsed, "throughput": requests / elapsed,
+            "stall_max_ms": max(stalls) * 1000 if stalls else 0.0}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--requests", type=int, default=32)
+    arg_parser.add_argument("--concurrency", type=int, default=16)
+    arg_parser.add_argument("--latency", type=float, default=0.5, help="mock LLM seconds per completion")
+    args = arg_parser.parse_args()
+
+    paper = ParsedPaper(paper_id="bench", title="Benchmark Paper", authors=["A"], abstract="",
+                        full_text="Experiments. " * 2000, sections=[], num_pages=1)
+    with MockLLMServer(response_delay=args.latency) as server:
+        client = DeepSeekClient("bench", api_url=server.url, pool_maxsize=args.concurrency)
+        app = build_app(ExperimentExtractor(llm_client=client), paper)
+        results = {path: asyncio.run(run_load(app, path, args.requests, args.concurrency))
+                   for path in ("/blocking", "/async")}
+        client.close()
+
+    print("=" * 72)
+    print(f"  EXTRACTION THROUGHPUT, ONE WORKER ({args.requests} requests, "
+          f"concurrency {args.concurrency}, LLM latency {args.latency:g}s)")
+    print("=" * 72)
+    print(f"{'route':<12} {'wall s':>8} {'extractions/s':>14} {'max loop stall ms':>18}")
+    for path, result in results.items():
+        print(f"{path:<12} {result['elapsed']:>8.2f} {result['throughput']:>14.2f} {result['stall_max_ms']:>18.0f}")
+    speedup = results["/async"]["throughput"] / results["/blocking"]["throughput"]
+    print(f"\nAsync throughput: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
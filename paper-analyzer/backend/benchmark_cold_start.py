@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Cold start: time from process launch to the first request served
+
+Each run starts a fresh interpreter that imports the API app, serves one
+/health request (over ASGI, no server socket) and builds the global LLM
+client, in one of two modes:
+    lazy   the app as it is: boto3, PyMuPDF and requests load on first use
+    eager  boto3, PyMuPDF and requests imported up front and the Bedrock
+           runtime client built at construction, as startup used to do
+           (minus the list_foundation_models round trip it also made)
+The Bedrock client is then used once (built lazily in lazy mode), which
+is the cost the first extraction or the readiness probe pays.
+
+Usage:
+    python benchmark_cold_start.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend!r})
+if {eager!r}:
+    import boto3, fitz, requests
+
+import asyncio
+import httpx
+import api.app
+imported = time.perf_counter()
+
+async def first_request():
+    transport = httpx.ASGITransport(app=api.app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (await client.get("/health")).raise_for_status()
+asyncio.run(first_request())
+served = time.perf_counter()
+loaded = [name for name in ("boto3", "fitz", "requests") if name in sys.modules and name not in {preloaded!r}]
+
+from extractors import get_llm_client
+client = get_llm_client()
+if {eager!r}:
+    client.bedrock_runtime
+constructed = time.perf_counter()
+client.bedrock_runtime
+first_use = time.perf_counter()
+
+print(json.dumps({{
+    "import": imported - start,
+    "first_request": served - start,
+    "construct": constructed - served,
+    "first_llm_use": first_use - constructed,
+    "loaded": loaded
+}}))
+"""
+
+
+def run_once(eager: bool, workdir: str) -> dict:
+    env = {**os.environ, "LLM_PROVIDER": "bedrock", "LLM_CACHE_ENABLED": "false",
+           "AWS_ACCESS_KEY_ID": os.environ.get("AWS_ACCESS_KEY_ID", "AKIDBENCH"),
+           "AWS_SECRET_ACCESS_KEY": os.environ.get("AWS_SECRET_ACCESS_KEY", "secret")}
+    script = CHILD_SCRIPT.format(backend=str(BACKEND_DIR), eager=eager,
+                                 preloaded=("boto3", "fitz", "requests") if eager else ())
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], cwd=workdir, env=env,
+                            capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["process"] = wall
+    return report
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    columns = ("import", "first_request", "construct", "first_llm_use", "process")
+    print(f"{'mode':<7} " + " ".join(f"{name:>14}" for name in columns) + "   loaded at startup")
+    print("-" * 100)
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in ("eager", "lazy"):
+            runs = [run_once(mode == "eager", workdir) for _ in range(args.runs)]
+            medians = {name: statistics.median(r[name] for r in runs) for name in columns}
+            loaded = "boto3, fitz, requests" if mode == "eager" else ", ".join(runs[0]["loaded"]) or "-"
+            print(f"{mode:<7} " + " ".join(f"{medians[name] * 1000:>12.0f}ms" for name in columns)
+                  + f"   {loaded}")
+    print("\nfirst_request: launch to first /health served; first_llm_use: deferred Bedrock client build "
+          f"(median of {args.runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare per-call connections (requests.post) with DeepSeekClient's pooled session
+
+Runs against a local mock chat-completions server, optionally over TLS with
+a throwaway self-signed certificate (needs the openssl CLI). --connect-delay-ms
+adds a per-connection delay to stand in for the round trips of a remote API.
+
+Usage:
+    python benchmark_llm_pool.py [--calls 100] [--tls] [--connect-delay-ms 0]
+"""
+
+import argparse
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+from extractors.deepseek_client import DeepSeekClient
+from test_llm_pool import MockLLMServer
+
+
+def make_certificate(root: Path) -> tuple:
+    """Self-signed certificate for 127.0.0.1; returns (cert, key) paths"""
+    cert, key = root / "cert.pem", root / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", str(key), "-out", str(cert)], check=True, capture_output=True)
+    return cert, key
+
+
+def timed_calls(call, calls: int) -> list:
+    """Per-call latency in ms"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(label: str, latencies: list, connections: int) -> None:
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<26} {statistics.mean(latencies):>9.2f} {statistics.median(latencies):>9.2f} "
+          f"{p95:>9.2f} {connections:>12}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--calls", type=int, default=100)
+    arg_parser.add_argument("--tls", action="store_true", help="serve over HTTPS")
+    arg_parser.add_argument("--connect-delay-ms", type=float, default=0.0,
+                            help="per-connection delay standing in for network round trips")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ssl_context = None
+        verify = True
+        if args.tls:
+            cert, key = make_certificate(Path(tmp))
+            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ssl_context.load_cert_chain(cert, key)
+            verify = str(cert)
+
+        with MockLLMServer(connect_delay=args.connect_delay_ms / 1000, ssl_context=ssl_context) as server:
+            payload = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "hi"}],
+                       "max_tokens": 16, "temperature": 0.1}
+
+            # Before: a fresh connection (and TLS handshake) per call
+            unpooled = timed_calls(lambda: requests.post(server.url, json=payload, verify=verify,
+                                                         headers={"Authorization": "Bearer x"},
+                                                         timeout=10).json(), args.calls)
+            unpooled_connections = server.connections
+
+            client = DeepSeekClient("x", api_url=server.url)
+            client.session.verify = verify
+            client.session.trust_env = False  # REQUESTS_CA_BUNDLE would override verify
+            pooled = timed_calls(lambda: client.complete("hi", max_tokens=16), args.calls)
+            stats = client.stats()
+            client.close()
+
+    transport = "HTTPS" if args.tls else "HTTP"
+    print("=" * 70)
+    print(f"  LLM CONNECTION POOLING ({args.calls} calls, {transport}, "
+          f"+{args.connect_delay_ms:g} ms per connection)")
+    print("=" * 70)
+    print(f"{'':<26} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'connections':>12}")
+    report("requests.post per call", unpooled, unpooled_connections)
+    report("pooled session", pooled, stats["connections_opened"])
+    print(f"\nSpeedup: {statistics.mean(unpooled) / statistics.mean(pooled):.2f}x; client stats: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
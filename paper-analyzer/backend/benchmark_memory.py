@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of parsing a book-length PDF, in-memory vs disk_text
+
+The whole pdfs/ corpus is concatenated into one document (repeated --copies
+times) and each mode is parsed in a fresh child process so peaks do not mix.
+
+Usage:
+    python benchmark_memory.py [--pdf-dir ../../pdfs] [--copies 3]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_PDF_DIR = Path(__file__).resolve().parents[2] / "pdfs"
+
+
+def build_book(pdf_dir: Path, copies: int, out_path: Path) -> None:
+    """Concatenate every corpus PDF into one large document"""
+    import fitz
+    book = fitz.open()
+    for _ in range(copies):
+        for pdf in sorted(pdf_dir.glob("*.pdf")):
+            with fitz.open(pdf) as src:
+                book.insert_pdf(src)
+    book.save(str(out_path))
+    book.close()
+
+
+def measure(pdf_path: str, cache_dir: str, disk_text: bool, trace: bool) -> dict:
+    """Parse once in this process and report peak memory (child process entry point)"""
+    from parsers import PaperParser, ParsedPaperCache
+
+    parser = PaperParser(cache=ParsedPaperCache(cache_dir), disk_text=disk_text)
+    if trace:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    paper = parser.parse_pdf(pdf_path, "book")
+    seconds = time.perf_counter() - start
+    result = {
+        "seconds": seconds,
+        "chars": len(paper.full_text),
+        "pages": paper.num_pages,
+        "rss_peak_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "rss_before_kb": rss_before,
+    }
+    if trace:
+        result["python_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+    return result
+
+
+def run_child(pdf_path: Path, disk_text: bool, trace: bool) -> dict:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        args = [sys.executable, __file__, "--child", str(pdf_path), cache_dir]
+        if disk_text:
+            args.append("--disk-text")
+        if trace:
+            args.append("--trace")
+        output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    if "--child" in sys.argv:
+        i = sys.argv.index("--child")
+        print(json.dumps(measure(sys.argv[i + 1], sys.argv[i + 2],
+                                 "--disk-text" in sys.argv, "--trace" in sys.argv)))
+        return 0
+
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--pdf-dir", type=Path, default=DEFAULT_PDF_DIR)
+    arg_parser.add_argument("--copies", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        book = Path(tmp) / "book.pdf"
+        build_book(args.pdf_dir, args.copies, book)
+
+        results = {}
+        for label, disk_text in (("in-memory str", False), ("disk_text", True)):
+            rss = run_child(book, disk_text, trace=False)
+            traced = run_child(book, disk_text, trace=True)
+            results[label] = {**rss, "python_peak_kb": traced["python_peak_kb"]}
+
+    first = next(iter(results.values()))
+    print("=" * 80)
+    print(f"  PEAK MEMORY: {first['pages']} pages, {first['chars'] / 1e6:.1f}M chars")
+    print("=" * 80)
+    print(f"{'mode':<16} {'parse (s)':>10} {'RSS growth (MB)':>16} {'Python peak (MB)':>17}")
+    for label, r in results.items():
+        growth = (r["rss_peak_kb"] - r["rss_before_kb"]) / 1024
+        print(f"{label:<16} {r['seconds']:>10.2f} {growth:>16.1f} {r['python_peak_kb'] / 1024:>17.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark page-parallel PDF text extraction over the pdfs/ corpus
+
+Usage:
+    python benchmark_parser.py [--pdf-dir ../../pdfs] [--workers 1 2 4 8] [--min-pages 0]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers import PaperParser
+
+DEFAULT_PDF_DIR = Path(__file__).resolve().parents[2] / "pdfs"
+
+
+def extract_text(parser: PaperParser, pdf: Path) -> str:
+    """Whole-document text as the parser reads it, pages joined in order"""
+    return "\n".join(parser._iter_page_texts(pdf))
+
+
+def time_corpus(parser: PaperParser, pdfs: list) -> dict:
+    """Extract text from every PDF, returning seconds per file"""
+    timings = {}
+    for pdf in pdfs:
+        start = time.perf_counter()
+        extract_text(parser, pdf)
+        timings[pdf.name] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--pdf-dir", type=Path, default=DEFAULT_PDF_DIR)
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    arg_parser.add_argument("--min-pages", type=int, default=0,
+                            help="parallel threshold (0 = parallelise every paper)")
+    arg_parser.add_argument("--top", type=int, default=5, help="largest files to list")
+    args = arg_parser.parse_args()
+
+    pdfs = sorted(args.pdf_dir.glob("*.pdf"))
+    if not pdfs:
+        print(f"❌ No PDFs found in {args.pdf_dir}")
+        return 1
+
+    print("=" * 80)
+    print(f"  PARALLEL TEXT EXTRACTION BENCHMARK ({len(pdfs)} PDFs)")
+    print("=" * 80)
+
+    results = {}
+    for workers in args.workers:
+        parser = PaperParser(workers=workers, parallel_min_pages=args.min_pages)
+        # Warm the process pool so start-up cost is not charged to the first file
+        if workers > 1:
+            parser._get_executor().submit(int).result()
+        results[workers] = time_corpus(parser, pdfs)
+        parser.close()
+        print(f"  workers={workers}: {sum(results[workers].values()):.2f}s total")
+
+    baseline = results[args.workers[0]]
+    base_total = sum(baseline.values())
+
+    print("\n" + "=" * 80)
+    print("  SPEEDUP")
+    print("=" * 80)
+    print(f"{'workers':>8} {'total (s)':>10} {'speedup':>8}")
+    for workers, timings in results.items():
+        total = sum(timings.values())
+        print(f"{workers:>8} {total:>10.2f} {base_total / total:>7.2f}x")
+
+    print("\nSlowest files:")
+    header = "".join(f"{'w=' + str(w):>9}" for w in results)
+    print(f"{'file':<50}{header}")
+    for name in sorted(baseline, key=baseline.get, reverse=True)[:args.top]:
+        row = "".join(f"{results[w][name]:>8.2f}s" for w in results)
+        print(f"{name[:49]:<50}{row}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: cost per MB of text for title/authors/abstract/section detection
+
+Compares the single-pass _PaperScanner with the previous multi-pass
+heuristics (reproduced below) on page texts from the pdfs/ corpus.
+Text extraction is done once up front and is not timed.
+
+Usage:
+    python benchmark_scanner.py [--pdf-dir ../../pdfs] [--repeat 5]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers import PaperParser
+from parsers.pdf_parser import _PaperScanner
+
+DEFAULT_PDF_DIR = Path(__file__).resolve().parents[2] / "pdfs"
+
+
+def multi_pass(text: str):
+    """Previous approach: separate split/lower/regex passes over full_text"""
+    lines = text.split('\n')
+    title = next((l.strip() for l in lines if 10 < len(l.strip()) < 200 and not l.strip().isupper()), None)
+
+    authors = []
+    for line in text.split('\n')[:20]:
+        line = line.strip()
+        if ',' in line and len(line) < 100 and '@' not in line:
+            authors = [n.strip() for n in line.split(',')]
+            break
+
+    text_lower = text.lower()
+    abstract = ""
+    if "abstract" in text_lower:
+        start = text_lower.find("abstract")
+        end = len(text)
+        for keyword in ["introduction", "1 introduction", "1. introduction", "1 background"]:
+            pos = text_lower.find(keyword, start)
+            if pos != -1 and pos < end:
+                end = pos
+        abstract = re.sub(r'abstract', '', text[start:end], count=1, flags=re.IGNORECASE).strip()
+
+    sections = 0
+    for line in text.split('\n'):
+        if re.match(r'^(\d+(?:\.\d+)?)\s+([A-Z][^\n]+)', line.strip()):
+            sections += 1
+    return title, authors, abstract, sections
+
+
+def single_pass(pages: list):
+    """Current approach: one walk over the page texts"""
+    scanner = _PaperScanner()
+    sections = []
+    for number, page_text in enumerate(pages):
+        sections.extend(scanner.feed_page(number, page_text))
+    sections.extend(scanner.finish())
+    return scanner.title, scanner.authors, scanner.abstract("\n".join(pages)), len(sections)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--pdf-dir", type=Path, default=DEFAULT_PDF_DIR)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    parser = PaperParser()
+    corpus = [list(parser._iter_page_texts(pdf)) for pdf in sorted(args.pdf_dir.glob("*.pdf"))]
+    if not corpus:
+        print(f"❌ No PDFs found in {args.pdf_dir}")
+        return 1
+    texts = ["\n".join(pages) for pages in corpus]
+    megabytes = sum(len(t.encode('utf-8')) for t in texts) / 1e6
+
+    print("=" * 80)
+    print(f"  SCANNER MICRO-BENCHMARK ({len(corpus)} papers, {megabytes:.2f} MB of text)")
+    print("=" * 80)
+
+    timings = {}
+    for name, run in (("multi-pass", lambda: [multi_pass(t) for t in texts]),
+                      ("single-pass", lambda: [single_pass(p) for p in corpus])):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"  {name:<12} {best * 1000:8.1f} ms total  {best * 1000 / megabytes:8.1f} ms/MB")
+
+    print(f"\n  speedup: {timings['multi-pass'] / timings['single-pass']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Report table extraction coverage and cost over the pdfs/ corpus
+
+For each paper: tables rebuilt, time spent on them next to the text parse,
+and how many sit past the experiment extractor's text cutoff for a model's
+context window (results the prompt only sees through the table block).
+
+Usage:
+    python benchmark_tables.py [--pdf-dir ../../pdfs] [--model meta.llama3-8b-instruct-v1:0] [--show]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz
+from parsers import PaperParser, format_tables
+from parsers.tables import extract_tables, has_table_caption
+from parsers.text_normalizer import estimate_tokens
+from config import settings
+from extractors.context_budget import ContextBudget, context_window
+from extractors.experiment_extractor import ExperimentExtractor
+
+DEFAULT_PDF_DIR = Path(__file__).resolve().parents[2] / "pdfs"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--pdf-dir", type=Path, default=DEFAULT_PDF_DIR)
+    arg_parser.add_argument("--model", default=settings.bedrock_model_id, help="model whose context window is budgeted")
+    arg_parser.add_argument("--show", action="store_true", help="print every rebuilt table")
+    args = arg_parser.parse_args()
+
+    pdfs = sorted(args.pdf_dir.glob("*.pdf"))
+    if not pdfs:
+        print(f"❌ No PDFs found in {args.pdf_dir}")
+        return 1
+
+    parser = PaperParser(tables=False)
+    budget = ContextBudget(context_window(args.model), ExperimentExtractor.MAX_OUTPUT_TOKENS)
+    print("=" * 88)
+    print(f"  TABLE EXTRACTION REPORT ({len(pdfs)} PDFs)")
+    print("=" * 88)
+    print(f"{'file':<44} {'pages':>6} {'tables':>7} {'parse ms':>9} {'tables ms':>10} {'past cut':>9}")
+
+    totals = {"pages": 0, "tables": 0, "parse": 0.0, "tables_time": 0.0, "past": 0}
+    for pdf in pdfs:
+        start = time.perf_counter()
+        paper = parser.parse_pdf(str(pdf), pdf.stem)
+        parse_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        doc = fitz.open(pdf)
+        pages = [i for i in range(paper.num_pages) if has_table_caption(paper.slice_pages(i, i + 1))]
+        tables = extract_tables(doc, pages)
+        doc.close()
+        table_seconds = time.perf_counter() - start
+
+        # Where the caption appears in the text the extractor would otherwise truncate
+        text = paper.llm_text
+        task = "\n\n".join((ExperimentExtractor.ROLE_PROMPT, ExperimentExtractor.USER_PROMPT_TEMPLATE,
+                             format_tables(tables, ExperimentExtractor.TABLES_MAX_CHARS)))
+        reserve = max(min(ExperimentExtractor.INSTRUCTIONS_RESERVE_TOKENS, budget.input_tokens // 3),
+                      estimate_tokens(task))
+        available = max(budget.available(ExperimentExtractor.SYSTEM_PROMPT,
+                                         ExperimentExtractor.PAPER_TEMPLATE.format(title=paper.title, content="")) - reserve, 0)
+        cutoff = len(budget.fit(text, available))
+        past = 0
+        for table in tables:
+            position = text.find(f"Table {table.label}")
+            if position < 0 or position >= cutoff:
+                past += 1
+
+        totals["pages"] += paper.num_pages
+        totals["tables"] += len(tables)
+        totals["parse"] += parse_seconds
+        totals["tables_time"] += table_seconds
+        totals["past"] += past
+        print(f"{pdf.name[:43]:<44} {paper.num_pages:>6} {len(tables):>7} {parse_seconds * 1000:>9.0f} "
+              f"{table_seconds * 1000:>10.0f} {past:>9}")
+        if args.show:
+            for table in tables:
+                print(table.to_text(max_rows=8) + "\n")
+
+    print("-" * 88)
+    print(f"{'TOTAL':<44} {totals['pages']:>6} {totals['tables']:>7} {totals['parse'] * 1000:>9.0f} "
+          f"{totals['tables_time'] * 1000:>10.0f} {totals['past']:>9}")
+    print(f"\nTable pass adds {totals['tables_time'] / totals['parse']:.1%} to parse time; "
+          f"{totals['past']}/{totals['tables']} tables were past the text cutoff "
+          f"of {args.model} ({budget.context_tokens} token window)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
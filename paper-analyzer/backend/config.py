@@ -10,12 +10,32 @@ class Settings(BaseSettings):
     
     # LLM Provider
     llm_provider: str = "bedrock"  # bedrock, deepseek, openai, etc.
+    llm_max_in_flight: int = 8  # LLM calls running at once across the process (0 = unlimited)
+    llm_requests_per_minute: int = 100  # provider RPM budget (0 = unlimited)
+    llm_tokens_per_minute: int = 400000  # provider TPM budget, prompt + max_tokens estimated (0 = unlimited)
+    llm_retry_attempts: int = 4  # attempts per call for throttling, timeouts and 5xx errors
+    llm_retry_base_delay: float = 1.0  # seconds; backoff doubles per retry, with full jitter
+    llm_retry_max_delay: float = 30.0
+    llm_breaker_failures: int = 5  # calls failing in a row that open the circuit (0 = never)
+    llm_breaker_reset_seconds: float = 30.0  # open-circuit cool-down before a trial call
+    llm_cache_enabled: bool = True  # answer repeated LLM calls from a persistent cache
+    llm_cache_path: str = "data/cache/llm_responses.sqlite3"
+    llm_cache_max_mb: int = 256  # least recently used responses are evicted beyond this
+    llm_cache_ttl_hours: float = 0  # 0 = cached responses never expire
+    llm_context_tokens: int = 0  # model context window for prompt budgets (0 = known window of the configured model)
+    llm_prompt_caching: bool = True  # mark the shared paper prefix for Bedrock prompt caching (Anthropic models)
+    llm_readiness_probe: bool = False  # check the LLM provider in the background at startup; reported by /health
+    llm_readiness_retry_seconds: float = 30.0  # re-check interval while the provider is unreachable (0 = check once)
     
     # DeepSeek
     deepseek_api_key: str = ""
     deepseek_model: str = "deepseek-chat"
     deepseek_model_temperature: float = 0.1
     deepseek_max_tokens: int = 4096
+    deepseek_api_url: str = "https://api.deepseek.com/v1/chat/completions"
+    deepseek_pool_connections: int = 4  # hosts whose keep-alive pools are kept
+    deepseek_pool_maxsize: int = 16  # keep-alive connections per host
+    deepseek_pool_block: bool = True  # calls beyond pool_maxsize wait instead of opening extra connections
     
     # AWS Configuration
     aws_access_key_id: str = ""
@@ -38,6 +58,25 @@ class Settings(BaseSettings):
     # Data Directories
     upload_dir: str = "data/uploads"
     extracted_dir: str = "data/extracted"
+    parse_cache_dir: str = "data/cache/parsed"
+    
+    # PDF Parsing
+    parse_workers: int = 1  # >1 extracts page ranges in parallel processes (inside each sandbox worker too)
+    parse_parallel_min_pages: int = 40  # shorter papers are parsed serially
+    parse_executor_workers: int = 2  # uploads parsed concurrently off the event loop
+    parse_disk_text: bool = False  # keep full_text in a memory-mapped cache file (book-length PDFs)
+    upload_quick_parse: bool = True  # answer uploads from the leading pages, full parse in background
+    quick_parse_pages: int = 2
+    parse_sandbox: bool = True  # parse uploads in supervised worker processes
+    parse_sandbox_workers: int = 2
+    parse_timeout_seconds: float = 120.0  # per PDF, then the worker is killed
+    parse_max_rss_mb: int = 2048  # per worker including its extraction processes, then it is killed
+    parse_worker_max_jobs: int = 50  # worker replaced after this many parses
+    parse_job_ttl_seconds: float = 3600.0  # finished background jobs stay pollable this long
+    parse_job_max_finished: int = 1000  # oldest finished jobs forgotten beyond this many
+    
+    # Bulk Ingest
+    ingest_workers: int = 4
     
     class Config:
         env_file = ".env"
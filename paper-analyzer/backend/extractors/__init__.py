@@ -1,7 +1,10 @@
 """
 Extractors package initialization
 """
-from .llm_client import BedrockLLMClient, get_llm_client
+from .llm_client import (BedrockLLMClient, get_llm_client, get_llm_stats, get_llm_limiter_stats,
+                         get_llm_retry_stats, get_llm_usage_stats, get_llm_cache_stats, invalidate_llm_cache,
+                         close_llm_client)
+from .context_budget import ContextBudget, context_window
 from .contribution_extractor import ContributionExtractor, Contribution
 from .experiment_extractor import ExperimentExtractor, Experiment
 from .architecture_extractor import ArchitectureExtractor, Architecture
@@ -23,6 +26,15 @@ from .claims_extractor import ClaimsExtractor, KeyClaim
 __all__ = [
     'BedrockLLMClient',
     'get_llm_client',
+    'get_llm_stats',
+    'get_llm_limiter_stats',
+    'get_llm_retry_stats',
+    'get_llm_usage_stats',
+    'get_llm_cache_stats',
+    'invalidate_llm_cache',
+    'close_llm_client',
+    'ContextBudget',
+    'context_window',
     'ContributionExtractor',
     'Contribution',
     'ExperimentExtractor',
@@ -1,10 +1,12 @@
 """
 Ablation Extractor - Extract ablation studies
 """
+import re
 from typing import List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from .llm_client import BedrockLLMClient, get_llm_client
-from parsers import ParsedPaper
+from .base import LLMExtractor
+from parsers import ParsedPaper, format_tables
 
 
 @dataclass
@@ -21,7 +23,7 @@ class AblationStudy:
         return asdict(self)
 
 
-class AblationExtractor:
+class AblationExtractor(LLMExtractor):
     """Extract ablation studies from research papers"""
     
     PROMPT_TEMPLATE = """Extract all ablation studies from this paper.
@@ -57,36 +59,30 @@ Return in JSON format:
 
 Output only the JSON.
 
-Paper Title: {title}
-
-Paper Content (first 15000 chars):
-{content}
+Tables (rebuilt from the PDF layout, cells separated by " | "):
+{tables}
 """
     
+    # Character cap for the tables block; its tokens come out of the text's budget
+    TABLES_MAX_CHARS = 5000
+    # Tables listed first when their caption reads like an ablation
+    ABLATION_CAPTION_PATTERN = re.compile(r'ablat|w/o|without|variant|component|remov', re.IGNORECASE)
+    
     def __init__(self, llm_client: BedrockLLMClient = None):
         self.llm = llm_client or get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[AblationStudy]:
-        """
-        Extract ablation studies from a parsed paper
-        
-        Args:
-            paper: ParsedPaper object
-            
-        Returns:
-            List of AblationStudy objects
-        """
+    def _build_prompt(self, paper: ParsedPaper) -> str:
         # Format prompt
+        tables = format_tables(paper.tables, self.TABLES_MAX_CHARS,
+                               prefer=self.ABLATION_CAPTION_PATTERN)
         prompt = self.PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:15000]
+            tables=tables or "(none detected)"
         )
         
-        # Get LLM response
         print("Extracting ablation studies...")
-        response = self.llm.complete_json(prompt)
-        
-        # Parse response
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[AblationStudy]:
         ablations = []
         items = response.get("ablation_studies", [])
         
@@ -4,6 +4,7 @@ Algorithms Extractor - Extract algorithms from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -21,10 +22,10 @@ class Algorithm:
         return asdict(self)
 
 
-class AlgorithmsExtractor:
+class AlgorithmsExtractor(LLMExtractor):
     """Extract algorithms from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting algorithms from papers.
+    ROLE_PROMPT = """You are an expert at extracting algorithms from papers.
 Extract all algorithms with their details. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract all algorithms from this paper.
@@ -51,27 +52,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Algorithm]:
-        """Extract algorithms from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"⚙️  Extracting algorithms from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Algorithm]:
         algorithms = []
         if isinstance(response, dict):
             items = response.get("algorithms", [])
@@ -4,6 +4,7 @@ Architecture Extractor - Extract model architecture details
 from typing import List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from .llm_client import BedrockLLMClient, get_llm_client
+from .base import LLMExtractor
 from parsers import ParsedPaper
 
 
@@ -23,7 +24,7 @@ class Architecture:
         return asdict(self)
 
 
-class ArchitectureExtractor:
+class ArchitectureExtractor(LLMExtractor):
     """Extract model architecture details from research papers"""
     
     PROMPT_TEMPLATE = """Extract complete architecture details of all models in this paper.
@@ -58,37 +59,19 @@ Return in JSON format:
 }}
 
 Output only the JSON.
-
-Paper Title: {title}
-
-Paper Content (first 15000 chars):
-{content}
 """
     
     def __init__(self, llm_client: BedrockLLMClient = None):
         self.llm = llm_client or get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Architecture]:
-        """
-        Extract architectures from a parsed paper
-        
-        Args:
-            paper: ParsedPaper object
-            
-        Returns:
-            List of Architecture objects
-        """
+    def _build_prompt(self, paper: ParsedPaper) -> str:
         # Format prompt
-        prompt = self.PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:15000]
-        )
+        prompt = self.PROMPT_TEMPLATE.format()
         
-        # Get LLM response
         print("Extracting architectures...")
-        response = self.llm.complete_json(prompt)
-        
-        # Parse response
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Architecture]:
         architectures = []
         items = response.get("architectures", [])
         
@@ -0,0 +1,54 @@
+"""
+Async HTTP - httpx.AsyncClient per event loop for the LLM clients
+
+An AsyncClient's pooled connections belong to the event loop that opened
+them, while the LLM clients are process-wide singletons used from the API's
+loop, from TestClient portals and from asyncio.run() in scripts. Each loop
+therefore gets its own AsyncClient; clients of loops that have gone away
+are dropped.
+"""
+import asyncio
+import threading
+from typing import Any, Callable, Dict
+
+import httpx
+
+
+class LoopLocalAsyncClient:
+    """httpx.AsyncClient factory keyed by the running event loop"""
+
+    def __init__(self, factory: Callable[[], httpx.AsyncClient]):
+        """
+        Args:
+            factory: Builds a configured AsyncClient (limits, headers, ...)
+        """
+        self._factory = factory
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def get(self) -> httpx.AsyncClient:
+        """AsyncClient for the running loop (must be called from a coroutine)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                for other in [l for l in self._clients if l.is_closed()]:
+                    del self._clients[other]
+                client = self._clients[loop] = self._factory()
+            return client
+
+    async def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace hook (request extension "trace") counting new connections"""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+
+    async def aclose(self) -> None:
+        """Close the running loop's client (others cannot be closed from here and are dropped)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        client = clients.get(loop)
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,134 @@
+"""
+Base class for the single-prompt extractors
+"""
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+from parsers.pdf_parser import ParsedPaper
+from parsers.text_normalizer import estimate_tokens
+from .context_budget import ContextBudget
+from .json_stream import aiter_json_items, iter_json_items
+from .prompt_cache import shared_prefix
+from .response_cache import cache_namespace
+
+
+class LLMExtractor:
+    """
+    One prompt built from the paper, one JSON reply from the LLM, parsed into items
+    
+    Subclasses set self.llm (and optionally ROLE_PROMPT) and implement
+    _build_prompt(), which returns the extraction task, and
+    _parse_response(). extract() and extract_async() only differ in how
+    the LLM is called, so API routes can await an extraction without
+    blocking the event loop while scripts keep calling extract(). Cached
+    LLM responses are grouped under the extractor's class name, so one
+    extractor's cache can be invalidated on its own.
+    
+    Every prompt starts with the same system prompt and the paper (cut to
+    what the model's context window leaves after the reply and a reserve
+    for the task), and only then the extractor's task. The paper part is
+    byte-identical across extractors, so the provider's prompt cache can
+    serve it to all but the first extraction of a paper.
+    """
+    
+    # Shared by every extractor, so it starts the common prefix of their prompts
+    SYSTEM_PROMPT: str = """You are an expert machine learning researcher analyzing academic papers.
+The paper comes first; the extraction task after it says what to extract.
+Follow the task exactly and output valid JSON only."""
+    
+    # Extractor-specific role, sent at the start of the task
+    ROLE_PROMPT: Optional[str] = None
+    
+    # Paper part of every prompt; byte-identical across extractors of the same paper and model
+    PAPER_TEMPLATE = """Paper Title: {title}
+
+Paper Content:
+{content}
+
+=== EXTRACTION TASK ===
+
+"""
+    
+    # Tokens kept for the task whatever its length, so short and long tasks cut the paper alike
+    INSTRUCTIONS_RESERVE_TOKENS: int = 4096
+    
+    # Bump when the prompt or parsing changes; concurrent requests only share extractions of the same version
+    VERSION: int = 3
+    
+    # Reply budget of every call (the clients' complete_json default)
+    MAX_OUTPUT_TOKENS: int = 4096
+    
+    def extract(self, paper: ParsedPaper) -> List[Any]:
+        """
+        Extract items from a parsed paper
+        
+        Args:
+            paper: ParsedPaper object
+            
+        Returns:
+            List of the extractor's dataclass items
+        """
+        prompt, prefix = self._prompt(paper)
+        with cache_namespace(type(self).__name__), shared_prefix(prefix):
+            response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
+        return self._parse_response(response)
+    
+    async def extract_async(self, paper: ParsedPaper) -> List[Any]:
+        """extract() awaiting the LLM on the event loop"""
+        prompt, prefix = self._prompt(paper)
+        with cache_namespace(type(self).__name__), shared_prefix(prefix):
+            response = await self.llm.complete_json_async(prompt, self.SYSTEM_PROMPT)
+        return self._parse_response(response)
+    
+    def extract_stream(self, paper: ParsedPaper) -> Iterator[Any]:
+        """
+        extract() yielding each item as soon as the LLM has written it
+        
+        Clients without complete_streaming answer in one piece, so their
+        items all arrive at the end. Streamed replies are not cached.
+        """
+        prompt, prefix = self._prompt(paper)
+        prompt, system_prompt = self.llm._json_prompts(prompt, self.SYSTEM_PROMPT)
+        with cache_namespace(type(self).__name__), shared_prefix(prefix):
+            if hasattr(self.llm, 'complete_streaming'):
+                chunks = self.llm.complete_streaming(prompt, system_prompt, max_tokens=self.MAX_OUTPUT_TOKENS)
+            else:
+                chunks = iter([self.llm.complete(prompt, system_prompt)])
+            for key, item in iter_json_items(chunks):
+                yield from self._parse_response({key: [item]} if key else [item])
+    
+    async def extract_stream_async(self, paper: ParsedPaper) -> AsyncIterator[Any]:
+        """extract_stream() on the event loop"""
+        prompt, prefix = self._prompt(paper)
+        prompt, system_prompt = self.llm._json_prompts(prompt, self.SYSTEM_PROMPT)
+        with cache_namespace(type(self).__name__), shared_prefix(prefix):
+            async for key, item in aiter_json_items(self.llm.stream_async(prompt, system_prompt,
+                                                                             max_tokens=self.MAX_OUTPUT_TOKENS)):
+                for parsed in self._parse_response({key: [item]} if key else [item]):
+                    yield parsed
+    
+    def _prompt(self, paper: ParsedPaper) -> Tuple[str, str]:
+        """
+        Prompt for a paper: the shared paper prefix, then this extractor's task
+        
+        Args:
+            paper: ParsedPaper object
+            
+        Returns:
+            (prompt, prefix) where prefix is the paper part shared with the
+            other extractors
+        """
+        task = self._build_prompt(paper)
+        if self.ROLE_PROMPT:
+            task = f"{self.ROLE_PROMPT}\n\n{task}"
+        budget = ContextBudget.for_client(self.llm, self.MAX_OUTPUT_TOKENS)
+        reserve = max(min(self.INSTRUCTIONS_RESERVE_TOKENS, budget.input_tokens // 3), estimate_tokens(task))
+        # A one-token placeholder keeps the newlines around {content} counted apart, as they will be
+        frame = self.PAPER_TEMPLATE.format(title=paper.title, content="#")
+        available = max(budget.available(self.SYSTEM_PROMPT, frame) - 1 - reserve, 0)
+        prefix = self.PAPER_TEMPLATE.format(title=paper.title, content=budget.fit(paper.llm_text, available))
+        return prefix + task, prefix
+    
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        raise NotImplementedError
+    
+    def _parse_response(self, response: Any) -> List[Any]:
+        raise NotImplementedError
@@ -4,6 +4,7 @@ Baselines Extractor - Extract baseline methods from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -21,10 +22,10 @@ class Baseline:
         return asdict(self)
 
 
-class BaselinesExtractor:
+class BaselinesExtractor(LLMExtractor):
     """Extract baseline comparison methods from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert machine learning researcher analyzing baseline methods in academic papers.
+    ROLE_PROMPT = """You are an expert machine learning researcher analyzing baseline methods in academic papers.
 Extract ALL baseline methods accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract all baseline methods that this paper compares against.
@@ -52,27 +53,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Baseline]:
-        """Extract baselines from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"📊 Extracting baselines from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Baseline]:
         baselines = []
         if isinstance(response, dict):
             items = response.get("baselines", [])
@@ -4,6 +4,7 @@ Key Claims Extractor - Extract key claims from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -19,10 +20,10 @@ class KeyClaim:
         return asdict(self)
 
 
-class ClaimsExtractor:
+class ClaimsExtractor(LLMExtractor):
     """Extract key claims from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting key claims from research papers.
+    ROLE_PROMPT = """You are an expert at extracting key claims from research papers.
 Extract all major claims accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract key claims made in this paper.
@@ -46,27 +47,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[KeyClaim]:
-        """Extract claims from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"💡 Extracting key claims from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[KeyClaim]:
         claims = []
         if isinstance(response, dict):
             items = response.get("claims", [])
@@ -4,6 +4,7 @@ Code and Resources Extractor - Extract URLs and resources from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -21,10 +22,10 @@ class CodeResource:
         return asdict(self)
 
 
-class CodeResourcesExtractor:
+class CodeResourcesExtractor(LLMExtractor):
     """Extract code, datasets, and resource URLs from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting code and data resources from research papers.
+    ROLE_PROMPT = """You are an expert at extracting code and data resources from research papers.
 Extract all URLs and resources accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract code, datasets, and resource URLs from this paper.
@@ -52,27 +53,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[CodeResource]:
-        """Extract code resources from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"💾 Extracting code/resources from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[CodeResource]:
         resources = []
         if isinstance(response, dict):
             items = response.get("resources", [])
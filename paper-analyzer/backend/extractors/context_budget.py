@@ -0,0 +1,131 @@
+"""
+Context Budget - Fit paper text into the model's context window by estimated tokens
+
+Extractors used to send a fixed character slice of the paper whatever the
+model: a fraction of a 200k-token window, or more than an 8k one holds.
+ContextBudget derives the input allowance from the configured model's
+context window minus the reply's max_tokens and the rest of the prompt,
+and cuts the paper at a section, paragraph or sentence boundary instead of
+mid-word.
+"""
+import re
+from typing import Any, Optional, Union
+
+from config import settings
+from parsers.disk_text import DiskText
+from parsers.text_normalizer import TOKEN_ESTIMATE_PATTERN, estimate_tokens
+
+# Context windows (prompt + reply) by model id substring; first match wins
+MODEL_CONTEXT_TOKENS = (
+    ("claude", 200000),
+    ("llama3-1", 128000), ("llama3-2", 128000), ("llama3-3", 128000), ("llama4", 128000),
+    ("llama3", 8192),
+    ("llama2", 4096),
+    ("deepseek", 64000),
+    ("mistral-large", 128000),
+    ("mistral", 32000),
+    ("nova", 300000),
+    ("titan", 8192),
+)
+
+# Window assumed for models not listed above
+DEFAULT_CONTEXT_TOKENS = 32000
+
+# Share of the window kept free: the estimate is not the provider's tokenizer
+SAFETY_MARGIN = 0.1
+
+# Normalised text averages well under this many characters per estimated
+# token, so a slice this long holds the budget (DiskText is never read whole)
+MAX_CHARS_PER_TOKEN = 8
+
+# Cut points in order of preference, each with the share of the budget it must keep
+CUT_PATTERNS = (
+    (re.compile(r'\n(?=\d+(?:\.\d+)*\.?\s+[A-Z])'), 0.75),  # before a numbered section heading
+    (re.compile(r'\n[ \t]*\n'), 0.85),  # paragraph break
+    (re.compile(r'(?<=[.!?])\s'), 0.9),  # sentence end
+    (re.compile(r'\n'), 0.9),  # line end
+    (re.compile(r'\s'), 0.0),  # word boundary
+)
+
+
+def context_window(model: str) -> int:
+    """Context window in tokens of a model id (settings.llm_context_tokens overrides)"""
+    if settings.llm_context_tokens > 0:
+        return settings.llm_context_tokens
+    model = model.lower()
+    for name, tokens in MODEL_CONTEXT_TOKENS:
+        if name in model:
+            return tokens
+    return DEFAULT_CONTEXT_TOKENS
+
+
+class ContextBudget:
+    """
+    Input token allowance of one LLM call
+
+    available() is what the window leaves for the paper text once the
+    reply and the other prompt parts are reserved; fit() cuts text to an
+    allowance at the best boundary it can find.
+    """
+
+    def __init__(self, context_tokens: int, max_output_tokens: int = 4096,
+                 safety_margin: float = SAFETY_MARGIN):
+        """
+        Args:
+            context_tokens: Model context window (prompt + reply)
+            max_output_tokens: max_tokens the call will request
+            safety_margin: Share of the window left unused to absorb estimation error
+        """
+        self.context_tokens = context_tokens
+        self.max_output_tokens = max_output_tokens
+        self.input_tokens = max(int(context_tokens * (1 - safety_margin)) - max_output_tokens, 0)
+
+    @classmethod
+    def for_client(cls, llm: Any, max_output_tokens: int = 4096) -> "ContextBudget":
+        """Budget for the model behind an LLM client (its `model` attribute)"""
+        return cls(context_window(getattr(llm, "model", "") or ""), max_output_tokens)
+
+    def available(self, *prompt_parts: Optional[str]) -> int:
+        """Tokens left for the paper text after the other prompt parts"""
+        used = sum(estimate_tokens(part) for part in prompt_parts if part)
+        return max(self.input_tokens - used, 0)
+
+    def fit(self, text: Union[str, DiskText], max_tokens: int) -> str:
+        """
+        Cut text to at most max_tokens estimated tokens
+
+        Args:
+            text: Paper text (a DiskText is only read up to the cut)
+            max_tokens: Token allowance, e.g. from available()
+
+        Returns:
+            The whole text when it fits, otherwise its longest prefix ending at
+            a section, paragraph, sentence, line or word boundary (preferred in
+            that order while they keep most of the allowance)
+        """
+        head = text[:max_tokens * MAX_CHARS_PER_TOKEN]
+        limit = None
+        for count, match in enumerate(TOKEN_ESTIMATE_PATTERN.finditer(head), 1):
+            if count > max_tokens:
+                limit = match.start()
+                break
+        if limit is None:
+            if len(head) == len(text):
+                return head
+            limit = len(head)
+
+        cut = self._cut_point(head, limit)
+        print(f"✂️  Paper text cut to {cut:,} of {len(text):,} chars ({max_tokens:,} token budget)")
+        return head[:cut].rstrip()
+
+    @staticmethod
+    def _cut_point(head: str, limit: int) -> int:
+        """Last preferred boundary before limit"""
+        for pattern, min_keep in CUT_PATTERNS:
+            floor = int(limit * min_keep)
+            last = None
+            for last in pattern.finditer(head, floor, limit):
+                pass
+            if last is not None and last.start() > 0:
+                return last.start()
+        return limit
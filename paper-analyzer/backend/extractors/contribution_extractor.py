@@ -4,6 +4,7 @@ Contribution Extractor - Extract technical contributions from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 import os
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -20,10 +21,10 @@ class Contribution:
         return asdict(self)
 
 
-class ContributionExtractor:
+class ContributionExtractor(LLMExtractor):
     """Extract technical contributions from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert machine learning researcher analyzing academic papers.
+    ROLE_PROMPT = """You are an expert machine learning researcher analyzing academic papers.
 Your task is to extract technical contributions accurately and systematically.
 Always output valid JSON only."""
     
@@ -56,14 +57,9 @@ Return the results in a structured JSON format with a list of dicts with the fol
 
 Output ONLY the JSON array. No explanations.
 
-Paper Title: {title}
-
 Paper Abstract:
 {abstract}
 
-Paper Content (first 15000 characters):
-{content}
-
 Output format:
 [
   {{
@@ -81,28 +77,16 @@ Output format:
         from .llm_client import get_llm_client
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Contribution]:
-        """
-        Extract contributions from a parsed paper
-        
-        Args:
-            paper: ParsedPaper object
-            
-        Returns:
-            List of Contribution objects
-        """
+    def _build_prompt(self, paper: ParsedPaper) -> str:
         # Format prompt
         prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            abstract=paper.abstract,
-            content=paper.full_text[:15000]  # Limit for token budget
+            abstract=paper.abstract
         )
         
-        # Get LLM response
         print(f"🔍 Extracting contributions from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
-        # Parse response
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Contribution]:
         contributions = []
         
         # Response might be wrapped in a key or be direct list
@@ -2,22 +2,189 @@
 DeepSeek LLM Client - Works with payment issues!
 """
 import json
+import threading
+import time
+import httpx
 import requests
-from typing import Dict, Any, Optional, Iterator
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Optional, Iterator, AsyncIterator
+from .async_http import LoopLocalAsyncClient
+from .json_stream import parse_partial_json
+from .prompt_cache import PromptUsage, usage_from_openai
+from .retry import RetryPolicy
+
+DEFAULT_API_URL = "https://api.deepseek.com/v1/chat/completions"
 
 
 class DeepSeekClient:
-    """LLM client using DeepSeek API"""
+    """
+    LLM client using DeepSeek API
+    
+    All calls go through one pooled requests.Session, so the TCP+TLS
+    handshake is paid once per connection instead of once per call. The
+    *_async methods do the same over an httpx.AsyncClient (one per event
+    loop) and never block the loop. Transient API errors are retried with
+    backoff behind a circuit breaker (see retry.RetryPolicy). The token
+    usage of every call, including the prompt tokens DeepSeek served from
+    its prefix cache, is recorded in self.usage.
+    """
+    
+    provider = "deepseek"
     
-    def __init__(self, api_key: str):
-        """Initialize DeepSeek client"""
+    def __init__(self, api_key: str, api_url: str = DEFAULT_API_URL, pool_connections: int = 4,
+                 pool_maxsize: int = 16, pool_block: bool = True, retry: Optional[RetryPolicy] = None):
+        """
+        Initialize DeepSeek client
+        
+        Args:
+            api_key: DeepSeek API key
+            api_url: Chat completions endpoint
+            pool_connections: Hosts whose connection pools are kept
+            pool_maxsize: Keep-alive connections per host (concurrent calls beyond this
+                wait for one when pool_block is set, otherwise use a throwaway connection)
+            pool_block: Enforce pool_maxsize as a hard per-host limit
+            retry: Retry/circuit breaker policy (default RetryPolicy() if None)
+        """
         self.api_key = api_key
-        self.api_url = "https://api.deepseek.com/v1/chat/completions"
+        self.api_url = api_url
         self.model = "deepseek-chat"
+        self.temperature = 0.1
         self.mock_mode = False
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.usage = PromptUsage()
+        
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._adapter = adapter
+        self._requests = 0
+        self._closed_connections = 0  # opened by pools that close() has since dropped
+        self._lock = threading.Lock()
+        
+        # pool_block's hard limit maps to max_connections; otherwise only idle connections are capped
+        limits = httpx.Limits(max_connections=pool_maxsize if pool_block else None,
+                              max_keepalive_connections=pool_maxsize)
+        self._async = LoopLocalAsyncClient(lambda: httpx.AsyncClient(
+            headers=dict(self.session.headers), limits=limits, trust_env=self.session.trust_env))
         
         print(f"✅ DeepSeek client initialized!")
     
+    def _post(self, payload: Dict[str, Any], **kwargs) -> requests.Response:
+        """POST to the API over a pooled keep-alive connection"""
+        with self._lock:
+            self._requests += 1
+        return self.session.post(self.api_url, json=payload, **kwargs)
+    
+    def _async_request_kwargs(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Arguments for an AsyncClient request to the API (counted like _post)"""
+        with self._lock:
+            self._requests += 1
+        return {"json": payload, "timeout": timeout, "extensions": {"trace": self._async.trace}}
+    
+    def _payload(self, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                 stream: bool = False) -> Dict[str, Any]:
+        """Chat completions request body"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": self.temperature
+        }
+        if stream:
+            payload["stream"] = True  # Enable streaming!
+            payload["stream_options"] = {"include_usage": True}  # usage arrives in the last chunk
+        return payload
+    
+    @staticmethod
+    def _sse_data(line: str) -> Optional[Dict[str, Any]]:
+        """JSON data of one server-sent events line, if it carries any"""
+        if not line.startswith('data: '):
+            return None
+        data_str = line[6:]  # Remove 'data: ' prefix
+        if data_str == '[DONE]':
+            return None
+        try:
+            return json.loads(data_str)
+        except json.JSONDecodeError:
+            return None
+    
+    @staticmethod
+    def _sse_content(data: Dict[str, Any]) -> Optional[str]:
+        """Content delta of one streamed chunk, if it carries one"""
+        if data.get('choices'):
+            return data['choices'][0].get('delta', {}).get('content')
+        return None
+    
+    def _pool_connections(self) -> int:
+        """Connections opened by the adapter's current per-host pools"""
+        pools = self._adapter.poolmanager.pools
+        opened = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        return opened
+    
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse since the client was created"""
+        with self._lock:
+            requests_sent = self._requests
+            opened = self._closed_connections + self._pool_connections()
+        opened += self._async.connections_opened
+        reused = max(requests_sent - opened, 0)
+        return {
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / requests_sent, 4) if requests_sent else 0.0
+        }
+    
+    def retry_stats(self) -> Dict[str, Any]:
+        """Retry attempts and circuit breaker state"""
+        return self.retry.stats()
+    
+    def probe(self) -> Dict[str, Any]:
+        """
+        Check that the API answers with this key (lists the models: no tokens are spent)
+        
+        Returns:
+            {"ready": bool, "detail": str, "seconds": float}
+        """
+        start = time.perf_counter()
+        models_url = self.api_url.rsplit("/chat/completions", 1)[0] + "/models"
+        try:
+            response = self.session.get(models_url, timeout=10)
+            response.raise_for_status()
+            ready, detail = True, f"DeepSeek - {self.model}"
+        except Exception as e:
+            ready, detail = False, f"{type(e).__name__}: {e}"
+        return {"ready": ready, "detail": detail, "seconds": round(time.perf_counter() - start, 3)}
+    
+    def usage_stats(self) -> Dict[str, Any]:
+        """Token usage and prompt cache hits reported by the API"""
+        return self.usage.stats()
+    
+    def close(self) -> None:
+        """Close the pooled connections (later calls open new ones)"""
+        with self._lock:
+            self._closed_connections += self._pool_connections()
+            self.session.close()
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections of both the blocking and the async API"""
+        self.close()
+        await self._async.aclose()
+    
     def complete(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
         """
         Get text completion from DeepSeek
@@ -30,32 +197,41 @@ class DeepSeekClient:
         Returns:
             LLM response as string
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        payload = self._payload(prompt, system_prompt, max_tokens)
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.1
-                },
+        def attempt() -> str:
+            start = time.perf_counter()
+            response = self._post(
+                payload,
                 timeout=120  # Increased timeout for large responses
             )
             
             response.raise_for_status()
             data = response.json()
+            self.usage.record(usage_from_openai(data.get('usage')), time.perf_counter() - start)
             
             return data['choices'][0]['message']['content']
-            
+        
+        try:
+            return self.retry.call(attempt)
+        except Exception as e:
+            print(f"❌ DeepSeek API Error: {e}")
+            raise
+    
+    async def complete_async(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        """complete() on the event loop: awaits the response instead of blocking"""
+        payload = self._payload(prompt, system_prompt, max_tokens)
+        
+        async def attempt() -> str:
+            start = time.perf_counter()
+            response = await self._async.get().post(self.api_url, **self._async_request_kwargs(payload, 120))
+            response.raise_for_status()
+            data = response.json()
+            self.usage.record(usage_from_openai(data.get('usage')), time.perf_counter() - start)
+            return data['choices'][0]['message']['content']
+        
+        try:
+            return await self.retry.call_async(attempt)
         except Exception as e:
             print(f"❌ DeepSeek API Error: {e}")
             raise
@@ -72,48 +248,64 @@ class DeepSeekClient:
         Yields:
             Chunks of text as they're generated
         """
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        payload = self._payload(prompt, system_prompt, max_tokens, stream=True)
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": self.model,
-                    "messages": messages,
-                    "max_tokens": max_tokens,
-                    "temperature": 0.1,
-                    "stream": True  # Enable streaming!
-                },
+        def attempt() -> Iterator[str]:
+            start = time.perf_counter()
+            first_token = usage = None
+            response = self._post(
+                payload,
                 stream=True,
                 timeout=180  # Increased timeout for streaming
             )
             
-            response.raise_for_status()
-            
-            # Parse SSE stream
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data_str = line[6:]  # Remove 'data: ' prefix
-                        if data_str == '[DONE]':
-                            break
-                        try:
-                            data = json.loads(data_str)
-                            if 'choices' in data and len(data['choices']) > 0:
-                                delta = data['choices'][0].get('delta', {})
-                                if 'content' in delta:
-                                    yield delta['content']
-                        except json.JSONDecodeError:
-                            continue
-            
+            # Parse SSE stream; the stream is read to its end so the connection goes back to the pool
+            with response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    data = self._sse_data(line.decode('utf-8')) if line else None
+                    if data is None:
+                        continue
+                    usage = data.get('usage') or usage
+                    content = self._sse_content(data)
+                    if content is not None:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                        yield content
+            self.usage.record(usage_from_openai(usage), time.perf_counter() - start, first_token)
+        
+        try:
+            yield from self.retry.iterate(attempt)
+        except Exception as e:
+            print(f"❌ DeepSeek Streaming API Error: {e}")
+            raise
+    
+    async def stream_async(self, prompt: str, system_prompt: Optional[str] = None,
+                           max_tokens: int = 16384) -> AsyncIterator[str]:
+        """complete_streaming() on the event loop: yields chunks as they arrive"""
+        payload = self._payload(prompt, system_prompt, max_tokens, stream=True)
+        
+        async def attempt() -> AsyncIterator[str]:
+            start = time.perf_counter()
+            first_token = usage = None
+            kwargs = self._async_request_kwargs(payload, 180)
+            async with self._async.get().stream("POST", self.api_url, **kwargs) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    data = self._sse_data(line)
+                    if data is None:
+                        continue
+                    usage = data.get('usage') or usage
+                    content = self._sse_content(data)
+                    if content is not None:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                        yield content
+            self.usage.record(usage_from_openai(usage), time.perf_counter() - start, first_token)
+        
+        try:
+            async for content in self.retry.iterate_async(attempt):
+                yield content
         except Exception as e:
             print(f"❌ DeepSeek Streaming API Error: {e}")
             raise
@@ -130,6 +322,19 @@ class DeepSeekClient:
         Returns:
             Parsed JSON as dictionary
         """
+        prompt, system_prompt = self._json_prompts(prompt, system_prompt)
+        response_text = self.complete(prompt, system_prompt, max_tokens=max_tokens)
+        return self._parse_json(response_text)
+    
+    async def complete_json_async(self, prompt: str, system_prompt: Optional[str] = None,
+                                  max_tokens: int = 4096) -> Dict[str, Any]:
+        """complete_json() on the event loop"""
+        prompt, system_prompt = self._json_prompts(prompt, system_prompt)
+        response_text = await self.complete_async(prompt, system_prompt, max_tokens=max_tokens)
+        return self._parse_json(response_text)
+    
+    def _json_prompts(self, prompt: str, system_prompt: Optional[str]) -> tuple:
+        """Add the JSON-only instructions to the prompts"""
         # Add JSON instruction
         json_instruction = """You MUST output ONLY valid JSON. 
 No explanations, no markdown, no code blocks, just pure JSON.
@@ -143,9 +348,10 @@ Start directly with { or [ and end with } or ]."""
         # Add JSON reminder to prompt
         if "output only" not in prompt.lower():
             prompt = f"{prompt}\n\nIMPORTANT: Output ONLY valid JSON. No markdown, no explanations."
-        
-        response_text = self.complete(prompt, system_prompt, max_tokens=max_tokens)
-        
+        return prompt, system_prompt
+    
+    def _parse_json(self, response_text: str) -> Dict[str, Any]:
+        """Parse a JSON reply, tolerating code fences and surrounding text"""
         # Clean response
         response_text = self._clean_json_response(response_text)
         
@@ -172,19 +378,11 @@ Start directly with { or [ and end with } or ]."""
         return text.strip()
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
-        """Try to extract JSON from text that might contain other content"""
-        import re
-        
-        # Try to find JSON object or array
-        json_pattern = r'(\{(?:[^{}]|(?:\{[^{}]*\}))*\}|\[(?:[^\[\]]|(?:\[[^\[\]]*\]))*\])'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        if matches:
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except:
-                    continue
+        """Recover JSON from text that might contain other content, or from a truncated reply"""
+        try:
+            return parse_partial_json(text)
+        except ValueError:
+            pass
         
         # If still failed, return error
         return {
@@ -4,7 +4,9 @@ Experiment Extractor - Extract experimental details from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from .llm_client import BedrockLLMClient, get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
+from parsers.tables import format_tables
 
 
 @dataclass
@@ -27,10 +29,10 @@ class Experiment:
         return asdict(self)
 
 
-class ExperimentExtractor:
+class ExperimentExtractor(LLMExtractor):
     """Extract experimental details from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert machine learning researcher analyzing experimental details in academic papers.
+    ROLE_PROMPT = """You are an expert machine learning researcher analyzing experimental details in academic papers.
 Extract ALL experimental information accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract all experiments from this paper with comprehensive details for replication.
@@ -98,36 +100,27 @@ Return in JSON format following this structure:
 
 Output ONLY the JSON. No explanations.
 
-Paper Title: {title}
-
-Paper Content:
-{content}
+Tables (rebuilt from the PDF layout, cells separated by " | "):
+{tables}
 """
     
+    # Character cap for the tables block; its tokens come out of the text's budget
+    TABLES_MAX_CHARS = 6000
+    
     def __init__(self, llm_client: BedrockLLMClient = None):
         self.llm = llm_client or get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Experiment]:
-        """
-        Extract experiments from a parsed paper
-        
-        Args:
-            paper: ParsedPaper object
-            
-        Returns:
-            List of Experiment objects
-        """
-        # Format prompt
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        # Format prompt - result tables often sit past the text cutoff
+        tables = format_tables(paper.tables, self.TABLES_MAX_CHARS)
         prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:20000]  # More content for experiments
+            tables=tables or "(none detected)"
         )
         
-        # Get LLM response
         print(f"🔬 Extracting experiments from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
-        # Parse response
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Experiment]:
         experiments = []
         
         if isinstance(response, dict):
@@ -4,6 +4,7 @@ Future Work Extractor - Extract future work directions from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -19,10 +20,10 @@ class FutureWorkItem:
         return asdict(self)
 
 
-class FutureWorkExtractor:
+class FutureWorkExtractor(LLMExtractor):
     """Extract future work directions from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting future work from research papers.
+    ROLE_PROMPT = """You are an expert at extracting future work from research papers.
 Extract all future directions accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract future work directions from this paper.
@@ -46,27 +47,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[FutureWorkItem]:
-        """Extract future work from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"🔮 Extracting future work from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[FutureWorkItem]:
         items_list = []
         if isinstance(response, dict):
             items = response.get("future_work", [])
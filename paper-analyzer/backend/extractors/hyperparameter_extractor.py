@@ -4,6 +4,7 @@ Hyperparameter Extractor - Extract training hyperparameters
 from typing import Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import BedrockLLMClient, get_llm_client
+from .base import LLMExtractor
 from parsers import ParsedPaper
 
 
@@ -31,7 +32,7 @@ class HyperparameterSet:
         return asdict(self)
 
 
-class HyperparameterExtractor:
+class HyperparameterExtractor(LLMExtractor):
     """Extract training hyperparameters from research papers"""
     
     PROMPT_TEMPLATE = """Extract all training hyperparameters from this paper.
@@ -73,37 +74,19 @@ Return in JSON format:
 }}
 
 Output only the JSON.
-
-Paper Title: {title}
-
-Paper Content (first 15000 chars):
-{content}
 """
     
     def __init__(self, llm_client: BedrockLLMClient = None):
         self.llm = llm_client or get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> list[HyperparameterSet]:
-        """
-        Extract hyperparameters from a parsed paper
-        
-        Args:
-            paper: ParsedPaper object
-            
-        Returns:
-            List of HyperparameterSet objects
-        """
+    def _build_prompt(self, paper: ParsedPaper) -> str:
         # Format prompt
-        prompt = self.PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:15000]
-        )
+        prompt = self.PROMPT_TEMPLATE.format()
         
-        # Get LLM response
         print("Extracting hyperparameters...")
-        response = self.llm.complete_json(prompt)
-        
-        # Parse response
+        return prompt
+    
+    def _parse_response(self, response: Any) -> list[HyperparameterSet]:
         hyperparameters = []
         items = response.get("hyperparameter_sets", [])
         
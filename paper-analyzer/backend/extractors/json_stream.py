@@ -0,0 +1,232 @@
+"""
+JSON Stream - Incremental decoder for LLM JSON replies
+
+Extraction replies are a list of items, either bare ([{...}, ...]) or
+under a top-level key ({"experiments": [{...}, ...]}). The decoder is fed
+the reply chunk by chunk and hands back each item as soon as its closing
+bracket arrives, so callers can use the first experiments while the model
+is still writing the rest. It tracks nesting exactly (strings and escapes
+included), so unlike a regex it is not limited in depth, and it can turn
+a truncated reply (max_tokens hit, stream cut off) into valid JSON holding
+every array element that was complete. Brackets in prose before the
+document ("see [1]", "{name}") start candidates that fail to parse; the
+decoder then drops them and tries the next '{' or '[' instead.
+"""
+import json
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+CLOSERS = {'{': '}', '[': ']'}
+
+# Item arrays: the top-level array, or arrays directly under a top-level key
+ITEM_STACKS = (['['], ['{', '['])
+
+
+class JSONStreamParser:
+    """
+    Push-style JSON scanner
+    
+    feed() returns the (key, item) pairs completed by a chunk, key being the
+    top-level key of the item's array (None for a bare array). result()
+    returns the whole document, repaired if it was cut off. The document is
+    the first '{' or '[' from which the reply parses; items already handed
+    out by a candidate that later turned out not to be JSON stay handed out.
+    """
+
+    def __init__(self):
+        self.items_yielded = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget the current candidate; the next '{' or '[' fed starts a new one"""
+        self._buf: List[str] = []
+        self._pos = 0  # characters scanned so far
+        self._started = False
+        self._stack: List[str] = []
+        self._expect_key: List[bool] = []  # per open object: next string is a key
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._item_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._scalar = False  # inside a number/true/false/null
+        self._safe = (0, [])  # (end, open stack) of the longest prefix that can be closed into valid JSON
+        self._document: Any = None
+        self._done = False
+
+    def _text(self, start: int, end: int) -> str:
+        if len(self._buf) > 1:
+            self._buf = [''.join(self._buf)]
+        return self._buf[0][start:end]
+
+    def _in_item_array(self) -> bool:
+        return self._stack in ITEM_STACKS
+
+    def _mark_safe(self, end: int) -> None:
+        # Inside an unfinished array element the cut would keep a partial item; wait for the element to close
+        if '[' in self._stack[:-1]:
+            return
+        self._safe = (end, list(self._stack))
+
+    def _end_scalar(self, end: int) -> None:
+        self._scalar = False
+        self._mark_safe(end)
+
+    def feed(self, chunk: str) -> List[Tuple[Optional[str], Any]]:
+        """Scan the next chunk; returns the items it completed"""
+        completed = []
+        while chunk and not self._done:
+            chunk = self._scan(chunk, completed)
+        return completed
+
+    def _abandon(self) -> str:
+        """Drop the current candidate, which is not JSON; returns the text after its opening bracket to rescan"""
+        rest = self._text(1, self._pos)
+        self._reset()
+        return rest
+
+    def _scan(self, chunk: str, completed: List[Tuple[Optional[str], Any]]) -> str:
+        """
+        Scan chunk as the continuation of the current candidate
+        
+        Returns:
+            '' once the chunk is consumed, or the text still to scan after
+            the candidate was abandoned
+        """
+        if not self._started:
+            # Skip prose and code fences before the document
+            starts = [i for i in (chunk.find('{'), chunk.find('[')) if i >= 0]
+            if not starts:
+                return ''
+            chunk = chunk[min(starts):]
+            self._started = True
+        self._buf.append(chunk)
+        base = self._pos
+        self._pos += len(chunk)
+
+        for offset, ch in enumerate(chunk):
+            i = base + offset
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._stack and self._stack[-1] == '{' and self._expect_key[-1]:
+                        if len(self._stack) == 1:
+                            try:
+                                self._pending_key = json.loads(self._text(self._string_start, i + 1))
+                            except json.JSONDecodeError:
+                                return self._abandon()
+                    else:
+                        self._mark_safe(i + 1)
+                        if self._in_item_array() and self._item_start is not None:
+                            if not self._complete_item(i + 1, completed):
+                                return self._abandon()
+                continue
+
+            if self._scalar and (ch in ',]}' or ch.isspace()):
+                self._end_scalar(i)
+                if self._in_item_array() and self._item_start is not None:
+                    if not self._complete_item(i, completed):
+                        return self._abandon()
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._start_item(i)
+            elif ch in '{[':
+                self._start_item(i)
+                self._stack.append(ch)
+                self._expect_key.append(ch == '{')
+                self._mark_safe(i + 1)
+            elif ch in '}]':
+                if not self._stack or CLOSERS[self._stack[-1]] != ch:
+                    return self._abandon()
+                self._stack.pop()
+                self._expect_key.pop()
+                self._mark_safe(i + 1)
+                if self._in_item_array() and self._item_start is not None:
+                    if not self._complete_item(i + 1, completed):
+                        return self._abandon()
+                if not self._stack:
+                    # The scan only tracks brackets and strings; the document as a whole must parse too
+                    try:
+                        self._document = json.loads(self._text(0, i + 1))
+                    except json.JSONDecodeError:
+                        return self._abandon()
+                    self._done = True  # trailing text after the document is ignored
+                    break
+            elif ch == ':':
+                if self._stack and self._stack[-1] == '{':
+                    self._expect_key[-1] = False
+                    if len(self._stack) == 1:
+                        self._key = self._pending_key
+            elif ch == ',':
+                if self._stack and self._stack[-1] == '{':
+                    self._expect_key[-1] = True
+            elif not ch.isspace() and not self._scalar:
+                self._scalar = True
+                self._start_item(i)
+        return ''
+
+    def _start_item(self, i: int) -> None:
+        if self._in_item_array() and self._item_start is None:
+            self._item_start = i
+
+    def _complete_item(self, end: int, completed: List[Tuple[Optional[str], Any]]) -> bool:
+        """Append the item ending at end to completed; False if it is not JSON"""
+        text = self._text(self._item_start, end)
+        self._item_start = None
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
+            return False
+        self.items_yielded += 1
+        completed.append(((self._key if self._stack == ['{', '['] else None), item))
+        return True
+
+    def result(self) -> Any:
+        """
+        The whole document; a truncated one is cut back to its last complete
+        value and its open brackets closed
+        
+        Raises:
+            ValueError: Nothing that looks like JSON was seen
+        """
+        while not self._done:
+            if not self._started:
+                raise ValueError("No JSON document in the response")
+            end, stack = self._safe
+            # Safe points sit right after a value or an opening bracket, never after a key or comma,
+            # and within arrays only between elements, so a cut-off item is dropped, not half kept
+            try:
+                return json.loads(self._text(0, end) + ''.join(CLOSERS[c] for c in reversed(stack)))
+            except json.JSONDecodeError:
+                rest = self._abandon()
+                while rest and not self._done:
+                    rest = self._scan(rest, [])
+        return self._document
+
+
+def parse_partial_json(text: str) -> Any:
+    """json.loads for LLM replies: skips text around the document and recovers truncated ones"""
+    parser = JSONStreamParser()
+    parser.feed(text)
+    return parser.result()
+
+
+def iter_json_items(chunks: Iterator[str]) -> Iterator[Tuple[Optional[str], Any]]:
+    """(key, item) pairs of a streamed JSON reply, each as soon as it is complete"""
+    parser = JSONStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+
+
+async def aiter_json_items(chunks: AsyncIterator[str]) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    """Async iter_json_items()"""
+    parser = JSONStreamParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
@@ -4,6 +4,7 @@ Limitations Extractor - Extract limitations from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -20,10 +21,10 @@ class Limitation:
         return asdict(self)
 
 
-class LimitationsExtractor:
+class LimitationsExtractor(LLMExtractor):
     """Extract limitations from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at analyzing limitations in research papers.
+    ROLE_PROMPT = """You are an expert at analyzing limitations in research papers.
 Extract all limitations accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract all limitations mentioned in this paper.
@@ -49,27 +50,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[Limitation]:
-        """Extract limitations from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"⚠️  Extracting limitations from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[Limitation]:
         limitations = []
         if isinstance(response, dict):
             items = response.get("limitations", [])
@@ -1,44 +1,134 @@
 """
 LLM Client using AWS Bedrock - REAL IMPLEMENTATION
 """
+import base64
 import json
-import boto3
-from botocore.exceptions import ClientError
-from typing import Dict, Any, Optional
+import threading
+import time
+from urllib.parse import quote
+import httpx
+from typing import Dict, Any, Optional, AsyncIterator, Iterator
 from config import settings
+from .async_http import LoopLocalAsyncClient
+from .json_stream import parse_partial_json
+from .prompt_cache import PromptUsage, split_shared_prefix, supports_prompt_caching, usage_from_bedrock
+from .rate_limiter import LLMRateLimiter, RateLimitedLLMClient
+from .response_cache import CachedLLMClient, LLMResponseCache
+from .retry import CircuitBreaker, LLMError, RetryPolicy, retry_after_seconds
 
 
 class BedrockLLMClient:
-    """LLM client using AWS Bedrock with Meta Llama 3.3 70B"""
+    """
+    LLM client using AWS Bedrock with Meta Llama 3.3 70B
     
-    def __init__(self):
-        """Initialize Bedrock client"""
+    The *_async methods send the same InvokeModel request over httpx,
+    signed with botocore's SigV4 signer and the boto3 session's
+    credentials, so the event loop is never blocked on a model call.
+    
+    API errors are retried (transient) or raised (permanent) by a
+    RetryPolicy; mock mode is only used when no client can be built.
+    
+    Construction does no I/O: boto3 is imported and the runtime client
+    built on first use, and probe() is the explicit connectivity check.
+    
+    Anthropic models that support prompt caching get a cache_control
+    marker after the prompt's shared prefix (see prompt_cache); the token
+    usage of every call, cache reads included, is recorded in self.usage.
+    """
+    
+    provider = "bedrock"
+    
+    def __init__(self, retry: Optional[RetryPolicy] = None):
+        """
+        Initialize Bedrock client
+        
+        Args:
+            retry: Retry/circuit breaker policy (default RetryPolicy() if None)
+        """
         self.mock_mode = False
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.usage = PromptUsage()
+        self.session = None
+        self._bedrock_runtime = None
+        self._connect_lock = threading.Lock()
+        self._async = LoopLocalAsyncClient(lambda: httpx.AsyncClient(timeout=120))
+    
+    @property
+    def bedrock_runtime(self):
+        """boto3 bedrock-runtime client, built on first use (None in mock mode)"""
+        if self._bedrock_runtime is None and not self.mock_mode:
+            self._connect()
+        return self._bedrock_runtime
+    
+    @bedrock_runtime.setter
+    def bedrock_runtime(self, client) -> None:
+        self._bedrock_runtime = client
+    
+    def _connect(self) -> None:
+        """Build the boto3 session and runtime client (no network I/O); mock mode if that fails"""
+        with self._connect_lock:
+            if self._bedrock_runtime is not None or self.mock_mode:
+                return
+            try:
+                import boto3
+                from botocore.config import Config
+                
+                self.session = boto3.Session(
+                    region_name=settings.aws_region,
+                    aws_access_key_id=settings.aws_access_key_id,
+                    aws_secret_access_key=settings.aws_secret_access_key
+                )
+                # Retries are the RetryPolicy's; botocore's own would multiply its attempts
+                self._bedrock_runtime = self.session.client(
+                    service_name='bedrock-runtime',
+                    config=Config(retries={"total_max_attempts": 1, "mode": "standard"})
+                )
+                print(f"✅ Bedrock client ready ({settings.bedrock_model_id})")
+            except Exception as e:
+                print(f"❌ Bedrock initialization failed, FALLING BACK TO MOCK MODE: {e}")
+                print(f"❌ Add valid AWS credentials to backend/.env or run Terraform setup")
+                self.mock_mode = True
+    
+    def probe(self) -> Dict[str, Any]:
+        """
+        Check that the configured model is reachable with these credentials
+        
+        Asks the Bedrock control plane for the model (GetFoundationModel):
+        no tokens are spent. Blocking; meant for a background readiness check.
         
+        Returns:
+            {"ready": bool, "detail": str, "seconds": float}
+        """
+        start = time.perf_counter()
+        if self.bedrock_runtime is None:
+            return {"ready": False, "detail": "mock mode (no Bedrock client)",
+                    "seconds": round(time.perf_counter() - start, 3)}
         try:
-            # Initialize boto3 client for Bedrock Runtime
-            self.bedrock_runtime = boto3.client(
-                service_name='bedrock-runtime',
-                region_name=settings.aws_region,
-                aws_access_key_id=settings.aws_access_key_id,
-                aws_secret_access_key=settings.aws_secret_access_key
-            )
+            from botocore.config import Config
             
-            # Test connection by listing models
-            try:
-                response = self.bedrock_runtime.list_foundation_models()
-                print(f"✅ Bedrock connected! Found {len(response.get('modelSummaries', []))} models")
-                print(f"✅ Using model: {settings.bedrock_model_id}")
-            except Exception as e:
-                print(f"⚠️  Bedrock connection test failed: {e}")
-                print(f"⚠️  Will attempt to use model anyway...")
-                
+            control = self.session.client(
+                service_name='bedrock', region_name=self.bedrock_runtime.meta.region_name,
+                config=Config(retries={"total_max_attempts": 1, "mode": "standard"},
+                              connect_timeout=5, read_timeout=10)
+            )
+            model_id = settings.bedrock_model_id
+            if model_id.split(".")[0] in ("us", "eu", "apac", "global"):
+                # Cross-region inference profiles are not foundation models
+                control.get_inference_profile(inferenceProfileIdentifier=model_id)
+            else:
+                control.get_foundation_model(modelIdentifier=model_id)
+            ready, detail = True, f"AWS Bedrock - {model_id}"
         except Exception as e:
-            print(f"❌ Bedrock initialization failed: {e}")
-            print(f"❌ FALLING BACK TO MOCK MODE")
-            print(f"❌ Add valid AWS credentials to backend/.env or run Terraform setup")
-            self.bedrock_runtime = None
-            self.mock_mode = True
+            ready, detail = False, f"{type(e).__name__}: {e}"
+        return {"ready": ready, "detail": detail, "seconds": round(time.perf_counter() - start, 3)}
+    
+    @property
+    def model(self) -> str:
+        return settings.bedrock_model_id
+    
+    @property
+    def temperature(self) -> float:
+        return settings.bedrock_model_temperature
     
     def complete(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
         """
@@ -55,110 +145,323 @@ class BedrockLLMClient:
         if self.mock_mode or not self.bedrock_runtime:
             return self._mock_response(prompt)
         
-        try:
-            print(f"🔍 Calling {settings.bedrock_model_id[:40]}... (max_tokens={max_tokens})")
-            
-            # Detect model type from ID
-            model_id = settings.bedrock_model_id
-            
-            if "anthropic" in model_id or "claude" in model_id:
-                # Anthropic Claude format
-                request_body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": max_tokens,
-                    "temperature": settings.bedrock_model_temperature,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ]
-                }
-                if system_prompt:
-                    request_body["system"] = system_prompt
-                    
-            elif "meta" in model_id or "llama" in model_id:
-                # Meta Llama format
-                full_prompt = prompt
-                if system_prompt:
-                    full_prompt = f"{system_prompt}\n\n{prompt}"
-                request_body = {
-                    "prompt": full_prompt,
-                    "temperature": settings.bedrock_model_temperature,
-                    "max_gen_len": max_tokens,
-                }
-            else:
-                # Generic format - try Anthropic style
-                request_body = {
-                    "max_tokens": max_tokens,
-                    "temperature": settings.bedrock_model_temperature,
-                    "messages": [{"role": "user", "content": prompt}]
-                }
-                if system_prompt:
-                    request_body["system"] = system_prompt
-            
+        print(f"🔍 Calling {settings.bedrock_model_id[:40]}... (max_tokens={max_tokens})")
+        body = json.dumps(self._request_body(prompt, system_prompt, max_tokens))
+        
+        def attempt() -> Dict[str, Any]:
+            start = time.perf_counter()
             # Call Bedrock
             response = self.bedrock_runtime.invoke_model(
                 modelId=settings.bedrock_model_id,
                 contentType="application/json",
                 accept="application/json",
-                body=json.dumps(request_body)
+                body=body
             )
             
             # Parse response
             response_body = json.loads(response['body'].read())
-            
-            print(f"✅ Got response!")
-            
-            # Extract text from response - handle multiple formats
-            # Anthropic Claude format
-            if 'content' in response_body and isinstance(response_body['content'], list):
-                return response_body['content'][0]['text']
-            # Meta Llama format
-            elif 'generation' in response_body:
-                return response_body['generation']
-            # OpenAI-style format
-            elif 'choices' in response_body:
-                return response_body['choices'][0]['message']['content']
-            # Simple content field
-            elif 'content' in response_body:
-                return response_body['content']
-            # Completion field
-            elif 'completion' in response_body:
-                return response_body['completion']
-            # Output wrapper
-            elif 'output' in response_body:
-                if isinstance(response_body['output'], dict) and 'message' in response_body['output']:
-                    return response_body['output']['message']['content']
-                return response_body['output']
-            else:
-                print(f"⚠️  Unexpected response format: {response_body}")
-                return str(response_body)
-                
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_msg = e.response['Error']['Message']
-            print(f"❌ Bedrock API Error ({error_code}): {error_msg}")
-            
-            if error_code == 'AccessDeniedException':
-                print(f"❌ ACCESS DENIED! You need to:")
-                print(f"   1. Request model access in AWS Console")
-                print(f"   2. Go to: https://console.aws.amazon.com/bedrock")
-                print(f"   3. Click 'Model Access' → Enable DeepSeek")
-            elif error_code == 'ResourceNotFoundException':
-                print(f"❌ MODEL NOT FOUND! Model ID might be wrong:")
-                print(f"   Current: {settings.bedrock_model_id}")
-                print(f"   Try: anthropic.claude-3-sonnet-20240229-v1:0")
-            
-            print(f"❌ Falling back to mock mode")
-            self.mock_mode = True
+            self.usage.record(usage_from_bedrock(response_body), time.perf_counter() - start)
+            return response_body
+        
+        try:
+            response_body = self.retry.call(attempt)
+        except Exception as e:
+            self._report_error(e)
+            raise
+        
+        print(f"✅ Got response!")
+        return self._response_text(response_body)
+    
+    async def complete_async(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        """complete() on the event loop: a SigV4-signed InvokeModel request over httpx"""
+        if self.mock_mode or not self.bedrock_runtime:
             return self._mock_response(prompt)
+        
+        print(f"🔍 Calling {settings.bedrock_model_id[:40]}... (max_tokens={max_tokens})")
+        body = json.dumps(self._request_body(prompt, system_prompt, max_tokens))
+        
+        async def attempt() -> Dict[str, Any]:
+            start = time.perf_counter()
+            # Signed per attempt: SigV4 signatures carry a timestamp
+            url, headers = self._signed_invoke_request(body)
+            response = await self._async.get().post(url, content=body, headers=headers,
+                                                     extensions={"trace": self._async.trace})
+            if response.status_code >= 400:
+                raise self._http_error(response)
+            response_body = response.json()
+            self.usage.record(usage_from_bedrock(response_body), time.perf_counter() - start)
+            return response_body
+        
+        try:
+            response_body = await self.retry.call_async(attempt)
+        except Exception as e:
+            self._report_error(e)
+            raise
+        
+        print(f"✅ Got response!")
+        return self._response_text(response_body)
+    
+    def complete_streaming(self, prompt: str, system_prompt: Optional[str] = None,
+                           max_tokens: int = 16384) -> Iterator[str]:
+        """
+        Get streaming text completion from Bedrock (InvokeModelWithResponseStream)
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
             
+        Yields:
+            Non-empty chunks of text as they're generated, like DeepSeekClient.complete_streaming
+        """
+        if self.mock_mode or not self.bedrock_runtime:
+            yield self._mock_response(prompt)
+            return
+        
+        print(f"🔍 Streaming {settings.bedrock_model_id[:40]}... (max_tokens={max_tokens})")
+        body = json.dumps(self._request_body(prompt, system_prompt, max_tokens))
+        
+        def attempt() -> Iterator[str]:
+            start = time.perf_counter()
+            first_token, usage = None, {}
+            response = self.bedrock_runtime.invoke_model_with_response_stream(
+                modelId=settings.bedrock_model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=body
+            )
+            # Exception events are raised by the EventStream as ClientErrors
+            for event in response['body']:
+                if 'chunk' in event:
+                    chunk = json.loads(event['chunk']['bytes'])
+                    usage.update(usage_from_bedrock(chunk))
+                    text = self._stream_chunk_text(chunk)
+                    if text:
+                        if first_token is None:
+                            first_token = time.perf_counter() - start
+                        yield text
+            self.usage.record(usage, time.perf_counter() - start, first_token)
+        
+        try:
+            yield from self.retry.iterate(attempt)
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-            print(f"❌ Falling back to mock mode")
-            self.mock_mode = True
-            return self._mock_response(prompt)
+            self._report_error(e)
+            raise
+    
+    async def stream_async(self, prompt: str, system_prompt: Optional[str] = None,
+                           max_tokens: int = 16384) -> AsyncIterator[str]:
+        """complete_streaming() on the event loop: the response stream read over httpx"""
+        if self.mock_mode or not self.bedrock_runtime:
+            yield self._mock_response(prompt)
+            return
+        
+        print(f"🔍 Streaming {settings.bedrock_model_id[:40]}... (max_tokens={max_tokens})")
+        body = json.dumps(self._request_body(prompt, system_prompt, max_tokens))
+        
+        async def attempt() -> AsyncIterator[str]:
+            start = time.perf_counter()
+            first_token, usage = None, {}
+            url, headers = self._signed_invoke_request(body, stream=True)
+            async with self._async.get().stream("POST", url, content=body, headers=headers,
+                                                extensions={"trace": self._async.trace}) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise self._http_error(response)
+                from botocore.eventstream import EventStreamBuffer
+                events = EventStreamBuffer()
+                async for data in response.aiter_bytes():
+                    events.add_data(data)
+                    for message in events:
+                        chunk = self._stream_event_chunk(message.headers, message.payload)
+                        if chunk is None:
+                            continue
+                        usage.update(usage_from_bedrock(chunk))
+                        text = self._stream_chunk_text(chunk)
+                        if text:
+                            if first_token is None:
+                                first_token = time.perf_counter() - start
+                            yield text
+            self.usage.record(usage, time.perf_counter() - start, first_token)
+        
+        try:
+            async for text in self.retry.iterate_async(attempt):
+                yield text
+        except Exception as e:
+            self._report_error(e)
+            raise
+    
+    def _stream_event_chunk(self, headers: Dict[str, Any], payload: bytes) -> Optional[Dict[str, Any]]:
+        """Decoded chunk of one raw response-stream event; exception events raise LLMError like boto3 does"""
+        if headers.get(":message-type") == "exception":
+            code = headers.get(":exception-type", "")
+            try:
+                message = json.loads(payload).get("message", "")
+            except ValueError:
+                message = payload.decode("utf-8", "replace")
+            raise LLMError(message, code=code[:1].upper() + code[1:])
+        if headers.get(":event-type") != "chunk":
+            return None
+        return json.loads(base64.b64decode(json.loads(payload)["bytes"]))
+    
+    def _stream_chunk_text(self, chunk: Dict[str, Any]) -> Optional[str]:
+        """Text delta of one decoded stream chunk, for the formats _response_text handles"""
+        # Anthropic Claude format: only content_block_delta events carry text
+        if 'delta' in chunk and isinstance(chunk['delta'], dict):
+            return chunk['delta'].get('text')
+        if 'type' in chunk:
+            return None  # message_start, content_block_stop, message_delta, ...
+        # Meta Llama format
+        if 'generation' in chunk:
+            return chunk['generation']
+        # OpenAI-style format
+        if 'choices' in chunk:
+            choice = chunk['choices'][0] if chunk['choices'] else {}
+            return (choice.get('delta') or {}).get('content') or choice.get('text')
+        # Completion / Titan-style fields
+        for key in ('completion', 'outputText', 'content'):
+            if isinstance(chunk.get(key), str):
+                return chunk[key]
+        return None
+    
+    def _http_error(self, response: httpx.Response) -> LLMError:
+        """LLMError for a failed Bedrock HTTP response (the error shape botocore turns into ClientError)"""
+        error_code = response.headers.get("x-amzn-ErrorType", str(response.status_code)).split(":")[0]
+        try:
+            error_msg = response.json().get("message", response.text)
+        except ValueError:
+            error_msg = response.text
+        return LLMError(error_msg, status=response.status_code, code=error_code,
+                        retry_after=retry_after_seconds(response.headers))
+    
+    def _signed_invoke_request(self, body: str, stream: bool = False) -> tuple:
+        """URL and SigV4-signed headers of an InvokeModel(WithResponseStream) call, as boto3 would send it"""
+        from botocore.auth import SigV4Auth
+        from botocore.awsrequest import AWSRequest
+        
+        model_id = settings.bedrock_model_id
+        action = "invoke-with-response-stream" if stream else "invoke"
+        url = f"{self.bedrock_runtime.meta.endpoint_url}/model/{quote(model_id, safe='')}/{action}"
+        accept_header = "X-Amzn-Bedrock-Accept" if stream else "Accept"
+        request = AWSRequest(method="POST", url=url, data=body,
+                             headers={"Content-Type": "application/json", accept_header: "application/json"})
+        credentials = self.session.get_credentials()
+        if credentials is None:
+            raise RuntimeError("No AWS credentials configured")
+        SigV4Auth(credentials.get_frozen_credentials(), "bedrock", self.bedrock_runtime.meta.region_name).add_auth(request)
+        return url, dict(request.headers.items())
+    
+    def _request_body(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> Dict[str, Any]:
+        """InvokeModel body in the format of the configured model family"""
+        # Detect model type from ID
+        model_id = settings.bedrock_model_id
+        
+        if "anthropic" in model_id or "claude" in model_id:
+            # Anthropic Claude format
+            content: Any = prompt
+            prefix, rest = split_shared_prefix(prompt)
+            if prefix and settings.llm_prompt_caching and supports_prompt_caching(model_id):
+                # Cache the system prompt and the shared prefix; only the rest is read fresh
+                content = [
+                    {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": rest}
+                ]
+            request_body = {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens,
+                "temperature": settings.bedrock_model_temperature,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": content
+                    }
+                ]
+            }
+            if system_prompt:
+                request_body["system"] = system_prompt
+                
+        elif "meta" in model_id or "llama" in model_id:
+            # Meta Llama format
+            full_prompt = prompt
+            if system_prompt:
+                full_prompt = f"{system_prompt}\n\n{prompt}"
+            request_body = {
+                "prompt": full_prompt,
+                "temperature": settings.bedrock_model_temperature,
+                "max_gen_len": max_tokens,
+            }
+        else:
+            # Generic format - try Anthropic style
+            request_body = {
+                "max_tokens": max_tokens,
+                "temperature": settings.bedrock_model_temperature,
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            if system_prompt:
+                request_body["system"] = system_prompt
+        return request_body
+    
+    def _response_text(self, response_body: Dict[str, Any]) -> str:
+        """Completion text from an InvokeModel response body"""
+        # Extract text from response - handle multiple formats
+        # Anthropic Claude format
+        if 'content' in response_body and isinstance(response_body['content'], list):
+            return response_body['content'][0]['text']
+        # Meta Llama format
+        elif 'generation' in response_body:
+            return response_body['generation']
+        # OpenAI-style format
+        elif 'choices' in response_body:
+            return response_body['choices'][0]['message']['content']
+        # Simple content field
+        elif 'content' in response_body:
+            return response_body['content']
+        # Completion field
+        elif 'completion' in response_body:
+            return response_body['completion']
+        # Output wrapper
+        elif 'output' in response_body:
+            if isinstance(response_body['output'], dict) and 'message' in response_body['output']:
+                return response_body['output']['message']['content']
+            return response_body['output']
+        else:
+            print(f"⚠️  Unexpected response format: {response_body}")
+            return str(response_body)
+    
+    def _report_error(self, error: Exception) -> None:
+        """Print a failed call's error, with setup hints for the permanent ones"""
+        from botocore.exceptions import ClientError
+        
+        if isinstance(error, ClientError):
+            error_code = error.response['Error']['Code']
+            error_msg = error.response['Error']['Message']
+        elif isinstance(error, LLMError):
+            error_code, error_msg = error.code, str(error)
+        else:
+            print(f"❌ Bedrock call failed: {type(error).__name__}: {error}")
+            return
+        print(f"❌ Bedrock API Error ({error_code}): {error_msg}")
+        
+        if error_code == 'AccessDeniedException':
+            print(f"❌ ACCESS DENIED! You need to:")
+            print(f"   1. Request model access in AWS Console")
+            print(f"   2. Go to: https://console.aws.amazon.com/bedrock")
+            print(f"   3. Click 'Model Access' → Enable DeepSeek")
+        elif error_code == 'ResourceNotFoundException':
+            print(f"❌ MODEL NOT FOUND! Model ID might be wrong:")
+            print(f"   Current: {settings.bedrock_model_id}")
+            print(f"   Try: anthropic.claude-3-sonnet-20240229-v1:0")
+    
+    def retry_stats(self) -> Dict[str, Any]:
+        """Retry attempts and circuit breaker state"""
+        return self.retry.stats()
+    
+    def usage_stats(self) -> Dict[str, Any]:
+        """Token usage and prompt cache hits reported by Bedrock"""
+        return self.usage.stats()
+    
+    async def aclose(self) -> None:
+        """Close the async API's pooled connections"""
+        await self._async.aclose()
     
     def complete_json(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> Dict[str, Any]:
         """
@@ -172,6 +475,19 @@ class BedrockLLMClient:
         Returns:
             Parsed JSON as dictionary
         """
+        prompt, system_prompt = self._json_prompts(prompt, system_prompt)
+        response_text = self.complete(prompt, system_prompt, max_tokens=max_tokens)
+        return self._parse_json(response_text)
+    
+    async def complete_json_async(self, prompt: str, system_prompt: Optional[str] = None,
+                                  max_tokens: int = 4096) -> Dict[str, Any]:
+        """complete_json() on the event loop"""
+        prompt, system_prompt = self._json_prompts(prompt, system_prompt)
+        response_text = await self.complete_async(prompt, system_prompt, max_tokens=max_tokens)
+        return self._parse_json(response_text)
+    
+    def _json_prompts(self, prompt: str, system_prompt: Optional[str]) -> tuple:
+        """Add the JSON-only instructions to the prompts"""
         # Add JSON instruction to system prompt
         json_instruction = """You MUST output ONLY valid JSON. 
 No explanations, no markdown, no code blocks, just pure JSON.
@@ -185,9 +501,10 @@ Start directly with { or [ and end with } or ]."""
         # Add JSON reminder to prompt
         if "output only" not in prompt.lower():
             prompt = f"{prompt}\n\nIMPORTANT: Output ONLY valid JSON. No markdown, no explanations."
-        
-        response_text = self.complete(prompt, system_prompt, max_tokens=max_tokens)
-        
+        return prompt, system_prompt
+    
+    def _parse_json(self, response_text: str) -> Dict[str, Any]:
+        """Parse a JSON reply, tolerating code fences and surrounding text"""
         # Clean response
         response_text = self._clean_json_response(response_text)
         
@@ -214,20 +531,11 @@ Start directly with { or [ and end with } or ]."""
         return text.strip()
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
-        """Try to extract JSON from text that might contain other content"""
-        import re
-        
-        # Try to find JSON object or array
-        # Match { ... } or [ ... ]
-        json_pattern = r'(\{(?:[^{}]|(?:\{[^{}]*\}))*\}|\[(?:[^\[\]]|(?:\[[^\[\]]*\]))*\])'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        if matches:
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except:
-                    continue
+        """Recover JSON from text that might contain other content, or from a truncated reply"""
+        try:
+            return parse_partial_json(text)
+        except ValueError:
+            pass
         
         # If still failed, return error
         return {
@@ -291,19 +599,114 @@ See terraform/README.md for detailed instructions."""
 
 # Global LLM client instance
 _llm_client = None
+_llm_limiter = None
+_llm_cache = None
+
+
+def get_llm_limiter() -> LLMRateLimiter:
+    """Get or create the process-wide limiter every LLM call goes through"""
+    global _llm_limiter
+    if _llm_limiter is None:
+        _llm_limiter = LLMRateLimiter(
+            max_in_flight=settings.llm_max_in_flight,
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute
+        )
+    return _llm_limiter
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get or open the persistent response cache (None when disabled)"""
+    global _llm_cache
+    if _llm_cache is None and settings.llm_cache_enabled:
+        _llm_cache = LLMResponseCache(
+            settings.llm_cache_path,
+            max_bytes=settings.llm_cache_max_mb << 20,
+            ttl_seconds=settings.llm_cache_ttl_hours * 3600
+        )
+    return _llm_cache
+
+
+def _retry_policy() -> RetryPolicy:
+    """Retry/circuit breaker policy from settings"""
+    return RetryPolicy(
+        max_attempts=settings.llm_retry_attempts,
+        base_delay=settings.llm_retry_base_delay,
+        max_delay=settings.llm_retry_max_delay,
+        breaker=CircuitBreaker(
+            failure_threshold=settings.llm_breaker_failures,
+            reset_timeout=settings.llm_breaker_reset_seconds
+        )
+    )
 
 
 def get_llm_client():
-    """Get or create global LLM client instance based on settings"""
+    """Get or create global LLM client instance based on settings, behind the response cache and shared limiter"""
     global _llm_client
     if _llm_client is None:
         from config import settings
-        from .deepseek_client import DeepSeekClient
         
         if settings.llm_provider.lower() == "deepseek":
+            from .deepseek_client import DeepSeekClient
             print(f"🔧 Using DeepSeek LLM (provider={settings.llm_provider})")
-            _llm_client = DeepSeekClient(api_key=settings.deepseek_api_key)
+            client = DeepSeekClient(
+                api_key=settings.deepseek_api_key,
+                api_url=settings.deepseek_api_url,
+                pool_connections=settings.deepseek_pool_connections,
+                pool_maxsize=settings.deepseek_pool_maxsize,
+                pool_block=settings.deepseek_pool_block,
+                retry=_retry_policy()
+            )
         else:
             print(f"🔧 Using Bedrock LLM (provider={settings.llm_provider})")
-            _llm_client = BedrockLLMClient()
+            client = BedrockLLMClient(retry=_retry_policy())
+        _llm_client = RateLimitedLLMClient(client, get_llm_limiter())
+        cache = get_llm_cache()
+        if cache is not None:
+            # Outermost, so cache hits never wait for the limiter
+            _llm_client = CachedLLMClient(_llm_client, cache)
     return _llm_client
+
+
+def get_llm_stats() -> Optional[Dict[str, Any]]:
+    """Connection stats of the global client, if one exists and keeps any (never creates it)"""
+    if _llm_client is None or not hasattr(_llm_client, "stats"):
+        return None
+    return _llm_client.stats()
+
+
+def get_llm_limiter_stats() -> Dict[str, Any]:
+    """Queue depth, wait times and bucket levels of the shared limiter"""
+    return get_llm_limiter().stats()
+
+
+def get_llm_retry_stats() -> Optional[Dict[str, Any]]:
+    """Retry attempts and breaker state of the global client, if one exists (never creates it)"""
+    if _llm_client is None:
+        return None
+    return _llm_client.retry_stats()
+
+
+def get_llm_usage_stats() -> Optional[Dict[str, Any]]:
+    """Provider-reported token usage and prompt cache hits of the global client, if one exists (never creates it)"""
+    if _llm_client is None or not hasattr(_llm_client, "usage_stats"):
+        return None
+    return _llm_client.usage_stats()
+
+
+def get_llm_cache_stats() -> Optional[Dict[str, Any]]:
+    """Hits, misses and tokens saved by the response cache (None when disabled)"""
+    cache = get_llm_cache()
+    return cache.stats() if cache is not None else None
+
+
+def invalidate_llm_cache(namespace: Optional[str] = None) -> int:
+    """Drop cached responses of one namespace (all if None); returns the number dropped"""
+    cache = get_llm_cache()
+    return cache.invalidate(namespace) if cache is not None else 0
+
+
+async def close_llm_client() -> None:
+    """Release the global client's pooled connections (extractors keep the client and reconnect)"""
+    if _llm_client is not None:
+        await _llm_client.aclose()
@@ -4,7 +4,9 @@ Evaluation Metrics Extractor - Extract evaluation metrics from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
+from parsers.tables import format_tables
 
 
 @dataclass
@@ -21,10 +23,10 @@ class EvaluationMetric:
         return asdict(self)
 
 
-class MetricsExtractor:
+class MetricsExtractor(LLMExtractor):
     """Extract evaluation metrics from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting evaluation metrics from research papers.
+    ROLE_PROMPT = """You are an expert at extracting evaluation metrics from research papers.
 Extract all metrics accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract all evaluation metrics used in this paper.
@@ -53,26 +55,29 @@ Return in JSON format:
 
 Output ONLY the JSON. No explanations.
 
-Paper Title: {title}
-
-Paper Content:
-{content}
+Table Headers (caption, header row and first row of each table):
+{tables}
 """
     
+    # Character cap for the table headers block; its tokens come out of the text's budget
+    TABLES_MAX_CHARS = 3000
+    # Metric names live in the header row; the values are not needed here
+    TABLE_ROWS = 2
+    
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[EvaluationMetric]:
-        """Extract metrics from a parsed paper"""
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        tables = format_tables(paper.tables, self.TABLES_MAX_CHARS, max_rows=self.TABLE_ROWS)
         prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
+            tables=tables or "(none detected)"
         )
         
         print(f"📈 Extracting evaluation metrics from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[EvaluationMetric]:
         metrics = []
         if isinstance(response, dict):
             items = response.get("metrics", [])
@@ -0,0 +1,168 @@
+"""
+Prompt Cache - Shared prompt prefixes and the cached-token counts providers report
+
+Every extraction of a paper sends the same paper text. Laid out as a
+byte-identical prefix (shared system prompt, then the paper, then the
+extractor's task), it can be served from the provider's prompt cache:
+DeepSeek matches prefixes automatically and reports prompt_cache_hit_tokens;
+Anthropic models on Bedrock cache up to an explicit cache_control marker and
+report cache_read_input_tokens. PromptUsage records what each call actually
+paid for, so the savings show up in /api/metrics.
+"""
+import contextvars
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .response_cache import current_namespace
+
+# Prefix of the prompts sent in the current thread/task (see shared_prefix)
+_prefix: contextvars.ContextVar = contextvars.ContextVar("llm_shared_prefix", default=None)
+
+# Bedrock model ids (substrings) that accept Anthropic cache_control markers
+PROMPT_CACHE_MODELS = (
+    "claude-3-5-haiku", "claude-3-7-sonnet", "claude-sonnet-4", "claude-opus-4", "claude-haiku-4"
+)
+
+# Calls kept for the per-call listing in stats()
+RECENT_CALLS = 20
+
+USAGE_FIELDS = ("input_tokens", "cached_tokens", "cache_write_tokens", "output_tokens")
+
+
+@contextmanager
+def shared_prefix(prefix: str) -> Iterator[None]:
+    """Mark the start of the prompts sent inside the block as shared with other calls (thread- and task-local)"""
+    token = _prefix.set(prefix)
+    try:
+        yield
+    finally:
+        _prefix.reset(token)
+
+
+def split_shared_prefix(prompt: str) -> Tuple[str, str]:
+    """(shared prefix, rest) of a prompt; ("", prompt) when it does not start with the current prefix"""
+    prefix = _prefix.get()
+    if prefix and prompt.startswith(prefix):
+        return prefix, prompt[len(prefix):]
+    return "", prompt
+
+
+def supports_prompt_caching(model_id: str) -> bool:
+    """Whether a Bedrock model takes cache_control markers"""
+    return any(name in model_id for name in PROMPT_CACHE_MODELS)
+
+
+def usage_from_openai(usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Token counts of an OpenAI-style `usage` object (DeepSeek adds prompt_cache_hit_tokens)"""
+    if not usage:
+        return {}
+    cached = usage.get("prompt_cache_hit_tokens")
+    if cached is None:
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+    return {
+        "input_tokens": usage.get("prompt_tokens", 0),
+        "cached_tokens": cached or 0,
+        "output_tokens": usage.get("completion_tokens", 0)
+    }
+
+
+def usage_from_bedrock(body: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Token counts found in a Bedrock response body or response-stream chunk
+
+    Anthropic bodies carry `usage` (input_tokens excludes cache reads and
+    writes); Llama bodies carry prompt/generation counts; the last chunk of
+    every response stream carries amazon-bedrock-invocationMetrics. Only the
+    counts present are returned, so the chunks of a stream can be merged.
+    """
+    found: Dict[str, int] = {}
+    message = body.get("message") if body.get("type") == "message_start" else body
+    usage = (message or {}).get("usage")
+    if isinstance(usage, dict):
+        if "prompt_tokens" in usage:
+            found.update(usage_from_openai(usage))
+        else:
+            read = usage.get("cache_read_input_tokens") or 0
+            written = usage.get("cache_creation_input_tokens") or 0
+            if "input_tokens" in usage:
+                found.update(input_tokens=usage["input_tokens"] + read + written,
+                             cached_tokens=read, cache_write_tokens=written)
+            if "output_tokens" in usage:
+                found["output_tokens"] = usage["output_tokens"]
+    # Llama: counts so far (prompt_token_count is null after the first chunk)
+    if body.get("prompt_token_count") is not None:
+        found["input_tokens"] = body["prompt_token_count"]
+    if body.get("generation_token_count") is not None:
+        found["output_tokens"] = body["generation_token_count"]
+    metrics = body.get("amazon-bedrock-invocationMetrics")
+    if isinstance(metrics, dict):
+        read = metrics.get("cacheReadInputTokenCount") or 0
+        written = metrics.get("cacheWriteInputTokenCount") or 0
+        found.update(input_tokens=metrics.get("inputTokenCount", 0) + read + written,
+                     cached_tokens=read, cache_write_tokens=written,
+                     output_tokens=metrics.get("outputTokenCount", 0))
+    return found
+
+
+class PromptUsage:
+    """
+    Provider-reported token usage per call
+
+    input_tokens counts the whole prompt, cached_tokens the part served from
+    the provider's prompt cache and cache_write_tokens the part written to
+    it. Totals are kept overall and per cache namespace (the extractor).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = self._empty()
+        self._by_namespace: Dict[str, Dict[str, Any]] = {}
+        self._recent = deque(maxlen=RECENT_CALLS)
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {"calls": 0, **{field: 0 for field in USAGE_FIELDS}, "first_token_seconds": 0.0}
+
+    def record(self, usage: Dict[str, int], seconds: float, first_token_seconds: Optional[float] = None) -> None:
+        """
+        Record one call
+
+        Args:
+            usage: Token counts (see usage_from_openai/usage_from_bedrock); calls without any are skipped
+            seconds: Wall time of the call
+            first_token_seconds: Time to the first streamed chunk (the whole call when not streamed)
+        """
+        if not usage:
+            return
+        first_token = seconds if first_token_seconds is None else first_token_seconds
+        namespace = current_namespace()
+        call = {"namespace": namespace, **{field: usage.get(field, 0) for field in USAGE_FIELDS},
+                "seconds": round(seconds, 3), "first_token_seconds": round(first_token, 3)}
+        with self._lock:
+            for totals in (self._totals, self._by_namespace.setdefault(namespace, self._empty())):
+                totals["calls"] += 1
+                for field in USAGE_FIELDS:
+                    totals[field] += call[field]
+                totals["first_token_seconds"] += first_token
+            self._recent.append(call)
+
+    @staticmethod
+    def _summary(totals: Dict[str, Any]) -> Dict[str, Any]:
+        calls = totals["calls"]
+        return {
+            "calls": calls,
+            **{field: totals[field] for field in USAGE_FIELDS},
+            "cache_hit_rate": round(totals["cached_tokens"] / totals["input_tokens"], 4) if totals["input_tokens"] else 0.0,
+            "avg_first_token_seconds": round(totals["first_token_seconds"] / calls, 3) if calls else 0.0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals, per-namespace totals and the most recent calls"""
+        with self._lock:
+            return {
+                **self._summary(self._totals),
+                "by_namespace": {name: self._summary(totals) for name, totals in self._by_namespace.items()},
+                "recent_calls": list(self._recent)
+            }
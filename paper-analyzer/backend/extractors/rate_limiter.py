@@ -0,0 +1,305 @@
+"""
+LLM Rate Limiter - Process-wide cap on concurrent calls, requests/minute and tokens/minute
+
+Several papers' extractions running together easily exceed a provider's
+RPM/TPM quota, after which the provider throttles every call and the
+clients' RetryPolicy backs off and eventually opens its circuit breaker.
+Every call first takes a ticket from one FIFO queue shared by threads and
+event loops; the head of the queue is admitted once an in-flight slot is
+free and both token buckets can pay for it, so waiting callers are served
+strictly in arrival order.
+
+The limiter wraps the client, so retries happen inside a single admission:
+one ticket (one in-flight slot, one request and its tokens charged) can
+cover several provider requests when attempts are retried.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from parsers.text_normalizer import estimate_tokens
+
+
+class TokenBucket:
+    """Refills at `per_minute` per minute up to one minute's worth; per_minute <= 0 means unlimited"""
+
+    def __init__(self, per_minute: float):
+        self.per_minute = per_minute
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if it is now); amounts over capacity wait for a full bucket"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(missing, 0.0) * 60 / self.per_minute
+
+    def take(self, amount: float, now: float) -> None:
+        if not self.unlimited:
+            self._refill(now)
+            self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float, now: float) -> None:
+        if not self.unlimited:
+            self._refill(now)
+            self.level = min(self.capacity, self.level + amount)
+
+
+class _Ticket:
+    """One queued call; `wake` is how the limiter pokes its owner to re-check"""
+
+    def __init__(self, tokens: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def wake(self) -> None:
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self.event.set)
+            except RuntimeError:  # loop closed; its waiter is gone
+                pass
+        else:
+            self.event.set()
+
+
+class LLMRateLimiter:
+    """
+    Admission control for LLM calls
+    
+    acquire()/acquire_async() block until the call may start and return the
+    tokens charged; release() must follow (the `limit`/`limit_async`
+    context managers do both). Calls are charged their estimated prompt
+    tokens plus max_tokens up front, as provider quotas reserve them; the
+    unused part is refunded on release once the response size is known.
+    """
+
+    def __init__(self, max_in_flight: int = 8, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Args:
+            max_in_flight: Calls running at once (<= 0 means unlimited)
+            requests_per_minute: Request bucket refill rate (<= 0 means unlimited)
+            tokens_per_minute: Estimated-token bucket refill rate (<= 0 means unlimited)
+        """
+        self.max_in_flight = max_in_flight
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._queue: deque = deque()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "waited": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+                       "max_queue_depth": 0, "tokens_charged": 0, "tokens_refunded": 0}
+
+    @staticmethod
+    def estimate(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+        """Tokens a call is charged before it runs"""
+        return estimate_tokens(prompt) + (estimate_tokens(system_prompt) if system_prompt else 0) + max_tokens
+
+    def _try_admit(self, ticket: _Ticket) -> Optional[float]:
+        """Admit the ticket if it heads the queue and fits (returns 0.0); else seconds worth waiting"""
+        if self._queue[0] is not ticket:
+            return float("inf")  # woken when it reaches the head
+        if 0 < self.max_in_flight <= self._in_flight:
+            return float("inf")  # woken by release()
+        now = time.monotonic()
+        delay = max(self.requests.wait_time(1, now), self.tokens.wait_time(ticket.tokens, now))
+        if delay > 0:
+            return delay
+        self.requests.take(1, now)
+        self.tokens.take(ticket.tokens, now)
+        self._in_flight += 1
+        self._queue.popleft()
+        waited = now - ticket.enqueued
+        self._stats["calls"] += 1
+        self._stats["tokens_charged"] += ticket.tokens
+        self._stats["wait_seconds"] += waited
+        self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        if waited > 0.001:
+            self._stats["waited"] += 1
+        if self._queue:
+            self._queue[0].wake()  # the next caller may fit as well
+        return 0.0
+
+    def _enqueue(self, ticket: _Ticket) -> None:
+        with self._lock:
+            self._queue.append(ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        """Drop a ticket whose caller gave up (timeout, cancellation)"""
+        with self._lock:
+            if ticket in self._queue:
+                was_head = self._queue[0] is ticket
+                self._queue.remove(ticket)
+                if was_head and self._queue:
+                    self._queue[0].wake()
+
+    def acquire(self, tokens: int) -> int:
+        """Block the calling thread until the call may start; returns the tokens charged"""
+        ticket = _Ticket(tokens)
+        self._enqueue(ticket)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_admit(ticket)
+                    if delay == 0.0:
+                        return tokens
+                    ticket.event.clear()
+                ticket.event.wait(None if delay == float("inf") else delay)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    async def acquire_async(self, tokens: int) -> int:
+        """Wait on the event loop until the call may start; returns the tokens charged"""
+        ticket = _Ticket(tokens, asyncio.get_running_loop())
+        self._enqueue(ticket)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_admit(ticket)
+                    if delay == 0.0:
+                        return tokens
+                    ticket.event.clear()
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), None if delay == float("inf") else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    def release(self, charged: int, used: Optional[int] = None) -> None:
+        """
+        Free the call's slot
+        
+        Args:
+            charged: Tokens returned by acquire
+            used: Estimated tokens the call actually used (None keeps the full charge)
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if used is not None and used < charged:
+                self.tokens.give_back(charged - used, time.monotonic())
+                self._stats["tokens_refunded"] += charged - used
+            if self._queue:
+                self._queue[0].wake()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait times and bucket levels"""
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            calls = stats["calls"]
+            return {
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": stats["max_queue_depth"],
+                "calls": calls,
+                "calls_waited": stats["waited"],
+                "avg_wait_seconds": round(stats["wait_seconds"] / calls, 4) if calls else 0.0,
+                "max_wait_seconds": round(stats["max_wait_seconds"], 4),
+                "requests_per_minute": self.requests.per_minute,
+                "requests_available": None if self.requests.unlimited else round(self._level(self.requests, now), 2),
+                "tokens_per_minute": self.tokens.per_minute,
+                "tokens_available": None if self.tokens.unlimited else round(self._level(self.tokens, now)),
+                "tokens_charged": stats["tokens_charged"],
+                "tokens_refunded": stats["tokens_refunded"]
+            }
+
+    @staticmethod
+    def _level(bucket: TokenBucket, now: float) -> float:
+        bucket._refill(now)
+        return bucket.level
+
+
+class RateLimitedLLMClient:
+    """
+    LLM client wrapper that passes every call through an LLMRateLimiter
+    
+    complete/complete_async/complete_streaming/stream_async are limited;
+    the JSON variants reuse them, so each model call is admitted exactly
+    once. Everything else (mock_mode, stats, aclose, ...) is the wrapped
+    client's.
+    """
+
+    def __init__(self, client: Any, limiter: LLMRateLimiter):
+        self.client = client
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "complete_streaming":
+            # Only clients that stream get a (limited) complete_streaming
+            getattr(self.client, name)
+            return self._complete_streaming
+        return getattr(self.client, name)
+
+    def complete(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        charged = self.limiter.acquire(self.limiter.estimate(prompt, system_prompt, max_tokens))
+        used = None
+        try:
+            text = self.client.complete(prompt, system_prompt, max_tokens=max_tokens)
+            used = charged - max_tokens + estimate_tokens(text)
+            return text
+        finally:
+            self.limiter.release(charged, used)
+
+    async def complete_async(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        charged = await self.limiter.acquire_async(self.limiter.estimate(prompt, system_prompt, max_tokens))
+        used = None
+        try:
+            text = await self.client.complete_async(prompt, system_prompt, max_tokens=max_tokens)
+            used = charged - max_tokens + estimate_tokens(text)
+            return text
+        finally:
+            self.limiter.release(charged, used)
+
+    def complete_json(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> Dict[str, Any]:
+        prompt, system_prompt = self.client._json_prompts(prompt, system_prompt)
+        return self.client._parse_json(self.complete(prompt, system_prompt, max_tokens=max_tokens))
+
+    async def complete_json_async(self, prompt: str, system_prompt: Optional[str] = None,
+                                  max_tokens: int = 4096) -> Dict[str, Any]:
+        prompt, system_prompt = self.client._json_prompts(prompt, system_prompt)
+        return self.client._parse_json(await self.complete_async(prompt, system_prompt, max_tokens=max_tokens))
+
+    def _complete_streaming(self, prompt: str, system_prompt: Optional[str] = None,
+                            max_tokens: int = 16384) -> Iterator[str]:
+        charged = self.limiter.acquire(self.limiter.estimate(prompt, system_prompt, max_tokens))
+        generated = 0
+        finished = False
+        try:
+            for chunk in self.client.complete_streaming(prompt, system_prompt, max_tokens=max_tokens):
+                generated += estimate_tokens(chunk)
+                yield chunk
+            finished = True
+        finally:
+            self.limiter.release(charged, charged - max_tokens + generated if finished else None)
+
+    async def stream_async(self, prompt: str, system_prompt: Optional[str] = None,
+                           max_tokens: int = 16384) -> AsyncIterator[str]:
+        charged = await self.limiter.acquire_async(self.limiter.estimate(prompt, system_prompt, max_tokens))
+        generated = 0
+        finished = False
+        try:
+            async for chunk in self.client.stream_async(prompt, system_prompt, max_tokens=max_tokens):
+                generated += estimate_tokens(chunk)
+                yield chunk
+            finished = True
+        finally:
+            self.limiter.release(charged, charged - max_tokens + generated if finished else None)
@@ -4,7 +4,9 @@ Related Work Extractor - Extract related work citations from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
+from parsers.references import Reference
 
 
 @dataclass
@@ -21,10 +23,10 @@ class RelatedWork:
         return asdict(self)
 
 
-class RelatedWorkExtractor:
+class RelatedWorkExtractor(LLMExtractor):
     """Extract related work from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting related work from research papers.
+    ROLE_PROMPT = """You are an expert at extracting related work from research papers.
 Extract key related papers accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract key related work from this paper's related work section.
@@ -51,28 +53,30 @@ Return in JSON format:
   ]
 }}
 
-Output ONLY the JSON. No explanations.
+Use the reference list for exact titles and years where it has them.
 
-Paper Title: {title}
+Output ONLY the JSON. No explanations.
 
-Paper Content:
-{content}
+Reference List:
+{references}
 """
     
+    # Character cap for the reference list in the prompt
+    REFERENCES_MAX_CHARS = 8000
+    
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[RelatedWork]:
-        """Extract related work from a parsed paper"""
+    def _build_prompt(self, paper: ParsedPaper) -> str:
         prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
+            references=self._format_references(paper.references)
         )
         
         print(f"📚 Extracting related work from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[RelatedWork]:
         related_works = []
         if isinstance(response, dict):
             items = response.get("related_work", [])
@@ -98,5 +102,21 @@ Paper Content:
         
         print(f"✅ Found {len(related_works)} related works")
         return related_works
+    
+    def _format_references(self, references: List[Reference]) -> str:
+        """One line per parsed bibliography entry, capped at REFERENCES_MAX_CHARS"""
+        if not references:
+            return "(not detected - see the paper content)"
+        lines = []
+        used = 0
+        for ref in references:
+            label = ref.label or str(ref.number)
+            line = f"[{label}] {ref.title or ref.raw[:200]}" + (f" ({ref.year})" if ref.year else "")
+            used += len(line) + 1
+            if used > self.REFERENCES_MAX_CHARS:
+                lines.append(f"... {len(references) - len(lines)} more")
+                break
+            lines.append(line)
+        return "\n".join(lines)
 
 
@@ -0,0 +1,276 @@
+"""
+LLM Response Cache - Persistent cache of completions below complete/complete_json
+
+Re-extracting a paper after a redeploy, or re-running the same
+visualization query, would otherwise pay for identical LLM calls again.
+Responses live in SQLite (WAL mode, so readers never wait on the writer
+and several processes can share the file), keyed on everything that
+determines the reply: provider, model, temperature, max_tokens, system
+prompt and prompt. The file is kept under a size bound by evicting the
+least recently used entries; entries can also expire (TTL) and be dropped
+per namespace (by default the extractor that made the call).
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from parsers.text_normalizer import estimate_tokens
+
+DEFAULT_NAMESPACE = "default"
+
+# Namespace of the calls made in the current thread/task (see cache_namespace)
+_namespace: contextvars.ContextVar = contextvars.ContextVar("llm_cache_namespace", default=DEFAULT_NAMESPACE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_namespace ON responses (namespace);
+"""
+
+
+@contextmanager
+def cache_namespace(name: str) -> Iterator[None]:
+    """Tag the LLM calls made inside the block (thread- and task-local)"""
+    token = _namespace.set(name)
+    try:
+        yield
+    finally:
+        _namespace.reset(token)
+
+
+def current_namespace() -> str:
+    """Namespace of the calls made in the current thread/task"""
+    return _namespace.get()
+
+
+def cache_key(provider: str, model: str, temperature: float, max_tokens: int,
+              system_prompt: Optional[str], prompt: str) -> str:
+    """SHA-256 over everything that determines a completion"""
+    material = json.dumps([provider, model, temperature, max_tokens, system_prompt or "", prompt])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed completion cache with LRU eviction and optional TTL"""
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 256 << 20, ttl_seconds: float = 0):
+        """
+        Args:
+            path: SQLite database file
+            max_bytes: Total response bytes kept before least recently used entries are evicted
+            ttl_seconds: Entry lifetime (<= 0 means entries never expire)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; only the last commits can be lost
+        self._conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response (refreshing its LRU position), or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, tokens, created FROM responses WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is not None and self.ttl_seconds > 0 and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            self.tokens_saved += row[1]
+            return row[0]
+
+    def put(self, key: str, response: str, tokens: int, namespace: Optional[str] = None) -> None:
+        """
+        Store a response, then evict least recently used entries over max_bytes
+
+        Args:
+            key: cache_key() of the call
+            response: Completion text
+            tokens: Estimated prompt + completion tokens a hit saves
+            namespace: Invalidation group (the current cache_namespace() if None)
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, namespace, response, size, tokens, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, namespace or _namespace.get(), response, size, tokens, now, now))
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the total size fits (caller holds the lock)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """Drop one namespace's entries (all entries if None); returns the number dropped"""
+        with self._lock:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM responses")
+            else:
+                cursor = self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, tokens saved and size since the cache was opened"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            namespaces = dict(self._conn.execute(
+                "SELECT namespace, COUNT(*) FROM responses GROUP BY namespace").fetchall())
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "namespaces": namespaces
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _is_complete_json(client: Any, text: str) -> bool:
+    """
+    Whether a JSON reply parses as it is (code fences aside)
+    
+    Replies that only parse after _parse_json's recovery, a truncated one
+    repaired by parse_partial_json included, are not complete.
+    """
+    try:
+        json.loads(client._clean_json_response(text))
+    except ValueError:
+        return False
+    return True
+
+
+class CachedLLMClient:
+    """
+    LLM client wrapper answering repeated complete/complete_json calls from an LLMResponseCache
+    
+    Streaming calls, and every call while the client is in mock mode, go
+    straight through. JSON replies are only stored when they parse as they
+    are: a failed parse or a truncated reply (max_tokens hit) repaired into
+    partial results gets a fresh answer on the next call. The async calls do their SQLite reads
+    and writes (and any eviction) in a worker thread, keeping the event
+    loop free. Everything else is the wrapped client's.
+    """
+
+    def __init__(self, client: Any, cache: LLMResponseCache):
+        self.client = client
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _key(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> Optional[str]:
+        """Cache key of a call, or None when it must not be cached"""
+        if getattr(self.client, "mock_mode", False):
+            return None
+        return cache_key(self.client.provider, self.client.model, self.client.temperature,
+                         max_tokens, system_prompt, prompt)
+
+    def _store(self, key: str, prompt: str, system_prompt: Optional[str], text: str) -> None:
+        # Checked again: clients that connect lazily only find out they are in mock mode during the call
+        if getattr(self.client, "mock_mode", False):
+            return
+        tokens = estimate_tokens(prompt) + estimate_tokens(system_prompt or "") + estimate_tokens(text)
+        try:
+            self.cache.put(key, text, tokens)
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache write failed: {e}")
+
+    def complete(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        key = self._key(prompt, system_prompt, max_tokens)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        text = self.client.complete(prompt, system_prompt, max_tokens=max_tokens)
+        if key:
+            self._store(key, prompt, system_prompt, text)
+        return text
+
+    async def complete_async(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        key = self._key(prompt, system_prompt, max_tokens)
+        cached = await asyncio.to_thread(self.cache.get, key) if key else None
+        if cached is not None:
+            return cached
+        text = await self.client.complete_async(prompt, system_prompt, max_tokens=max_tokens)
+        if key:
+            await asyncio.to_thread(self._store, key, prompt, system_prompt, text)
+        return text
+
+    def complete_json(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> Dict[str, Any]:
+        prompt, system_prompt = self.client._json_prompts(prompt, system_prompt)
+        key = self._key(prompt, system_prompt, max_tokens)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return self.client._parse_json(cached)
+        text = self.client.complete(prompt, system_prompt, max_tokens=max_tokens)
+        parsed = self.client._parse_json(text)
+        if key and _is_complete_json(self.client, text):
+            self._store(key, prompt, system_prompt, text)
+        return parsed
+
+    async def complete_json_async(self, prompt: str, system_prompt: Optional[str] = None,
+                                  max_tokens: int = 4096) -> Dict[str, Any]:
+        prompt, system_prompt = self.client._json_prompts(prompt, system_prompt)
+        key = self._key(prompt, system_prompt, max_tokens)
+        cached = await asyncio.to_thread(self.cache.get, key) if key else None
+        if cached is not None:
+            return self.client._parse_json(cached)
+        text = await self.client.complete_async(prompt, system_prompt, max_tokens=max_tokens)
+        parsed = self.client._parse_json(text)
+        if key and _is_complete_json(self.client, text):
+            # to_thread copies the context, so the entry keeps the caller's namespace
+            await asyncio.to_thread(self._store, key, prompt, system_prompt, text)
+        return parsed
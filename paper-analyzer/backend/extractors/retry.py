@@ -0,0 +1,342 @@
+"""
+LLM Retry - Classified retries with backoff and a circuit breaker for provider calls
+
+Throttling, timeouts, dropped connections and 5xx errors are transient:
+the call is retried with exponential backoff and full jitter (honouring
+Retry-After). Auth, validation and not-found errors fail at once, since
+retrying cannot fix them. Transient failures that outlast the retries
+open a circuit breaker; while it is open, calls fail fast. After a
+cool-down one trial call is let through (half-open), and the circuit
+closes again as soon as the provider answers.
+"""
+import asyncio
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+# HTTP statuses worth retrying (plus any other 5xx)
+RETRYABLE_STATUSES = {408, 409, 425, 429}
+
+# Bedrock/AWS error codes worth retrying
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException",
+    "InternalServerException", "ModelNotReadyException", "ModelTimeoutException",
+    "RequestTimeout", "RequestTimeoutException", "ServiceQuotaExceededException",
+    "ModelStreamErrorException"
+}
+
+BREAKER_STATES = ("closed", "open", "half_open")
+
+
+class LLMError(Exception):
+    """Provider error with the details needed to classify it"""
+
+    def __init__(self, message: str, status: Optional[int] = None, code: Optional[str] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """The provider has been failing; the call was not attempted"""
+
+
+def _status_retryable(status: Optional[int]) -> bool:
+    return status is not None and (status in RETRYABLE_STATUSES or status >= 500)
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Seconds from a Retry-After header (the HTTP-date form is ignored)"""
+    try:
+        return float(headers.get("Retry-After") or headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def classify(exc: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Whether an exception from a provider call is transient
+
+    Returns:
+        (retryable, retry_after seconds or None)
+    """
+    if isinstance(exc, LLMError):
+        return (exc.code in RETRYABLE_ERROR_CODES or _status_retryable(exc.status)), exc.retry_after
+    if isinstance(exc, httpx.HTTPStatusError):
+        return _status_retryable(exc.response.status_code), retry_after_seconds(exc.response.headers)
+    if isinstance(exc, httpx.TransportError):
+        return True, None
+    # requests and botocore are imported by the clients that use them, so only
+    # a loaded library can have raised its errors (and startup skips importing them)
+    requests = sys.modules.get("requests")
+    if requests is not None:
+        if isinstance(exc, requests.HTTPError):
+            response = exc.response
+            if response is None:
+                return False, None
+            return _status_retryable(response.status_code), retry_after_seconds(response.headers)
+        if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+            return True, None
+    boto_errors = sys.modules.get("botocore.exceptions")
+    if boto_errors is None:
+        return False, None
+    if isinstance(exc, boto_errors.ClientError):
+        code = exc.response.get("Error", {}).get("Code") or ""
+        metadata = exc.response.get("ResponseMetadata", {})
+        # Response-stream exception events use lowerCamelCase codes (throttlingException)
+        retryable = code[:1].upper() + code[1:] in RETRYABLE_ERROR_CODES or _status_retryable(metadata.get("HTTPStatusCode"))
+        return retryable, retry_after_seconds(metadata.get("HTTPHeaders", {}))
+    if isinstance(exc, (boto_errors.ConnectionError, boto_errors.HTTPClientError)):
+        return True, None
+    return False, None
+
+
+class CircuitBreaker:
+    """closed -> open after failure_threshold transient failures in a row -> half_open after reset_timeout"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failed calls that open the circuit (<= 0 disables it)
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (in half_open, only one trial at a time)"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                print("✅ LLM provider recovered, circuit closed")
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_running = False
+            tripped = 0 < self.failure_threshold <= self.consecutive_failures
+            if self.state == "half_open" or (self.state == "closed" and tripped):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+                print(f"⚠️  LLM circuit open for {self.reset_timeout:g}s after "
+                      f"{self.consecutive_failures} failed calls")
+
+    def record_neutral(self) -> None:
+        """A call that failed for reasons unrelated to provider health (auth, bad request)"""
+        with self._lock:
+            self._trial_running = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through"""
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+
+
+class RetryPolicy:
+    """
+    Runs provider calls with classified retries behind a circuit breaker
+
+    call()/call_async() retry a whole request; iterate()/iterate_async()
+    retry a streaming request only until its first chunk arrives, since
+    chunks already handed to the caller cannot be taken back.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            max_attempts: Attempts per call, the first one included
+            base_delay: Backoff cap before the first retry, doubled per retry
+            max_delay: Upper bound of any single backoff
+            breaker: Circuit breaker (a default one if None)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "attempts": 0, "retries": 0, "succeeded": 0, "failed_transient": 0,
+                       "failed_permanent": 0, "rejected_open": 0, "backoff_seconds": 0.0}
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential delay before retry number `retry` (1-based)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _admit(self) -> None:
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected_open")
+            raise CircuitOpenError(f"LLM provider unavailable, retrying in {self.breaker.retry_in():.1f}s")
+
+    def _failed(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Record a failed attempt; returns the delay before retrying, or None to give up"""
+        retryable, retry_after = classify(exc)
+        if not retryable:
+            self.breaker.record_neutral()
+            self._count("failed_permanent")
+            return None
+        if attempt >= self.max_attempts:
+            self.breaker.record_failure()
+            self._count("failed_transient")
+            return None
+        delay = self.backoff(attempt, retry_after)
+        self._count("retries")
+        self._count("backoff_seconds", delay)
+        print(f"⚠️  LLM call failed ({type(exc).__name__}: {exc}), retry {attempt}/{self.max_attempts - 1} "
+              f"in {delay:.1f}s")
+        return delay
+
+    def _succeeded(self) -> None:
+        self.breaker.record_success()
+        self._count("succeeded")
+
+    @contextmanager
+    def _abandon_releases_trial(self) -> Iterator[None]:
+        """
+        Free the breaker's half-open trial slot when a call is abandoned
+
+        Cancellation (asyncio.CancelledError), a closed stream (GeneratorExit)
+        or KeyboardInterrupt says nothing about the provider's health, but
+        without an outcome the trial would be marked running forever.
+        """
+        try:
+            yield
+        except Exception:
+            raise  # outcome already recorded by _failed()
+        except BaseException:
+            self.breaker.record_neutral()
+            raise
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run fn() with retries"""
+        self._admit()
+        with self._abandon_releases_trial():
+            for attempt in range(1, self.max_attempts + 1):
+                self._count("attempts")
+                try:
+                    result = fn()
+                except Exception as e:
+                    delay = self._failed(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                self._succeeded()
+                return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() with retries, sleeping on the event loop"""
+        self._admit()
+        with self._abandon_releases_trial():
+            for attempt in range(1, self.max_attempts + 1):
+                self._count("attempts")
+                try:
+                    result = await fn()
+                except Exception as e:
+                    delay = self._failed(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    continue
+                self._succeeded()
+                return result
+
+    def iterate(self, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """Yield from fn(), retrying until the first item arrives"""
+        self._admit()
+        with self._abandon_releases_trial():
+            for attempt in range(1, self.max_attempts + 1):
+                self._count("attempts")
+                started = False
+                try:
+                    for item in fn():
+                        if not started:
+                            started = True
+                            self._succeeded()
+                        yield item
+                except Exception as e:
+                    if started:
+                        raise
+                    delay = self._failed(e, attempt)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                    continue
+                if not started:
+                    self._succeeded()
+                return
+
+    async def iterate_async(self, fn: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Async iterate(): yield from fn(), retrying until the first item arrives"""
+        self._admit()
+        with self._abandon_releases_trial():
+            for attempt in range(1, self.max_attempts + 1):
+                self._count("attempts")
+                started = False
+                try:
+                    async for item in fn():
+                        if not started:
+                            started = True
+                            self._succeeded()
+                        yield item
+                except Exception as e:
+                    if started:
+                        raise
+                    delay = self._failed(e, attempt)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    continue
+                if not started:
+                    self._succeeded()
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """Attempts, outcomes and breaker state since the policy was created"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["backoff_seconds"] = round(stats["backoff_seconds"], 3)
+        stats.update({
+            "breaker_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "times_opened": self.breaker.times_opened,
+            "retry_in_seconds": round(self.breaker.retry_in(), 1)
+        })
+        return stats
@@ -4,6 +4,7 @@ Training Procedures Extractor - Extract training procedures from papers
 from typing import List, Dict, Any
 from dataclasses import dataclass, asdict
 from .llm_client import get_llm_client
+from .base import LLMExtractor
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -20,10 +21,10 @@ class TrainingProcedure:
         return asdict(self)
 
 
-class TrainingExtractor:
+class TrainingExtractor(LLMExtractor):
     """Extract training procedures from research papers"""
     
-    SYSTEM_PROMPT = """You are an expert at extracting training procedures from research papers.
+    ROLE_PROMPT = """You are an expert at extracting training procedures from research papers.
 Extract all training details accurately. Always output valid JSON only."""
     
     USER_PROMPT_TEMPLATE = """Extract training procedures from this paper.
@@ -49,27 +50,19 @@ Return in JSON format:
 }}
 
 Output ONLY the JSON. No explanations.
-
-Paper Title: {title}
-
-Paper Content:
-{content}
 """
     
     def __init__(self):
         """Initialize with LLM client"""
         self.llm = get_llm_client()
     
-    def extract(self, paper: ParsedPaper) -> List[TrainingProcedure]:
-        """Extract training procedures from a parsed paper"""
-        prompt = self.USER_PROMPT_TEMPLATE.format(
-            title=paper.title,
-            content=paper.full_text[:25000]
-        )
+    def _build_prompt(self, paper: ParsedPaper) -> str:
+        prompt = self.USER_PROMPT_TEMPLATE.format()
         
         print(f"🏋️  Extracting training procedures from: {paper.title[:60]}...")
-        response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
-        
+        return prompt
+    
+    def _parse_response(self, response: Any) -> List[TrainingProcedure]:
         procedures = []
         if isinstance(response, dict):
             items = response.get("training_procedures", [])
@@ -0,0 +1,7 @@
+"""
+Ingest package initialization
+"""
+from .paper_index import PaperIndex
+from .bulk_ingest import BulkIngester, IngestResult, write_paper_metadata
+
+__all__ = ['PaperIndex', 'BulkIngester', 'IngestResult', 'write_paper_metadata']
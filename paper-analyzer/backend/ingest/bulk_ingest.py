@@ -0,0 +1,171 @@
+"""
+Bulk Ingest - Hash, deduplicate, parse and save many PDFs at once
+"""
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Union
+
+from parsers import PaperParser, ParsedPaper, ParsedPaperCache, hash_file
+from .paper_index import PaperIndex
+
+
+@dataclass
+class IngestResult:
+    """Outcome of ingesting one PDF"""
+    source: str
+    status: str  # "ingested", "duplicate" or "failed"
+    paper_id: Optional[str] = None
+    title: str = ""
+    num_pages: int = 0
+    error: str = ""
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def write_paper_metadata(extracted_dir: Union[str, Path], paper: ParsedPaper) -> None:
+    """Save parsed paper metadata to {paper_id}_paper.json (atomic, so readers never see a partial file)"""
+    paper_file = Path(extracted_dir) / f"{paper.paper_id}_paper.json"
+    tmp_path = paper_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "paper_id": paper.paper_id,
+            "title": paper.title,
+            "authors": paper.authors,
+            "abstract": paper.abstract,
+            "num_pages": paper.num_pages,
+            "metadata": paper.metadata
+        }, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, paper_file)
+
+
+# One parser per worker process, created on first use
+_worker_parser: Optional[PaperParser] = None
+
+
+def _ingest_worker(source: str, paper_id: str, content_hash: str, upload_dir: str,
+                   extracted_dir: str, cache_dir: str) -> Dict[str, Any]:
+    """Copy, parse and save one PDF - runs inside a worker process"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = PaperParser(cache=ParsedPaperCache(cache_dir))
+
+    start = time.perf_counter()
+    dest = Path(upload_dir) / f"{paper_id}.pdf"
+    shutil.copyfile(source, dest)
+    try:
+        paper = _worker_parser.parse_pdf(str(dest), paper_id, content_hash)
+        write_paper_metadata(extracted_dir, paper)
+    except Exception:
+        dest.unlink(missing_ok=True)
+        raise
+
+    return {
+        "title": paper.title,
+        "num_pages": paper.num_pages,
+        "seconds": time.perf_counter() - start
+    }
+
+
+class BulkIngester:
+    """Ingest many PDFs through a bounded process pool"""
+
+    def __init__(self, upload_dir: Union[str, Path], extracted_dir: Union[str, Path],
+                 cache_dir: Union[str, Path], index: PaperIndex, workers: int = 4):
+        """
+        Args:
+            upload_dir: Where ingested PDFs are stored as {paper_id}.pdf
+            extracted_dir: Where {paper_id}_paper.json metadata is written
+            cache_dir: Parsed-paper cache shared with the API
+            index: Content-hash index; files already in it are skipped
+            workers: Maximum PDFs parsed concurrently
+        """
+        self.upload_dir = Path(upload_dir)
+        self.extracted_dir = Path(extracted_dir)
+        self.cache_dir = Path(cache_dir)
+        self.index = index
+        self.workers = max(1, workers)
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.extracted_dir.mkdir(parents=True, exist_ok=True)
+
+    def ingest(self, pdf_paths: List[Union[str, Path]],
+               on_progress: Optional[Callable[[int, int, IngestResult], None]] = None) -> Dict[str, Any]:
+        """
+        Ingest PDFs, skipping any whose content is already indexed
+
+        The index is only updated after a paper is fully saved, so re-running
+        after a crash resumes where the previous run stopped.
+
+        Args:
+            pdf_paths: PDF files to ingest
+            on_progress: Called as (done, total, result) after each file
+
+        Returns:
+            Summary with per-file results and throughput
+        """
+        start = time.perf_counter()
+        total = len(pdf_paths)
+        results: List[IngestResult] = []
+
+        def record(result: IngestResult) -> None:
+            results.append(result)
+            if on_progress:
+                on_progress(len(results), total, result)
+
+        # 1. Hash and deduplicate (against the index and within this batch)
+        pending: Dict[str, tuple] = {}  # content hash -> (source, paper_id)
+        for path in pdf_paths:
+            source = str(path)
+            try:
+                content_hash = hash_file(path)
+            except OSError as e:
+                record(IngestResult(source=source, status="failed", error=str(e)))
+                continue
+
+            existing_id = self.index.get(content_hash)
+            if existing_id is None and content_hash in pending:
+                existing_id = pending[content_hash][1]
+            if existing_id is not None:
+                record(IngestResult(source=source, status="duplicate", paper_id=existing_id))
+                continue
+
+            pending[content_hash] = (source, str(uuid.uuid4()))
+
+        # 2. Parse and save unique files in parallel
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = {
+                    pool.submit(_ingest_worker, source, paper_id, content_hash, str(self.upload_dir),
+                                str(self.extracted_dir), str(self.cache_dir)): content_hash
+                    for content_hash, (source, paper_id) in pending.items()
+                }
+                for future in as_completed(futures):
+                    content_hash = futures[future]
+                    source, paper_id = pending[content_hash]
+                    try:
+                        info = future.result()
+                    except Exception as e:
+                        record(IngestResult(source=source, status="failed", error=str(e)))
+                        continue
+                    self.index.add(content_hash, paper_id, source=Path(source).name)
+                    record(IngestResult(source=source, status="ingested", paper_id=paper_id, **info))
+
+        elapsed = time.perf_counter() - start
+        ingested = sum(1 for r in results if r.status == "ingested")
+        return {
+            "total": total,
+            "ingested": ingested,
+            "duplicates": sum(1 for r in results if r.status == "duplicate"),
+            "failed": sum(1 for r in results if r.status == "failed"),
+            "seconds": round(elapsed, 2),
+            "papers_per_minute": round(ingested / elapsed * 60, 1) if elapsed > 0 else 0.0,
+            "results": [r.to_dict() for r in results]
+        }
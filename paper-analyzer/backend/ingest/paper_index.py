@@ -0,0 +1,56 @@
+"""
+Paper Index - Persistent map from PDF content hash to paper_id
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+
+class PaperIndex:
+    """SHA-256 -> paper_id index used to skip PDFs that are already ingested"""
+
+    def __init__(self, index_path: Union[str, Path]):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Return the paper_id for a content hash, or None if not ingested"""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is None:
+                # Another worker/process may have ingested it since we loaded
+                self._entries.update(self._load())
+                entry = self._entries.get(content_hash)
+        return entry["paper_id"] if entry else None
+
+    def add(self, content_hash: str, paper_id: str, source: str = "") -> None:
+        """Record a successfully ingested paper (merge with disk, atomic write)"""
+        with self._lock:
+            entries = self._load()
+            entries.update(self._entries)
+            entries[content_hash] = {
+                "paper_id": paper_id,
+                "source": source,
+                "ingested_at": datetime.now().isoformat()
+            }
+            tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._entries = entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
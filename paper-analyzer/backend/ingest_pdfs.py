@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Bulk-ingest a directory of PDFs into the analyzer's data directories
+
+Files whose content is already ingested are skipped, so an interrupted run
+can simply be started again.
+
+Usage:
+    python ingest_pdfs.py ../../pdfs [--workers 4]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from ingest import BulkIngester, PaperIndex, IngestResult
+
+STATUS_ICONS = {"ingested": "✅", "duplicate": "♻️ ", "failed": "❌"}
+
+
+def print_progress(done: int, total: int, result: IngestResult) -> None:
+    icon = STATUS_ICONS.get(result.status, "•")
+    detail = result.error if result.status == "failed" else (result.title or result.paper_id)
+    print(f"[{done:>{len(str(total))}}/{total}] {icon} {Path(result.source).name[:50]:<50} {detail[:60]}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("directory", type=Path, help="directory containing PDFs")
+    arg_parser.add_argument("--workers", type=int, default=settings.ingest_workers)
+    arg_parser.add_argument("--recursive", action="store_true", help="also search subdirectories")
+    args = arg_parser.parse_args()
+
+    pattern = "**/*.pdf" if args.recursive else "*.pdf"
+    pdfs = sorted(args.directory.glob(pattern))
+    if not pdfs:
+        print(f"❌ No PDFs found in {args.directory}")
+        return 1
+
+    ingester = BulkIngester(
+        upload_dir=settings.upload_dir,
+        extracted_dir=settings.extracted_dir,
+        cache_dir=settings.parse_cache_dir,
+        index=PaperIndex(Path(settings.extracted_dir) / "paper_index.json"),
+        workers=args.workers
+    )
+
+    print(f"📥 Ingesting {len(pdfs)} PDFs from {args.directory} with {args.workers} workers")
+    summary = ingester.ingest(pdfs, on_progress=print_progress)
+
+    print("\n" + "=" * 80)
+    print(f"  Ingested:   {summary['ingested']}")
+    print(f"  Duplicates: {summary['duplicates']}")
+    print(f"  Failed:     {summary['failed']}")
+    print(f"  Time:       {summary['seconds']}s ({summary['papers_per_minute']} papers/minute)")
+    print("=" * 80)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
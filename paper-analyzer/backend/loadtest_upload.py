@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Load test: GET /api/papers latency while PDF uploads are in flight
+
+Runs the app in-process (one event loop, like a single uvicorn worker),
+keeps N uploads of the largest corpus PDFs going and polls GET /api/papers
+the whole time, then reports p50/p95/p99 latency of the polls.
+
+Usage:
+    python loadtest_upload.py [--uploads 12] [--concurrency 3]
+    python loadtest_upload.py --inline   # old behaviour: parse on the event loop
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_PDF_DIR = Path(__file__).resolve().parents[2] / "pdfs"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args):
+    import httpx
+    import api.app as app_module
+
+    if args.inline:
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+        app_module.run_in_parse_executor = run_inline
+
+    pdfs = sorted(args.pdf_dir.glob("*.pdf"), key=lambda p: p.stat().st_size, reverse=True)[:args.largest]
+    payloads = [p.read_bytes() for p in pdfs]
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=600) as client:
+        uploads_done = asyncio.Event()
+        latencies = []
+
+        async def poll():
+            while not uploads_done.is_set():
+                start = time.perf_counter()
+                response = await client.get("/api/papers")
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200
+                await asyncio.sleep(args.poll_interval)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def upload(i):
+            # Unique trailing bytes so deduplication does not short-circuit the parse
+            data = payloads[i % len(payloads)] + f"\n% loadtest {i} {time.time()}\n".encode()
+            async with semaphore:
+                response = await client.post(
+                    "/api/papers", files={"file": (f"load_{i}.pdf", data, "application/pdf")})
+                assert response.status_code == 200, response.text
+
+        poller = asyncio.create_task(poll())
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(i) for i in range(args.uploads)))
+        elapsed = time.perf_counter() - start
+        uploads_done.set()
+        await poller
+
+    mode = "inline (event loop)" if args.inline else f"parse pool ({app_module.settings.parse_executor_workers} threads)"
+    print("=" * 80)
+    print(f"  GET /api/papers DURING {args.uploads} UPLOADS - {mode}")
+    print("=" * 80)
+    print(f"  uploads:  {elapsed:.2f}s total")
+    print(f"  polls:    {len(latencies)}")
+    print(f"  p50:      {statistics.median(latencies):8.1f} ms")
+    print(f"  p95:      {percentile(latencies, 95):8.1f} ms")
+    print(f"  p99:      {percentile(latencies, 99):8.1f} ms")
+    print(f"  max:      {max(latencies):8.1f} ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--pdf-dir", type=Path, default=DEFAULT_PDF_DIR)
+    arg_parser.add_argument("--uploads", type=int, default=12)
+    arg_parser.add_argument("--concurrency", type=int, default=3)
+    arg_parser.add_argument("--largest", type=int, default=4, help="use the N largest PDFs")
+    arg_parser.add_argument("--poll-interval", type=float, default=0.01)
+    arg_parser.add_argument("--inline", action="store_true", help="parse on the event loop (baseline)")
+    args = arg_parser.parse_args()
+
+    # Throwaway data directories so the real ones are untouched
+    data_dir = tempfile.mkdtemp(prefix="loadtest_")
+    os.environ["UPLOAD_DIR"] = f"{data_dir}/uploads"
+    os.environ["EXTRACTED_DIR"] = f"{data_dir}/extracted"
+    os.environ["PARSE_CACHE_DIR"] = f"{data_dir}/cache"
+    sys.path.insert(0, str(Path(__file__).parent))
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
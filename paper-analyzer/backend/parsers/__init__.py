@@ -1,8 +1,14 @@
 """
 Parser package initialization
 """
-from .pdf_parser import PaperParser, ParsedPaper, Section
+from .pdf_parser import PaperParser, ParsedPaper, ParseEvent, Section
+from .paper_cache import ParsedPaperCache, hash_file, copy_and_hash
+from .disk_text import DiskText
+from .references import Reference
+from .tables import Table, format_tables
+from .sandbox import ParseSandbox, ParseOutcome, ParseFailure
 
-__all__ = ['PaperParser', 'ParsedPaper', 'Section']
+__all__ = ['PaperParser', 'ParsedPaper', 'ParseEvent', 'Section', 'ParsedPaperCache', 'hash_file',
+           'copy_and_hash', 'DiskText', 'Reference', 'Table', 'format_tables', 'ParseSandbox', 'ParseOutcome', 'ParseFailure']
 
 
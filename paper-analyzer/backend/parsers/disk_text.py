@@ -0,0 +1,144 @@
+"""
+Disk Text - Memory-mapped, lazily decoded stand-in for a large full_text str
+
+The text is stored once as UTF-8 next to a small index of byte offsets taken
+every CHECKPOINT_CHARS characters, so a slice like text[:25000] decodes only
+the bytes it covers instead of loading the whole document.
+"""
+import mmap
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Optional, Union
+
+# Characters between byte-offset checkpoints in the .idx file
+CHECKPOINT_CHARS = 4096
+
+
+class DiskText:
+    """Read-only, sliceable view of UTF-8 text in a file"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Text file written by DiskTextWriter (its .idx file sits alongside)
+        """
+        self.path = Path(path)
+        index = array('Q')
+        with open(self.path.with_suffix('.idx'), 'rb') as f:
+            index.frombytes(f.read())
+        # index[0] is the length in characters, the rest are checkpoint byte offsets
+        self._length = index[0]
+        self._checkpoints = index[1:]
+        self._mmap: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if isinstance(key, int):
+            if key < 0:
+                key += self._length
+            if not 0 <= key < self._length:
+                raise IndexError("DiskText index out of range")
+            return self._decode(key, key + 1)
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            return str(self)[key]
+        if start >= stop:
+            return ""
+        return self._decode(start, stop)
+
+    def __str__(self) -> str:
+        return self._decode(0, self._length)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DiskText):
+            other = str(other)
+        return isinstance(other, str) and len(other) == self._length and str(self) == other
+
+    def __repr__(self) -> str:
+        return f"DiskText({str(self.path)!r}, {self._length} chars)"
+
+    def __reduce__(self):
+        # The mmap cannot be pickled; reopen from the path instead
+        return (DiskText, (str(self.path),))
+
+    def _decode(self, start: int, stop: int) -> str:
+        """Decode characters [start, stop) starting from the nearest checkpoint"""
+        data = self._map()
+        first = start // CHECKPOINT_CHARS
+        last = -(-stop // CHECKPOINT_CHARS)  # ceil
+        byte_start = self._checkpoints[first]
+        byte_end = self._checkpoints[last] if last < len(self._checkpoints) else len(data)
+        text = data[byte_start:byte_end].decode('utf-8')
+        base = first * CHECKPOINT_CHARS
+        return text[start - base:stop - base]
+
+    def _map(self) -> Union[mmap.mmap, bytes]:
+        """Map the file on first access"""
+        with self._lock:
+            if self._mmap is None:
+                if self.path.stat().st_size == 0:
+                    return b""
+                with open(self.path, 'rb') as f:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap
+
+    def close(self) -> None:
+        """Unmap the file (it is mapped again on the next access)"""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+
+class DiskTextWriter:
+    """Append text page by page, then publish it atomically as a DiskText"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Final text file path; the .idx file is written next to it
+        """
+        self.path = Path(path)
+        self._tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        self._tmp_path = self.path.with_name(self.path.name + self._tmp_suffix)
+        self._file = open(self._tmp_path, 'wb')
+        self._chars = 0
+        self._bytes = 0
+        self._checkpoints = array('Q')
+
+    def write(self, text: str) -> None:
+        """Append text, recording a byte offset every CHECKPOINT_CHARS characters"""
+        pos = 0
+        while pos < len(text):
+            if self._chars % CHECKPOINT_CHARS == 0:
+                self._checkpoints.append(self._bytes)
+            take = min(len(text) - pos, CHECKPOINT_CHARS - self._chars % CHECKPOINT_CHARS)
+            data = text[pos:pos + take].encode('utf-8')
+            self._file.write(data)
+            self._chars += take
+            self._bytes += len(data)
+            pos += take
+
+    def close(self) -> DiskText:
+        """Finish the file and return a view of it"""
+        self._file.close()
+        index = array('Q', [self._chars])
+        index.extend(self._checkpoints)
+        idx_path = self.path.with_suffix('.idx')
+        idx_tmp = idx_path.with_name(idx_path.name + self._tmp_suffix)
+        with open(idx_tmp, 'wb') as f:
+            index.tofile(f)
+        # Text first: a reader that finds the index always finds complete text
+        os.replace(self._tmp_path, self.path)
+        os.replace(idx_tmp, idx_path)
+        return DiskText(self.path)
+
+    def abort(self) -> None:
+        """Discard a partially written file"""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,164 @@
+"""
+Parsed Paper Cache - Content-addressed store of parsed papers
+
+Entries are keyed by the PDF's SHA-256 and the parser version, so re-uploads
+of the same file and repeated extractions never hit PyMuPDF again.
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional, Dict, Any, Union, BinaryIO
+
+from .disk_text import DiskText, DiskTextWriter
+from .pdf_parser import ParsedPaper, Section, PARSER_VERSION
+from .references import Reference
+from .tables import Table
+
+
+def hash_file(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def copy_and_hash(src: BinaryIO, dst: BinaryIO, chunk_size: int = 1 << 20) -> str:
+    """Copy a file object (like shutil.copyfileobj) and return the SHA-256 of the bytes copied"""
+    digest = hashlib.sha256()
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        dst.write(chunk)
+    return digest.hexdigest()
+
+
+class ParsedPaperCache:
+    """Persistent cache of parsed papers (full text, sections, page offsets)"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.parse_seconds = 0.0        # time spent parsing on misses
+        self.parse_seconds_saved = 0.0  # original parse time of every hit
+
+    def __getstate__(self):
+        # A copy in another process starts with its own lock and counters
+        return {"cache_dir": self.cache_dir}
+
+    def __setstate__(self, state):
+        self.__init__(state["cache_dir"])
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}_v{PARSER_VERSION}.json"
+
+    def _text_path(self, content_hash: str, kind: str) -> Path:
+        name = f"{content_hash}_v{PARSER_VERSION}"
+        return self.cache_dir / (f"{name}.txt" if kind == "full" else f"{name}.{kind}.txt")
+
+    def text_writer(self, content_hash: str, kind: str = "full") -> DiskTextWriter:
+        """Writer for a paper's full ("full") or normalised ("clean") text (disk_text mode)"""
+        return DiskTextWriter(self._text_path(content_hash, kind))
+
+    def contains(self, content_hash: str) -> bool:
+        """Check for an entry without counting a hit or miss"""
+        return self._entry_path(content_hash).exists()
+
+    def get(self, content_hash: str, paper_id: str) -> Optional[ParsedPaper]:
+        """
+        Rebuild a ParsedPaper from the cache
+
+        Args:
+            content_hash: SHA-256 of the PDF
+            paper_id: ID to stamp on the returned paper
+
+        Returns:
+            ParsedPaper, or None on a miss
+        """
+        entry_path = self._entry_path(content_hash)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Disk-text entries keep the texts in separate memory-mapped files
+            full_text = DiskText(self.cache_dir / entry["text_file"]) if "text_file" in entry else entry["full_text"]
+            clean_text = (DiskText(self.cache_dir / entry["clean_text_file"]) if "clean_text_file" in entry
+                          else entry.get("clean_text", ""))
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.parse_seconds_saved += entry.get("parse_seconds", 0.0)
+
+        return ParsedPaper(
+            paper_id=paper_id,
+            title=entry["title"],
+            authors=entry["authors"],
+            abstract=entry["abstract"],
+            full_text=full_text,
+            sections=[Section(**s) for s in entry["sections"]],
+            metadata=entry["metadata"],
+            num_pages=entry["num_pages"],
+            page_offsets=entry["page_offsets"],
+            clean_text=clean_text,
+            references=[Reference(**r) for r in entry.get("references", [])],
+            tables=[Table(**t) for t in entry.get("tables", [])]
+        )
+
+    def put(self, content_hash: str, paper: ParsedPaper, parse_seconds: float = 0.0) -> None:
+        """Store a parsed paper (atomic write, safe across workers)"""
+        entry = {
+            "content_hash": content_hash,
+            "parser_version": PARSER_VERSION,
+            "parse_seconds": parse_seconds,
+            "title": paper.title,
+            "authors": paper.authors,
+            "abstract": paper.abstract,
+            "sections": [asdict(s) for s in paper.sections],
+            "metadata": paper.metadata,
+            "num_pages": paper.num_pages,
+            "page_offsets": list(paper.page_offsets),
+            "references": [asdict(r) for r in paper.references],
+            "tables": [asdict(t) for t in paper.tables]
+        }
+        for key, file_key, text in (("full_text", "text_file", paper.full_text),
+                                    ("clean_text", "clean_text_file", paper.clean_text)):
+            if isinstance(text, DiskText):
+                entry[file_key] = text.path.name
+            else:
+                entry[key] = text
+        entry_path = self._entry_path(content_hash)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, entry_path)
+        self.record_parse(parse_seconds)
+
+    def record_parse(self, parse_seconds: float) -> None:
+        """Count time spent parsing a miss (put() does this; also used for parses done in another process)"""
+        with self._lock:
+            self.parse_seconds += parse_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and parse time saved since process start"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "parse_seconds": round(self.parse_seconds, 3),
+                "parse_seconds_saved": round(self.parse_seconds_saved, 3),
+                "parser_version": PARSER_VERSION
+            }
@@ -1,11 +1,47 @@
 """
 PDF Parser - Extract text and structure from research papers
 """
-import fitz  # PyMuPDF
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Iterable, Iterator, Union, TYPE_CHECKING
 from dataclasses import dataclass, field
 import re
+import threading
+import time
+
+from .disk_text import DiskText
+from .references import Reference
+from .tables import Table, extract_tables, has_table_caption
+from .text_normalizer import TextNormalizer
+
+if TYPE_CHECKING:
+    from .paper_cache import ParsedPaperCache
+
+
+# Bump whenever parsing output changes so cached parses are invalidated
+PARSER_VERSION = 5
+
+
+def _page_offsets(page_texts: Iterable[str]) -> array:
+    """Start offset of each page once joined with newlines"""
+    offsets = array('I')
+    offset = 0
+    for page_text in page_texts:
+        offsets.append(offset)
+        offset += len(page_text) + 1  # +1 for the joining newline
+    return offsets
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """Extract text of pages [start, end) - runs inside a worker process"""
+    import fitz  # PyMuPDF; imported on first parse, not at startup
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc[i].get_text() for i in range(start, end)]
+    finally:
+        doc.close()
 
 
 @dataclass
@@ -15,8 +51,8 @@ class Section:
     number: str  # e.g., "3.2"
     level: int
     content: str
-    start_page: int
-    end_page: int
+    start_page: int  # 0-based page of the heading
+    end_page: int  # 0-based page of the last content line
 
 
 @dataclass
@@ -26,160 +62,486 @@ class ParsedPaper:
     title: str
     authors: List[str] = field(default_factory=list)
     abstract: str = ""
-    full_text: str = ""
+    full_text: Union[str, DiskText] = ""  # DiskText when parsed with disk_text=True
     sections: List[Section] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
     num_pages: int = 0
+    page_offsets: array = field(default_factory=lambda: array('I'))  # start of each page in full_text
+    clean_text: Union[str, DiskText] = ""  # full_text without headers/footers, bibliography, etc.
+    references: List[Reference] = field(default_factory=list)  # bibliography split off clean_text
+    tables: List[Table] = field(default_factory=list)  # captioned tables as rows/columns
+    
+    def __post_init__(self):
+        if not isinstance(self.page_offsets, array):
+            self.page_offsets = array('I', self.page_offsets)
+    
+    @property
+    def llm_text(self) -> Union[str, DiskText]:
+        """Text to send to extractors: the normalised text when available"""
+        return self.clean_text or self.full_text
+    
+    def page_of(self, offset: int) -> int:
+        """0-based page containing character offset `offset` of full_text (O(log n))"""
+        if not self.page_offsets:
+            return 0
+        return max(bisect_right(self.page_offsets, offset) - 1, 0)
+    
+    def slice_pages(self, start: int, end: int) -> str:
+        """Text of pages [start, end) as a single slice of full_text"""
+        num_pages = len(self.page_offsets)
+        start = max(start, 0)
+        end = min(end, num_pages)
+        if start >= end:
+            return ""
+        text_end = self.page_offsets[end] - 1 if end < num_pages else len(self.full_text)
+        return self.full_text[self.page_offsets[start]:text_end]
+
+
+@dataclass
+class ParseEvent:
+    """One step of an incremental parse (see PaperParser.iter_parse)"""
+    kind: str  # "page", "section" or "paper"
+    page_number: int = 0  # 0-based page the event was produced on
+    text: str = ""  # page text ("page" events)
+    section: Optional[Section] = None  # completed section ("section" events)
+    paper: Optional[ParsedPaper] = None  # full result ("paper" event, always last)
+
+
+# Common section patterns: "1. Introduction", "2.1 Method", etc.
+SECTION_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s+([A-Z][^\n]+)')
+
+# First of these (after "abstract") ends the abstract
+ABSTRACT_END_KEYWORDS = ("introduction", "1 introduction", "1. introduction", "1 background")
+
+# Authors are looked for in this many leading lines
+AUTHOR_SEARCH_LINES = 20
+
+# quick_parse() keeps reading past its page limit, up to this many pages, while the abstract is open
+QUICK_PARSE_MAX_PAGES = 4
+
+
+class _PaperScanner:
+    """
+    Single linear pass over the page texts
+    
+    Lines are fed exactly as full_text.split('\n') would produce them, each
+    tagged with the page it starts on, and title, authors, abstract bounds and
+    sections (with page spans) are all detected in that one walk.
+    """
+    
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.authors: List[str] = []
+        self._line_count = 0
+        self._pending = ""  # partial last line carried over to the next page
+        self._pending_page = 0
+        
+        # Abstract bounds are offsets into full_text.lower(), which can differ
+        # from full_text offsets for a few non-ASCII characters
+        self._lower_offset = 0
+        self._abstract_start: Optional[int] = None
+        self._abstract_end: Optional[int] = None
+        self._abstract_done = False
+        
+        self._current: Optional[dict] = None
+        self._content: List[str] = []
+        self._last_page = 0
+    
+    def feed_page(self, page_number: int, page_text: str) -> List[Section]:
+        """Consume one page; returns the sections closed on it"""
+        chunk = page_text if page_number == 0 else "\n" + page_text
+        lines = (self._pending + chunk).split('\n')
+        self._pending = lines.pop()
+        
+        closed = []
+        line_page = self._pending_page  # first line may have started on an earlier page
+        for line in lines:
+            section = self._feed_line(line, line_page)
+            if section:
+                closed.append(section)
+            line_page = page_number
+        self._pending_page = page_number if lines else self._pending_page
+        return closed
+    
+    def finish(self) -> List[Section]:
+        """Flush the last line and close the open section at end of document"""
+        closed = []
+        section = self._feed_line(self._pending, self._pending_page)
+        if section:
+            closed.append(section)
+        section = self._close()
+        if section:
+            closed.append(section)
+        return closed
+    
+    @property
+    def abstract_open(self) -> bool:
+        """Abstract keyword seen but its end not reached yet"""
+        return self._abstract_start is not None and not self._abstract_done
+    
+    def abstract(self, full_text: str) -> str:
+        """Abstract text between the keyword and the start of the introduction"""
+        if self._abstract_start is None:
+            return ""
+        abstract = full_text[self._abstract_start:self._abstract_end]
+        # Remove the word "Abstract"
+        abstract = re.sub(r'abstract', '', abstract, count=1, flags=re.IGNORECASE)
+        return abstract.strip()
+    
+    def _feed_line(self, line: str, page: int) -> Optional[Section]:
+        self._line_count += 1
+        stripped = line.strip()
+        
+        # Title: first line that is not too short/long and not an all-caps header
+        if self.title is None and 10 < len(stripped) < 200 and not stripped.isupper():
+            self.title = stripped
+        
+        # Authors: first comma-separated line near the top (heuristic)
+        if (not self.authors and self._line_count <= AUTHOR_SEARCH_LINES
+                and ',' in stripped and len(stripped) < 100 and '@' not in stripped):
+            self.authors = [name.strip() for name in stripped.split(',')]
+        
+        if not self._abstract_done:
+            self._scan_abstract(line)
+        
+        # Sections: cheap digit check before the regex
+        if stripped[:1].isdigit():
+            match = SECTION_PATTERN.match(stripped)
+            if match:
+                finished = self._close()
+                number, title = match.groups()
+                self._current = {
+                    'number': number,
+                    'title': title.strip(),
+                    'level': len(number.split('.')),
+                    'start_page': page
+                }
+                self._content = []
+                self._last_page = page
+                return finished
+        
+        if self._current:
+            self._content.append(line)
+            self._last_page = page
+        return None
+    
+    def _scan_abstract(self, line: str) -> None:
+        lowered = line.lower()
+        search_from = 0
+        if self._abstract_start is None:
+            pos = lowered.find("abstract")
+            if pos != -1:
+                self._abstract_start = self._lower_offset + pos
+                search_from = pos
+        if self._abstract_start is not None:
+            hits = [p for p in (lowered.find(k, search_from) for k in ABSTRACT_END_KEYWORDS) if p != -1]
+            if hits:
+                self._abstract_end = self._lower_offset + min(hits)
+                self._abstract_done = True
+        self._lower_offset += len(lowered) + 1
+    
+    def _close(self) -> Optional[Section]:
+        if self._current is None:
+            return None
+        section = Section(content='\n'.join(self._content), end_page=self._last_page, **self._current)
+        self._current = None
+        self._content = []
+        return section
 
 
 class PaperParser:
     """Extract text and structure from PDF research papers"""
     
-    def parse_pdf(self, pdf_path: str, paper_id: str) -> ParsedPaper:
+    def __init__(self, cache: Optional["ParsedPaperCache"] = None,
+                 workers: int = 1, parallel_min_pages: int = 40, disk_text: bool = False,
+                 normalize: bool = True, tables: bool = True):
+        """
+        Args:
+            cache: Optional parsed-paper cache; identical PDFs are parsed only once
+            workers: Processes used for text extraction (1 = serial)
+            parallel_min_pages: Papers shorter than this are always parsed serially
+            disk_text: Stream full_text to a file in the cache directory and expose
+                it as a memory-mapped DiskText instead of an in-memory str (needs cache)
+            normalize: Also produce clean_text (see TextNormalizer) and references,
+                with a reduction report in metadata["normalization"]
+            tables: Rebuild captioned tables as rows/columns (see parsers.tables)
+        """
+        self.cache = cache
+        self.disk_text = disk_text and cache is not None
+        self.normalize = normalize
+        self.tables = tables
+        self.workers = max(1, workers)
+        self.parallel_min_pages = parallel_min_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def __getstate__(self):
+        # Sent to sandbox workers: configuration only, not the extraction pool
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        del state["_executor_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+    
+    def parse_pdf(self, pdf_path: str, paper_id: str, content_hash: Optional[str] = None) -> ParsedPaper:
         """
         Parse a PDF file and extract structured content
         
         Args:
             pdf_path: Path to PDF file
             paper_id: Unique identifier for the paper
+            content_hash: SHA-256 of the file, if already known (skips re-hashing)
             
         Returns:
             ParsedPaper object with extracted content
         """
+        for event in self.iter_parse(pdf_path, paper_id, content_hash):
+            if event.kind == "paper":
+                return event.paper
+    
+    def quick_parse(self, pdf_path: str, paper_id: str, max_pages: int = 2) -> ParsedPaper:
+        """
+        Title, authors and abstract from the leading pages and the PDF metadata
+        
+        Runs the same scanner as a full parse over the first pages only (a few
+        more if the abstract is still open), so the fields normally match the
+        full parse. The result is marked metadata["partial"] = True and has no
+        sections, references or full text; it is never cached.
+        
+        Args:
+            pdf_path: Path to PDF file
+            paper_id: Unique identifier for the paper
+            max_pages: Leading pages to read
+            
+        Returns:
+            Partial ParsedPaper
+        """
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        # Extract full text
-        full_text, num_pages = self._extract_text(pdf_path)
-        
-        # Extract title (first significant text)
-        title = self._extract_title(full_text)
-        
-        # Extract abstract
-        abstract = self._extract_abstract(full_text)
-        
-        # Extract authors (heuristic)
-        authors = self._extract_authors(full_text)
-        
-        # Extract sections
-        sections = self._extract_sections(full_text)
+        scanner = _PaperScanner()
+        page_texts = []
+        import fitz
+        doc = fitz.open(pdf_path)
+        try:
+            num_pages = len(doc)
+            pdf_metadata = {key: value for key, value in (doc.metadata or {}).items() if value}
+            for page_number in range(min(num_pages, QUICK_PARSE_MAX_PAGES)):
+                if page_number >= max_pages and not scanner.abstract_open:
+                    break
+                page_text = doc[page_number].get_text()
+                page_texts.append(page_text)
+                scanner.feed_page(page_number, page_text)
+        finally:
+            doc.close()
+        scanner.finish()
         
+        # Document info is the fallback: it is often empty or an editor's file name
+        meta_authors = [a.strip() for a in re.split(r'[;,]| and ', pdf_metadata.get("author", "")) if a.strip()]
+        leading_text = "\n".join(page_texts)
         return ParsedPaper(
             paper_id=paper_id,
-            title=title,
-            authors=authors,
-            abstract=abstract,
-            full_text=full_text,
-            sections=sections,
+            title=scanner.title or pdf_metadata.get("title") or "Unknown Title",
+            authors=scanner.authors or meta_authors or ["Unknown"],
+            abstract=scanner.abstract(leading_text),
             num_pages=num_pages,
-            metadata={"source": str(pdf_path)}
+            page_offsets=_page_offsets(page_texts),
+            metadata={"source": str(pdf_path), "partial": True, "pdf_metadata": pdf_metadata}
         )
     
-    def _extract_text(self, pdf_path: Path) -> tuple[str, int]:
-        """Extract all text from PDF"""
-        doc = fitz.open(pdf_path)
-        text_parts = []
+    def iter_parse(self, pdf_path: str, paper_id: str,
+                   content_hash: Optional[str] = None) -> Iterator[ParseEvent]:
+        """
+        Parse a PDF incrementally
         
-        for page in doc:
-            text_parts.append(page.get_text())
+        Yields a "page" event per page as soon as its text is extracted and a
+        "section" event as soon as a section is closed by the next heading, so
+        callers that only need the opening sections can stop early. The last
+        event is "paper" with the complete ParsedPaper.
         
-        num_pages = len(doc)
-        doc.close()
+        Args:
+            pdf_path: Path to PDF file
+            paper_id: Unique identifier for the paper
+            content_hash: SHA-256 of the file, if already known (skips re-hashing)
+            
+        Yields:
+            ParseEvent objects in document order
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        return "\n".join(text_parts), num_pages
-    
-    def _extract_title(self, text: str) -> str:
-        """Extract title (first non-empty line, heuristic)"""
-        lines = text.split('\n')
-        for line in lines:
-            line = line.strip()
-            # Skip very short lines and all-caps headers
-            if len(line) > 10 and len(line) < 200 and not line.isupper():
-                return line
-        return "Unknown Title"
-    
-    def _extract_abstract(self, text: str) -> str:
-        """Extract abstract section"""
-        text_lower = text.lower()
-        
-        # Find "abstract" keyword
-        if "abstract" not in text_lower:
-            return ""
+        if self.cache is not None:
+            # Content-addressed lookup: same bytes + same parser version = same result
+            if content_hash is None:
+                from .paper_cache import hash_file
+                content_hash = hash_file(pdf_path)
+            cached = self.cache.get(content_hash, paper_id)
+            if cached is not None:
+                yield from self._replay(cached)
+                return
         
-        start = text_lower.find("abstract")
+        start = time.perf_counter()
+        page_texts = []  # in-memory mode only
+        page_offsets = array('I')
+        offset = 0
+        sections = []
+        table_pages = []  # pages whose text has a "Table N:" caption
+        scanner = _PaperScanner()
+        normalizer = TextNormalizer() if self.normalize else None
+        # Disk mode: pages go straight to the cache's text file, never held together
+        writer = self.cache.text_writer(content_hash) if self.disk_text else None
         
-        # Find next section (Introduction, 1. Introduction, etc.)
-        end_keywords = ["introduction", "1 introduction", "1. introduction", "1 background"]
-        end = len(text)
+        try:
+            for page_number, page_text in enumerate(self._iter_page_texts(pdf_path)):
+                page_offsets.append(offset)
+                offset += len(page_text) + 1
+                if writer is not None:
+                    writer.write(page_text if page_number == 0 else "\n" + page_text)
+                else:
+                    page_texts.append(page_text)
+                if normalizer is not None:
+                    normalizer.observe_page(page_text)
+                if self.tables and has_table_caption(page_text):
+                    table_pages.append(page_number)
+                yield ParseEvent("page", page_number=page_number, text=page_text)
+                
+                for section in scanner.feed_page(page_number, page_text):
+                    sections.append(section)
+                    yield ParseEvent("section", page_number=page_number, section=section)
+            
+            num_pages = len(page_offsets)
+            for section in scanner.finish():
+                sections.append(section)
+                yield ParseEvent("section", page_number=num_pages - 1, section=section)
+        except BaseException:
+            # Failed or abandoned by the consumer - drop the partial text file
+            if writer is not None:
+                writer.abort()
+            raise
         
-        for keyword in end_keywords:
-            pos = text_lower.find(keyword, start)
-            if pos != -1 and pos < end:
-                end = pos
+        full_text = writer.close() if writer is not None else "\n".join(page_texts)
+        del page_texts  # release the page list before the cache write
+        paper = self._build_paper(pdf_path, paper_id, full_text, page_offsets, sections, scanner)
+        if table_pages:
+            paper.tables = self._extract_tables(pdf_path, table_pages)
+        if normalizer is not None:
+            paper.clean_text = self._normalize(paper, normalizer, content_hash)
+            paper.references = normalizer.references
+            paper.metadata["normalization"] = normalizer.report()
+        if content_hash is not None:
+            paper.metadata["sha256"] = content_hash
+        if self.cache is not None:
+            self.cache.put(content_hash, paper, time.perf_counter() - start)
         
-        abstract = text[start:end]
-        # Remove the word "Abstract"
-        abstract = re.sub(r'abstract', '', abstract, count=1, flags=re.IGNORECASE)
-        return abstract.strip()
+        yield ParseEvent("paper", page_number=num_pages - 1, paper=paper)
     
-    def _extract_authors(self, text: str) -> List[str]:
-        """Extract authors (simple heuristic - lines after title before abstract)"""
-        # This is a simple heuristic and won't work for all papers
-        # In production, you'd use more sophisticated NLP
-        lines = text.split('\n')[:20]  # Check first 20 lines
-        authors = []
-        
-        for line in lines:
-            line = line.strip()
-            # Look for lines with comma-separated names (heuristic)
-            if ',' in line and len(line) < 100 and '@' not in line:
-                # Might be author line
-                potential_authors = [name.strip() for name in line.split(',')]
-                if len(potential_authors) > 1:
-                    authors.extend(potential_authors)
-                    break
-        
-        return authors if authors else ["Unknown"]
+    def _build_paper(self, pdf_path: Path, paper_id: str, full_text: Union[str, DiskText],
+                     page_offsets: array, sections: List[Section],
+                     scanner: _PaperScanner) -> ParsedPaper:
+        """Assemble the final ParsedPaper once every page has been read"""
+        return ParsedPaper(
+            paper_id=paper_id,
+            title=scanner.title or "Unknown Title",
+            authors=scanner.authors or ["Unknown"],
+            abstract=scanner.abstract(full_text),
+            full_text=full_text,
+            sections=sections,
+            num_pages=len(page_offsets),
+            page_offsets=page_offsets,
+            metadata={"source": str(pdf_path)}
+        )
     
-    def _extract_sections(self, text: str) -> List[Section]:
-        """Extract sections with titles and content"""
-        sections = []
-        
-        # Common section patterns: "1. Introduction", "2.1 Method", etc.
-        section_pattern = r'^(\d+(?:\.\d+)?)\s+([A-Z][^\n]+)'
-        
-        lines = text.split('\n')
-        current_section = None
-        current_content = []
+    def _extract_tables(self, pdf_path: Path, table_pages: List[int]) -> List[Table]:
+        """Rebuild the tables on captioned pages; best effort, a failure only loses the tables"""
+        try:
+            import fitz
+            doc = fitz.open(pdf_path)
+            try:
+                return extract_tables(doc, table_pages)
+            finally:
+                doc.close()
+        except Exception as e:
+            print(f"⚠️  Table extraction failed for {pdf_path.name}: {e}")
+            return []
+    
+    def _normalize(self, paper: ParsedPaper, normalizer: TextNormalizer,
+                   content_hash: Optional[str]) -> Union[str, DiskText]:
+        """Build clean_text from the stored pages, on disk in disk_text mode"""
+        pages = (paper.slice_pages(i, i + 1) for i in range(paper.num_pages))
+        chunks = normalizer.clean_pages(pages)
+        if not self.disk_text:
+            return "\n".join(chunks)
         
-        for i, line in enumerate(lines):
-            match = re.match(section_pattern, line.strip())
-            if match:
-                # Save previous section
-                if current_section:
-                    current_section['content'] = '\n'.join(current_content)
-                    sections.append(Section(**current_section))
-                
-                # Start new section
-                number, title = match.groups()
-                level = len(number.split('.'))
-                current_section = {
-                    'number': number,
-                    'title': title.strip(),
-                    'level': level,
-                    'start_page': 0,  # Would need page-level parsing
-                    'end_page': 0,
-                    'content': ''
-                }
-                current_content = []
-            elif current_section:
-                current_content.append(line)
+        writer = self.cache.text_writer(content_hash, "clean")
+        try:
+            for i, chunk in enumerate(chunks):
+                writer.write(chunk if i == 0 else "\n" + chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.close()
+    
+    def _replay(self, paper: ParsedPaper) -> Iterator[ParseEvent]:
+        """Emit the events of an already-parsed paper (cache hit)"""
+        for page_number in range(len(paper.page_offsets)):
+            yield ParseEvent("page", page_number=page_number, text=paper.slice_pages(page_number, page_number + 1))
+        for section in paper.sections:
+            yield ParseEvent("section", page_number=section.end_page, section=section)
+        yield ParseEvent("paper", page_number=paper.num_pages - 1, paper=paper)
+    
+    def _iter_page_texts(self, pdf_path: Path) -> Iterator[str]:
+        """Yield page texts in order, serially or from the process pool"""
+        import fitz
+        doc = fitz.open(pdf_path)
+        try:
+            num_pages = len(doc)
+            if self.workers > 1 and num_pages >= self.parallel_min_pages:
+                doc.close()
+                doc = None
+                for chunk in self._extract_pages_parallel(pdf_path, num_pages):
+                    yield from chunk
+            else:
+                for page in doc:
+                    yield page.get_text()
+        finally:
+            if doc is not None:
+                doc.close()
+    
+    def _extract_pages_parallel(self, pdf_path: Path, num_pages: int) -> Iterator[List[str]]:
+        """Split the page range across the process pool, yielding chunks in page order"""
+        # Twice as many chunks as workers evens out figure-heavy pages
+        num_chunks = min(num_pages, self.workers * 2)
+        bounds = [num_pages * i // num_chunks for i in range(num_chunks + 1)]
         
-        # Save last section
-        if current_section:
-            current_section['content'] = '\n'.join(current_content)
-            sections.append(Section(**current_section))
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_extract_page_range, str(pdf_path), bounds[i], bounds[i + 1])
+            for i in range(num_chunks)
+        ]
         
-        return sections
-
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Consumer stopped early - drop work that has not started yet
+            for future in futures:
+                future.cancel()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or create the extraction process pool"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+    
+    def close(self) -> None:
+        """Shut down the extraction process pool, if one was started"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
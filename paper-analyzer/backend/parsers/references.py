@@ -0,0 +1,159 @@
+"""
+References - Split the bibliography off the body text into structured entries
+
+Works line by line on the cleaned text so it can run while the text is
+being streamed (see TextNormalizer), holding only the bibliography itself.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+REFERENCES_HEADING_PATTERN = re.compile(
+    r'^(?:\d+\.?\s+|[A-Z]\.?\s+)?(?:references|bibliography|references and notes|literature cited)$',
+    re.IGNORECASE)
+
+# End of the bibliography: an appendix heading ("Appendix", "A Proofs", "A1 Model Details", a bare "A")
+APPENDIX_HEADING_PATTERN = re.compile(r'^(?:appendix|appendices|supplementary\s+(?:material|information))\b',
+                                      re.IGNORECASE)
+APPENDIX_LETTER_PATTERN = re.compile(r'^A(?:\.?1)?\.?(?:\s+[A-Z][a-z]+(?:\s+[^\s,.]+){0,8})?$')
+
+BRACKET_LABEL_PATTERN = re.compile(r'^\[([^\]]{1,40})\]\s*')  # "[12]", "[AAB+15]", "[Smith et al., 2019]"
+NUMBER_LABEL_PATTERN = re.compile(r'^(\d{1,3})(?:\.\s+|\s*$)')  # "12. Smith" or a bare "12" line
+YEAR_PATTERN = re.compile(r'(?<![\d.:/])(?:19|20)\d{2}(?!\d)')
+QUOTED_TITLE_PATTERN = re.compile(r'[“"](.{8,}?)[,.]?[”"]')
+COLON_TITLE_PATTERN = re.compile(r'^[^:]{2,300}?[A-Z]\.:\s+(.+?)\.(?:\s|$)')  # Springer "Smith, J.: Title."
+# Sentence break that is not an author initial ("J. Smith")
+SEGMENT_BREAK_PATTERN = re.compile(r'(?<=[a-z0-9)?!])\.\s+')
+# "Smith, J.", "John Smith, Jane Doe", "John Smith and Jane Doe"
+AUTHOR_START_PATTERN = re.compile(r'^[A-Z][^\s,;.]*(?:\s+[A-Z][^\s,;.]*){0,3},|^[A-Z][^\s,;.]*(?:\s+[A-Z][^\s,;.]*){1,3}\s+and\s+[A-Z]')
+
+# Fewer entries than this after a heading means it was not a bibliography (e.g. a table of contents)
+MIN_REFERENCES = 3
+
+# A last entry longer than this has run into figures/tables after the list
+MAX_ENTRY_CHARS = 1000
+
+
+@dataclass
+class Reference:
+    """One bibliography entry"""
+    number: int  # 1-based position in the reference list
+    label: str  # citation label as printed ("12", "AAB+15"), "" for author-year lists
+    raw: str  # entry text, lines joined
+    title: str = ""
+    year: str = ""
+
+
+def parse_reference(number: int, label: str, raw: str) -> Reference:
+    """Cheap title/year parse of one entry"""
+    year_match = YEAR_PATTERN.search(raw)
+    match = QUOTED_TITLE_PATTERN.search(raw) or COLON_TITLE_PATTERN.match(raw)
+    if match:
+        title = match.group(1)
+    else:
+        # "Authors. Title. Venue, year." / "Authors (2019). Title." / "Authors. 2019. Title."
+        segments = [s for s in SEGMENT_BREAK_PATTERN.split(raw, maxsplit=3)
+                    if not YEAR_PATTERN.fullmatch(s.strip('() '))]
+        title = segments[1] if len(segments) > 1 else ""
+    return Reference(
+        number=number,
+        label=label,
+        raw=raw,
+        title=title.strip(' .,')[:300],
+        year=year_match.group(0) if year_match else ""
+    )
+
+
+def _group_entries(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """Group bibliography lines into (label, lines) entries, detecting the list style from the first line"""
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return []
+
+    if BRACKET_LABEL_PATTERN.match(lines[0]):
+        style = "bracket"
+    elif NUMBER_LABEL_PATTERN.match(lines[0]):
+        style = "number"
+    else:
+        style = "author-year"
+
+    entries: List[Tuple[str, List[str]]] = []
+    for i, line in enumerate(lines):
+        label: Optional[str] = None
+        if style == "bracket":
+            match = BRACKET_LABEL_PATTERN.match(line)
+            if match:
+                label, line = match.group(1), line[match.end():]
+        elif style == "number":
+            match = NUMBER_LABEL_PATTERN.match(line)
+            # Labels must count up, so stray numbers in an entry are not split on
+            if match and int(match.group(1)) == len(entries) + 1:
+                label, line = match.group(1), line[match.end():]
+        elif i == 0 or (lines[i - 1].rstrip().endswith('.') and AUTHOR_START_PATTERN.match(line)):
+            label = ""
+
+        if label is not None or not entries:
+            entries.append((label or "", [line] if line else []))
+        else:
+            entries[-1][1].append(line)
+    return entries
+
+
+class ReferenceSplitter:
+    """
+    Streaming bibliography filter
+
+    feed() takes text chunks in order and returns the part that belongs to
+    the body; lines from a references heading up to the next appendix heading
+    (or the end) are held back and parsed into Reference entries.
+    """
+
+    def __init__(self):
+        self.references: List[Reference] = []
+        self.removed_chars = 0
+        self._buffer: Optional[List[str]] = None  # lines after a heading, None in the body
+
+    def feed(self, chunk: str) -> str:
+        """Consume one chunk; returns its body lines (possibly with earlier held-back lines)"""
+        body: List[str] = []
+        for line in chunk.split('\n'):
+            stripped = line.strip()
+            if REFERENCES_HEADING_PATTERN.match(stripped):
+                body.extend(self._close())
+                self._buffer = [line]
+            elif self._buffer is not None and (APPENDIX_HEADING_PATTERN.match(stripped)
+                                               or APPENDIX_LETTER_PATTERN.match(stripped)):
+                body.extend(self._close())
+                body.append(line)
+            elif self._buffer is not None:
+                self._buffer.append(line)
+            else:
+                body.append(line)
+        return '\n'.join(body)
+
+    def finish(self) -> str:
+        """Close a bibliography that runs to the end of the document"""
+        return '\n'.join(self._close())
+
+    def _close(self) -> List[str]:
+        """End the current bibliography; returns its lines if it turned out not to be one"""
+        if self._buffer is None:
+            return []
+        lines, self._buffer = self._buffer, None
+        entries = _group_entries(lines[1:])
+        if len(entries) < MIN_REFERENCES:
+            return lines
+
+        # Cut an over-long last entry at its first full stop; the rest is body text
+        tail: List[str] = []
+        label, entry_lines = entries[-1]
+        if sum(len(line) for line in entry_lines) > MAX_ENTRY_CHARS:
+            end = next((i for i, line in enumerate(entry_lines) if line.rstrip().endswith('.')), len(entry_lines) - 1)
+            entries[-1] = (label, entry_lines[:end + 1])
+            tail = entry_lines[end + 1:]
+
+        offset = len(self.references)
+        for number, (label, entry_lines) in enumerate(entries, start=offset + 1):
+            self.references.append(parse_reference(number, label, ' '.join(' '.join(entry_lines).split())))
+        self.removed_chars += sum(len(line) + 1 for line in lines) - sum(len(line) + 1 for line in tail)
+        return tail
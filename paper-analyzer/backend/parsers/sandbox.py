@@ -0,0 +1,360 @@
+"""
+Parse Sandbox - Run PDF parsing in supervised, resource-limited worker processes
+
+A pathological PDF can keep PyMuPDF busy for minutes or decompress a few
+kilobytes into gigabytes. Parsing in a worker process with a wall-clock and
+memory limit keeps that out of the API process: the worker is killed, the
+job gets a structured failure and a fresh worker takes its place. Workers
+are also recycled after a fixed number of jobs so leaks in the native
+library cannot build up.
+
+Workers are not daemonic, so a parser with workers > 1 can start its
+page-parallel extraction pool inside one; the pool is kept across the
+worker's jobs, counts towards its memory limit and is killed with it.
+"""
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.util import Finalize
+from typing import Any, Dict, List, Optional
+
+from .paper_cache import hash_file
+from .pdf_parser import PaperParser, ParsedPaper
+
+# How often the supervisor checks a running job's clock and memory
+POLL_INTERVAL = 0.05
+
+# Seconds a worker gets to exit after being asked to stop
+STOP_GRACE_SECONDS = 1.0
+
+FAILURE_STATUSES = ("error", "timeout", "memory", "crashed")
+
+
+def _rss_mb(pid: int) -> float:
+    """Current resident set size of a process in MB (0.0 where /proc is unavailable)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1 << 20)
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def _descendants(pid: int) -> List[int]:
+    """Child processes of pid and theirs, e.g. a worker's extraction pool (empty where /proc is unavailable)"""
+    children = []
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return children
+    for task in tasks:
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            pass
+    return children + [grandchild for child in children for grandchild in _descendants(child)]
+
+
+def _tree_rss_mb(pid: int) -> float:
+    """Resident set size of a process and its descendants in MB"""
+    return _rss_mb(pid) + sum(_rss_mb(child) for child in _descendants(pid))
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: run (parser, method, args) jobs until told to stop or the supervisor goes away"""
+    # Every job unpickles a fresh parser; its extraction pool is kept here so the next job reuses it
+    pools: Dict[int, ProcessPoolExecutor] = {}
+    try:
+        while True:
+            try:
+                job = conn.recv()
+            except EOFError:
+                return
+            if job is None:
+                return
+            parser, method, args = job
+            parser._executor = pools.get(parser.workers)
+            start = time.perf_counter()
+            try:
+                reply = ("ok", getattr(parser, method)(*args), "")
+            except MemoryError:
+                reply = ("memory", None, "MemoryError")
+            except Exception as e:
+                reply = ("error", None, f"{type(e).__name__}: {e}")
+            if parser._executor is not None:
+                pools[parser.workers] = parser._executor
+            conn.send(reply + (time.perf_counter() - start, _peak_rss_mb()))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(cancel_futures=True)
+
+
+@dataclass
+class ParseOutcome:
+    """Structured result of one sandboxed job"""
+    status: str  # "ok", or one of FAILURE_STATUSES
+    result: Any = None  # return value of the parser method when ok
+    error: str = ""
+    seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    worker_pid: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "error": self.error,
+            "seconds": round(self.seconds, 3),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "worker_pid": self.worker_pid
+        }
+
+
+class ParseFailure(Exception):
+    """A sandboxed parse did not produce a result"""
+
+    def __init__(self, outcome: ParseOutcome):
+        super().__init__(f"{outcome.status}: {outcome.error}")
+        self.outcome = outcome
+
+
+class _Worker:
+    """One worker process and the supervisor's end of its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        # Not daemonic, so it may start an extraction pool; multiprocessing would join it at
+        # interpreter exit, so it is stopped first (before that join) or when dropped
+        self.process = context.Process(target=_worker_main, args=(child_conn,),
+                                       name="parse-sandbox", daemon=False)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        Finalize(self, _stop_worker, args=(self.conn, self.process), exitpriority=10)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        _stop_worker(self.conn, self.process)
+
+    def kill(self) -> None:
+        _kill_worker(self.conn, self.process)
+
+
+def _stop_worker(conn, process) -> None:
+    """Ask a worker to exit (it shuts its extraction pool down), killing it if it does not"""
+    try:
+        conn.send(None)
+    except (OSError, ValueError):
+        pass
+    process.join(STOP_GRACE_SECONDS)
+    _kill_worker(conn, process)
+
+
+def _kill_worker(conn, process) -> None:
+    """Kill a worker and its extraction pool"""
+    if process.is_alive():
+        pool = _descendants(process.pid)
+        process.kill()
+        for pid in pool:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+    process.join()
+    conn.close()
+
+
+class ParseSandbox:
+    """
+    Pool of supervised parser processes
+
+    Any PaperParser method can be run in a worker with run(); parse_pdf() and
+    quick_parse() mirror the PaperParser methods but raise ParseFailure
+    instead of hanging or exhausting memory. Workers are started with
+    "spawn" (not fork) so they never inherit the API process's threads and
+    locks; each is started on first use and kept for max_jobs_per_worker jobs.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 120.0, max_rss_mb: int = 2048,
+                 max_jobs_per_worker: int = 50):
+        """
+        Args:
+            workers: Worker processes (jobs beyond this wait for a free worker)
+            timeout: Wall-clock seconds per job before the worker is killed
+            max_rss_mb: Resident memory per worker before it is killed
+            max_jobs_per_worker: Jobs a worker runs before it is replaced
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.LifoQueue[Optional[_Worker]]" = queue.LifoQueue()
+        for _ in range(self.workers):
+            self._idle.put(None)  # slot for a worker started on first use
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def run(self, parser: PaperParser, method: str, *args) -> ParseOutcome:
+        """
+        Run parser.<method>(*args) in a worker (blocking)
+
+        Args:
+            parser: Parser whose configuration (cache, normalisation, ...) the worker uses
+            method: PaperParser method name
+            *args: Method arguments (picklable)
+
+        Returns:
+            ParseOutcome; the worker is replaced after anything but "ok" or "error"
+        """
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = _Worker(self._context)
+                self._count("workers_started")
+            worker.jobs += 1
+            outcome = self._supervise(worker, (parser, method, args))
+            if outcome.status not in ("ok", "error"):
+                worker.kill()
+                worker = None
+                self._count("workers_killed")
+            elif worker.jobs >= self.max_jobs_per_worker:
+                worker.stop()
+                worker = None
+                self._count("workers_recycled")
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise
+        finally:
+            self._idle.put(worker)
+
+        self._count("jobs", outcome.status)
+        if not outcome.ok:
+            print(f"⚠️  Sandboxed {method} failed ({outcome.status}): {outcome.error}")
+        return outcome
+
+    def parse_pdf(self, parser: PaperParser, pdf_path: str, paper_id: str,
+                  content_hash: Optional[str] = None) -> ParsedPaper:
+        """
+        Sandboxed PaperParser.parse_pdf; parse cache hits are served in-process
+
+        Raises:
+            ParseFailure: The worker failed, timed out, ran out of memory or crashed
+        """
+        if parser.cache is not None:
+            if content_hash is None:
+                content_hash = hash_file(pdf_path)
+            cached = parser.cache.get(content_hash, paper_id)
+            if cached is not None:
+                return cached
+        outcome = self.run(parser, "parse_pdf", str(pdf_path), paper_id, content_hash)
+        if not outcome.ok:
+            raise ParseFailure(outcome)
+        if parser.cache is not None:
+            parser.cache.record_parse(outcome.seconds)
+        return outcome.result
+
+    def quick_parse(self, parser: PaperParser, pdf_path: str, paper_id: str, max_pages: int = 2) -> ParsedPaper:
+        """
+        Sandboxed PaperParser.quick_parse
+
+        Raises:
+            ParseFailure: The worker failed, timed out, ran out of memory or crashed
+        """
+        outcome = self.run(parser, "quick_parse", str(pdf_path), paper_id, max_pages)
+        if not outcome.ok:
+            raise ParseFailure(outcome)
+        return outcome.result
+
+    def _supervise(self, worker: _Worker, job: tuple) -> ParseOutcome:
+        """Send a job and watch the worker's clock and memory until it replies, dies or is killed"""
+        start = time.perf_counter()
+        peak = 0.0
+
+        def failed(status: str, error: str) -> ParseOutcome:
+            return ParseOutcome(status, error=error, seconds=time.perf_counter() - start,
+                                peak_rss_mb=peak, worker_pid=worker.pid)
+
+        try:
+            worker.conn.send(job)
+        except (OSError, ValueError) as e:  # broken pipe: worker died while idle
+            return failed("crashed", f"worker unavailable: {e}")
+
+        while True:
+            if worker.conn.poll(POLL_INTERVAL):
+                try:
+                    status, result, error, seconds, worker_peak = worker.conn.recv()
+                except (EOFError, OSError):
+                    worker.process.join(STOP_GRACE_SECONDS)
+                    return failed("crashed", f"worker exited with code {worker.process.exitcode}")
+                peak = max(peak, worker_peak)
+                # Allocations between polls still show up in the worker's own peak
+                if peak > self.max_rss_mb:
+                    return failed("memory", f"peak RSS {peak:.0f} MB over the {self.max_rss_mb} MB limit")
+                return ParseOutcome(status, result=result, error=error, seconds=seconds,
+                                    peak_rss_mb=peak, worker_pid=worker.pid)
+
+            if not worker.process.is_alive():
+                return failed("crashed", f"worker exited with code {worker.process.exitcode}")
+            peak = max(peak, _tree_rss_mb(worker.pid))
+            if peak > self.max_rss_mb:
+                return failed("memory", f"RSS {peak:.0f} MB over the {self.max_rss_mb} MB limit")
+            if time.perf_counter() - start > self.timeout:
+                return failed("timeout", f"no result after {self.timeout:g}s")
+
+    def _count(self, *keys: str) -> None:
+        with self._lock:
+            self._counts.update(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Job outcomes and worker turnover since process start"""
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "jobs": counts.get("jobs", 0),
+            "ok": counts.get("ok", 0),
+            "failures": {status: counts.get(status, 0) for status in FAILURE_STATUSES},
+            "workers": self.workers,
+            "workers_started": counts.get("workers_started", 0),
+            "workers_killed": counts.get("workers_killed", 0),
+            "workers_recycled": counts.get("workers_recycled", 0)
+        }
+
+    def close(self) -> None:
+        """Stop the idle workers (a busy one finishes its job first); new ones start on next use"""
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in idle:
+            if worker is not None:
+                worker.stop()
+            self._idle.put(None)
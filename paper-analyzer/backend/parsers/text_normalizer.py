@@ -0,0 +1,186 @@
+"""
+Text Normalizer - Strip layout noise from extracted page text before it reaches the LLM
+
+Running headers/footers, page numbers, margin line numbers, ligatures,
+hyphenated line breaks and whitespace runs all eat into the extractors'
+fixed context budgets without carrying any content.
+"""
+import re
+from collections import Counter
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
+
+from .references import Reference, ReferenceSplitter
+
+# Non-empty lines at the top and bottom of each page checked for headers/footers
+EDGE_LINES = 3
+
+# An edge line is a running header/footer if it repeats on this many pages...
+REPEAT_MIN_PAGES = 3
+# ...and on at least this fraction of all pages
+REPEAT_MIN_FRACTION = 0.4
+
+# A page with this many bare 3-digit lines has review-style margin line numbers
+LINE_NUMBER_MIN_COUNT = 10
+
+LIGATURES = str.maketrans({
+    'ﬀ': 'ff', 'ﬁ': 'fi', 'ﬂ': 'fl', 'ﬃ': 'ffi',
+    'ﬄ': 'ffl', 'ﬅ': 'st', 'ﬆ': 'st'
+})
+
+PAGE_NUMBER_PATTERN = re.compile(r'^(?:page\s+)?\d{1,4}(?:\s*(?:of|/)\s*\d{1,4})?$', re.IGNORECASE)
+LINE_NUMBER_PATTERN = re.compile(r'^\d{3}$')
+ARXIV_STAMP_PATTERN = re.compile(r'^arXiv:\d{4}\.\d{4,5}(?:v\d+)?\s+\[')
+HYPHEN_BREAK_PATTERN = re.compile(r'(\w)-\n(?=[a-z])')
+SPACE_RUN_PATTERN = re.compile(r'[ \t\u00a0]+')
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+DIGITS_PATTERN = re.compile(r'\d+')
+
+# Rough BPE approximation: up to 4 word characters, or one symbol, per token
+TOKEN_ESTIMATE_PATTERN = re.compile(r'\w{1,4}|[^\w\s]|\n+| {2,}')
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (no tokenizer dependency)"""
+    return sum(1 for _ in TOKEN_ESTIMATE_PATTERN.finditer(text))
+
+
+def _line_key(line: str) -> str:
+    """Header/footer identity: case and page numbers ignored"""
+    return DIGITS_PATTERN.sub('#', line.lower())
+
+
+def _edge_indices(lines: list) -> Set[int]:
+    """Indices of the first and last EDGE_LINES non-empty lines"""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    return set(non_empty[:EDGE_LINES] + non_empty[-EDGE_LINES:])
+
+
+class TextNormalizer:
+    """
+    Two-step page cleaner
+
+    observe_page() is called for every page as it is extracted (it only keeps
+    a counter of edge lines); clean_pages() then streams the cleaned text once
+    the repeated headers/footers are known, with the bibliography split off
+    into `references`.
+    """
+
+    def __init__(self, split_references: bool = True):
+        """
+        Args:
+            split_references: Move the bibliography out of the text into `references`
+        """
+        self._edge_counts: Counter = Counter()
+        self._num_pages = 0
+        self._repeated: Optional[Set[str]] = None
+        self._stats = Counter()
+        self._splitter = ReferenceSplitter() if split_references else None
+
+    @property
+    def references(self) -> List[Reference]:
+        """Bibliography entries found by clean_pages()"""
+        return self._splitter.references if self._splitter is not None else []
+
+    def observe_page(self, page_text: str) -> None:
+        """Record the candidate header/footer lines of one page"""
+        lines = page_text.split('\n')
+        keys = {_line_key(lines[i].strip()) for i in _edge_indices(lines)}
+        self._edge_counts.update(keys)
+        self._num_pages += 1
+
+    def repeated_lines(self) -> Set[str]:
+        """Keys of edge lines that repeat across enough pages to be headers/footers"""
+        if self._repeated is None:
+            threshold = max(REPEAT_MIN_PAGES, REPEAT_MIN_FRACTION * self._num_pages)
+            self._repeated = {key for key, count in self._edge_counts.items() if count >= threshold}
+        return self._repeated
+
+    def clean_pages(self, page_texts: Iterable[str]) -> Iterator[str]:
+        """
+        Clean pages in order
+
+        Args:
+            page_texts: The same pages passed to observe_page()
+
+        Yields:
+            Cleaned, non-empty text chunks to be joined with newlines; a word
+            hyphenated across a page break is rejoined, merging those pages
+            into one chunk
+        """
+        repeated = self.repeated_lines()
+        pending: Optional[str] = None
+        for page_text in page_texts:
+            self._stats["raw_chars"] += len(page_text)
+            self._stats["raw_tokens"] += estimate_tokens(page_text)
+            cleaned = self._clean_page(page_text, repeated)
+            if pending is not None:
+                if pending.endswith('-') and pending[-2:-1].isalnum() and cleaned[:1].islower():
+                    self._stats["hyphens_joined"] += 1
+                    pending = pending[:-1] + cleaned
+                    continue
+                yield from self._emit(pending)
+            pending = cleaned
+        if pending is not None:
+            yield from self._emit(pending)
+        if self._splitter is not None:
+            yield from self._emit(self._splitter.finish(), split=False)
+
+    def _emit(self, chunk: str, split: bool = True) -> Iterator[str]:
+        if split and self._splitter is not None:
+            chunk = self._splitter.feed(chunk)
+        if not chunk:
+            return
+        self._stats["chunks"] += 1
+        self._stats["clean_chars"] += len(chunk)
+        self._stats["clean_tokens"] += estimate_tokens(chunk)
+        yield chunk
+
+    def _clean_page(self, page_text: str, repeated: Set[str]) -> str:
+        lines = page_text.translate(LIGATURES).split('\n')
+        edges = _edge_indices(lines)
+        strip_line_numbers = sum(1 for line in lines if LINE_NUMBER_PATTERN.match(line.strip())) >= LINE_NUMBER_MIN_COUNT
+
+        kept = []
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if ARXIV_STAMP_PATTERN.match(stripped):
+                self._stats["stamps_removed"] += 1
+                continue
+            if i in edges and stripped:
+                if PAGE_NUMBER_PATTERN.match(stripped):
+                    self._stats["page_numbers_removed"] += 1
+                    continue
+                if _line_key(stripped) in repeated:
+                    self._stats["header_footer_lines_removed"] += 1
+                    continue
+            if strip_line_numbers and LINE_NUMBER_PATTERN.match(stripped):
+                self._stats["line_numbers_removed"] += 1
+                continue
+            kept.append(SPACE_RUN_PATTERN.sub(' ', stripped))
+
+        text = '\n'.join(kept)
+        text, joined = HYPHEN_BREAK_PATTERN.subn(r'\1', text)
+        self._stats["hyphens_joined"] += joined
+        return BLANK_LINES_PATTERN.sub('\n\n', text).strip()
+
+    def report(self) -> Dict[str, Any]:
+        """Character and estimated-token reduction after clean_pages() has run"""
+        stats = self._stats
+        # Page/chunk texts are joined with one newline each
+        raw_chars = stats["raw_chars"] + max(self._num_pages - 1, 0)
+        clean_chars = stats["clean_chars"] + max(stats["chunks"] - 1, 0)
+        return {
+            "raw_chars": raw_chars,
+            "clean_chars": clean_chars,
+            "char_reduction": round(1 - clean_chars / raw_chars, 4) if raw_chars else 0.0,
+            "raw_tokens_est": stats["raw_tokens"],
+            "clean_tokens_est": stats["clean_tokens"],
+            "token_reduction": round(1 - stats["clean_tokens"] / stats["raw_tokens"], 4) if stats["raw_tokens"] else 0.0,
+            "header_footer_lines_removed": stats["header_footer_lines_removed"],
+            "page_numbers_removed": stats["page_numbers_removed"],
+            "line_numbers_removed": stats["line_numbers_removed"],
+            "stamps_removed": stats["stamps_removed"],
+            "hyphens_joined": stats["hyphens_joined"],
+            "references": len(self.references),
+            "reference_chars_removed": self._splitter.removed_chars if self._splitter is not None else 0
+        }
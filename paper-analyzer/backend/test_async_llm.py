@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the asyncio LLM client API and async extraction
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from urllib.parse import unquote
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import boto3
+from config import settings
+from extractors import ExperimentExtractor
+from extractors.deepseek_client import DeepSeekClient
+from extractors.llm_client import BedrockLLMClient
+from parsers import ParsedPaper
+from test_llm_pool import MockLLMServer
+
+
+def test_deepseek_async_api():
+    """complete_async / complete_json_async / stream_async over one pooled connection"""
+    with MockLLMServer() as server:
+        client = DeepSeekClient("test-key", api_url=server.url)
+
+        async def run():
+            text = await client.complete_async("hi")
+            parsed = await client.complete_json_async("Output only JSON")
+            chunks = [chunk async for chunk in client.stream_async("stream please")]
+            await client.aclose()
+            return text, parsed, chunks
+
+        text, parsed, chunks = asyncio.run(run())
+        assert text == '{"ok": true}' and parsed == {"ok": True}
+        assert chunks == ["pooled ", "reply"]
+        stats = client.stats()
+        assert server.connections == 1 and stats["connections_opened"] == 1
+        assert stats["requests"] == 3 and stats["connections_reused"] == 2, stats
+        print(f"✓ Async API over one connection: {stats}")
+
+
+def test_concurrent_calls_overlap():
+    """Concurrent calls run side by side on one event loop"""
+    with MockLLMServer(response_delay=0.2) as server:
+        client = DeepSeekClient("test-key", api_url=server.url, pool_maxsize=16)
+
+        async def run():
+            start = time.perf_counter()
+            results = await asyncio.gather(*(client.complete_json_async("Output only JSON") for _ in range(10)))
+            elapsed = time.perf_counter() - start
+            await client.aclose()
+            return results, elapsed
+
+        results, elapsed = asyncio.run(run())
+        assert results == [{"ok": True}] * 10
+        assert elapsed < 1.0, elapsed  # 10 x 0.2 s one after another would take 2 s
+        print(f"✓ 10 concurrent calls in {elapsed:.2f}s")
+
+
+def test_extract_async_keeps_loop_responsive():
+    """extract_async matches extract and lets other tasks run while the LLM answers"""
+    with MockLLMServer(response_delay=0.3) as server:
+        client = DeepSeekClient("test-key", api_url=server.url)
+        extractor = ExperimentExtractor(llm_client=client)
+        paper = ParsedPaper(paper_id="p", title="T", authors=["A"], abstract="", full_text="Body",
+                            sections=[], num_pages=1)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            items = await extractor.extract_async(paper)
+            task.cancel()
+            await client.aclose()
+            return items, ticks
+
+        items, ticks = asyncio.run(run())
+        assert items == extractor.extract(paper) == []
+        assert ticks >= 10, ticks
+        print(f"✓ Event loop ticked {ticks} times during one extraction")
+
+
+def test_bedrock_async_signed_request():
+    """Bedrock complete_async sends a SigV4-signed InvokeModel request"""
+    with MockLLMServer() as server:
+        client = BedrockLLMClient()
+        client.mock_mode = False
+        client.session = boto3.Session(aws_access_key_id="AKIDTEST", aws_secret_access_key="secret",
+                                       region_name="us-east-1")
+        client.bedrock_runtime = client.session.client("bedrock-runtime", endpoint_url=server.base_url)
+
+        async def run():
+            result = await client.complete_json_async("Output only JSON", "system")
+            await client.aclose()
+            return result
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert unquote(server.last_path) == f"/model/{settings.bedrock_model_id}/invoke"
+        authorization = server.last_headers["Authorization"]
+        assert authorization.startswith("AWS4-HMAC-SHA256 Credential=AKIDTEST/")
+        assert "/us-east-1/bedrock/aws4_request" in authorization
+        assert not client.mock_mode
+        print("✓ Bedrock async request signed with SigV4")
+
+
+if __name__ == "__main__":
+    test_deepseek_async_api()
+    test_concurrent_calls_overlap()
+    test_extract_async_keeps_loop_responsive()
+    test_bedrock_async_signed_request()
+    print("\n✓ All async LLM tests passed")
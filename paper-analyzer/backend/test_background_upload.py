@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test ?background=true uploads: 202 + job polling
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+import api.app as app_module
+from config import settings
+from test_paper_cache import make_pdf
+from test_upload_dedup import use_temp_data_dirs
+
+
+def test_background_upload_returns_job():
+    """Upload returns 202 immediately and the job finishes with the parsed paper"""
+    original = (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+                app_module._paper_index, app_module._paper_parser)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        use_temp_data_dirs(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path, pages=3)
+
+        try:
+            # Context manager keeps one event loop alive for the background task
+            with TestClient(app_module.app) as client:
+                with open(pdf_path, "rb") as f:
+                    response = client.post("/api/papers?background=true",
+                                           files={"file": ("paper.pdf", f, "application/pdf")})
+                assert response.status_code == 202
+                accepted = response.json()
+                assert accepted["status_url"] == f"/api/jobs/{accepted['job_id']}"
+
+                deadline = time.time() + 30
+                while True:
+                    job = client.get(accepted["status_url"]).json()
+                    if job["status"] in ("processed", "failed") or time.time() > deadline:
+                        break
+                    time.sleep(0.05)
+
+                assert job["status"] == "processed", job
+                assert job["result"]["paper_id"] == accepted["paper_id"]
+                assert job["result"]["num_pages"] == 3
+                assert client.get("/api/jobs/missing").status_code == 404
+                print(f"✓ Background job {job['job_id']} processed")
+        finally:
+            (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+             app_module._paper_index, app_module._paper_parser) = original
+
+
+def test_finished_jobs_expire():
+    """Finished jobs are dropped after the TTL or beyond the cap; queued and running ones stay"""
+    original = (dict(app_module._parse_jobs), settings.parse_job_ttl_seconds, settings.parse_job_max_finished)
+    try:
+        now = time.time()
+        app_module._parse_jobs.clear()
+        app_module._parse_jobs.update({
+            "old": {"job_id": "old", "status": "processed", "finished_at": now - 120},
+            "first": {"job_id": "first", "status": "failed", "finished_at": now - 30},
+            "second": {"job_id": "second", "status": "processed", "finished_at": now - 20},
+            "third": {"job_id": "third", "status": "processed", "finished_at": now - 10},
+            "running": {"job_id": "running", "status": "running"}
+        })
+        settings.parse_job_ttl_seconds, settings.parse_job_max_finished = 60, 2
+        app_module.prune_parse_jobs()
+        assert set(app_module._parse_jobs) == {"second", "third", "running"}
+        with TestClient(app_module.app) as client:
+            assert client.get("/api/jobs/second").status_code == 200
+            settings.parse_job_ttl_seconds = 15
+            assert client.get("/api/jobs/second").status_code == 404
+            assert client.get("/api/jobs/running").json()["status"] == "running"
+        print("✓ Finished jobs expire, running jobs kept")
+    finally:
+        app_module._parse_jobs.clear()
+        app_module._parse_jobs.update(original[0])
+        settings.parse_job_ttl_seconds, settings.parse_job_max_finished = original[1:]
+
+
+if __name__ == "__main__":
+    test_background_upload_returns_job()
+    test_finished_jobs_expire()
+    print("\n✓ All background upload tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test BedrockLLMClient streaming over InvokeModelWithResponseStream
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import boto3
+from botocore.config import Config
+from config import settings
+from extractors.deepseek_client import DeepSeekClient
+from extractors.llm_client import BedrockLLMClient
+from extractors.retry import LLMError
+from test_llm_pool import MockLLMServer
+from test_llm_retry import fast_policy
+from visualization_engine import VisualizationEngine
+
+# One model id per family _request_body handles
+MODEL_IDS = {
+    "anthropic": "anthropic.claude-3-5-sonnet-20240620-v1:0",
+    "llama": "meta.llama3-70b-instruct-v1:0",
+    "generic": "deepseek-ai.deepseek-v3"
+}
+
+WORDS = ("<html>", "<body>", "streamed ", "reply", "</body></html>")
+
+
+def live_client(server: MockLLMServer) -> BedrockLLMClient:
+    """BedrockLLMClient pointed at the mock server with test credentials"""
+    client = BedrockLLMClient(retry=fast_policy())
+    client.mock_mode = False
+    client.session = boto3.Session(aws_access_key_id="AKIDTEST", aws_secret_access_key="secret",
+                                   region_name="us-east-1")
+    client.bedrock_runtime = client.session.client(
+        "bedrock-runtime", endpoint_url=server.base_url,
+        config=Config(retries={"total_max_attempts": 1, "mode": "standard"}))
+    return client
+
+
+def stream_both(client: BedrockLLMClient) -> tuple:
+    """Chunks of complete_streaming and of stream_async for the same prompt"""
+    async def collect():
+        chunks = [chunk async for chunk in client.stream_async("make html")]
+        await client.aclose()
+        return chunks
+    return list(client.complete_streaming("make html")), asyncio.run(collect())
+
+
+def test_each_model_family_streams():
+    """Anthropic, Llama and generic response streams yield the same chunks as DeepSeek"""
+    with MockLLMServer(stream_chunks=WORDS) as server:
+        deepseek = DeepSeekClient("test-key", api_url=server.url)
+        expected = list(deepseek.complete_streaming("make html"))
+        deepseek.close()
+        assert expected == list(WORDS)
+
+        model_id = settings.bedrock_model_id
+        try:
+            for family, settings.bedrock_model_id in MODEL_IDS.items():
+                sync_chunks, async_chunks = stream_both(live_client(server))
+                assert sync_chunks == expected, (family, sync_chunks)
+                assert async_chunks == expected, (family, async_chunks)
+                assert server.last_path.endswith("/invoke-with-response-stream")
+                print(f"✓ {family}: {len(sync_chunks)} chunks, sync and async")
+        finally:
+            settings.bedrock_model_id = model_id
+
+
+def test_stream_exceptions_retried_before_first_chunk():
+    """Throttling (HTTP 429 or an exception event) is retried; permanent errors are raised"""
+    with MockLLMServer(stream_chunks=WORDS, failures=[429, "throttlingException"]) as server:
+        client = live_client(server)
+        assert "".join(client.complete_streaming("make html")) == "".join(WORDS)
+        assert server.requests == 3
+
+        async def run():
+            server.failures = ["throttlingException", 503]
+            chunks = [chunk async for chunk in client.stream_async("make html")]
+            server.failures = ["validationException"]
+            try:
+                async for _ in client.stream_async("make html"):
+                    pass
+                assert False, "expected LLMError"
+            except LLMError as e:
+                assert e.code == "ValidationException"
+            await client.aclose()
+            return chunks
+
+        assert "".join(asyncio.run(run())) == "".join(WORDS)
+        stats = client.retry_stats()
+        assert stats["retries"] == 4 and stats["failed_permanent"] == 1, stats
+        print(f"✓ Stream exceptions retried: {stats}")
+
+
+def test_visualization_engine_streams_with_bedrock():
+    """_generate_html_streaming takes the streaming path instead of an 8192-token complete()"""
+    with MockLLMServer(stream_chunks=WORDS) as server:
+        client = live_client(server)
+        html = VisualizationEngine(client)._generate_html_streaming("make html")
+        assert html == "".join(WORDS)
+        assert server.last_path.endswith("/invoke-with-response-stream") and server.requests == 1
+        print("✓ VisualizationEngine streamed from Bedrock")
+
+
+if __name__ == "__main__":
+    test_each_model_family_streams()
+    test_stream_exceptions_retried_before_first_chunk()
+    test_visualization_engine_streams_with_bedrock()
+    print("\n✓ All Bedrock streaming tests passed")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test bulk ingest: deduplication, failures and resuming
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ingest import BulkIngester, PaperIndex
+from test_paper_cache import make_pdf
+
+
+def make_ingester(root: Path) -> BulkIngester:
+    return BulkIngester(
+        upload_dir=root / "uploads",
+        extracted_dir=root / "extracted",
+        cache_dir=root / "cache",
+        index=PaperIndex(root / "extracted" / "paper_index.json"),
+        workers=2
+    )
+
+
+def test_bulk_ingest_dedup_and_resume():
+    """Duplicates are detected by content; a re-run skips everything"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        src = tmp / "src"
+        src.mkdir()
+        make_pdf(src / "a.pdf", pages=2)
+        make_pdf(src / "b.pdf", pages=4)
+        shutil.copyfile(src / "a.pdf", src / "a_copy.pdf")
+        (src / "broken.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+
+        pdfs = sorted(src.glob("*.pdf"))
+        progress = []
+        summary = make_ingester(tmp).ingest(pdfs, on_progress=lambda d, t, r: progress.append(d))
+
+        print(f"✓ First run: {summary['ingested']} ingested, {summary['duplicates']} duplicates, "
+              f"{summary['failed']} failed ({summary['papers_per_minute']} papers/minute)")
+        assert summary["ingested"] == 2
+        assert summary["duplicates"] == 1
+        assert summary["failed"] == 1
+        assert progress == [1, 2, 3, 4]
+
+        by_source = {Path(r["source"]).name: r for r in summary["results"]}
+        assert by_source["a_copy.pdf"]["paper_id"] == by_source["a.pdf"]["paper_id"]
+        assert len(list((tmp / "uploads").glob("*.pdf"))) == 2
+        assert len(list((tmp / "extracted").glob("*_paper.json"))) == 2
+
+        # Fresh ingester (as after a crash/restart) resumes from the index
+        summary = make_ingester(tmp).ingest(pdfs)
+        assert summary["ingested"] == 0
+        assert summary["duplicates"] == 3
+        print("✓ Second run skipped every ingested file")
+
+
+if __name__ == "__main__":
+    test_bulk_ingest_dedup_and_resume()
+    print("\n✓ All bulk ingest tests passed")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test lazy startup: no heavy imports or network I/O before the first LLM call, readiness via /health
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+import api.app as app_module
+from config import settings
+from extractors import llm_client
+from extractors.deepseek_client import DeepSeekClient
+from extractors.llm_client import BedrockLLMClient
+from test_llm_pool import MockLLMServer
+
+BACKEND_DIR = Path(__file__).parent
+
+# Imports the app, builds the global Bedrock client, and reports what got loaded; sockets refuse to connect
+STARTUP_SCRIPT = """
+import json, socket, sys
+sys.path.insert(0, {backend!r})
+
+def no_network(*args, **kwargs):
+    raise AssertionError("network I/O during startup")
+socket.socket.connect = no_network
+
+import api.app
+from extractors import get_llm_client
+client = get_llm_client()
+print(json.dumps({{"loaded": [name for name in ("boto3", "botocore", "fitz", "pymupdf", "requests")
+                              if name in sys.modules],
+                  "mock_mode": client.mock_mode}}))
+"""
+
+
+def test_startup_is_lazy():
+    """Importing the app and building the client loads neither boto3 nor PyMuPDF and opens no connection"""
+    env = {**os.environ, "LLM_PROVIDER": "bedrock", "LLM_CACHE_ENABLED": "false",
+           "AWS_ACCESS_KEY_ID": "AKIDTEST", "AWS_SECRET_ACCESS_KEY": "secret"}
+    with tempfile.TemporaryDirectory() as tmp:
+        result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT.format(backend=str(BACKEND_DIR))],
+                                cwd=tmp, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"loaded": [], "mock_mode": False}, report
+    print("✓ App import and client construction: no boto3, PyMuPDF or requests, no network")
+
+
+def test_bedrock_client_built_on_first_use():
+    """The boto3 runtime client is built on first use; mock mode only when that fails"""
+    client = BedrockLLMClient()
+    assert client._bedrock_runtime is None and client.session is None
+    runtime = client.bedrock_runtime
+    assert runtime is not None and client.bedrock_runtime is runtime and not client.mock_mode
+    assert runtime.meta.service_model.service_name == "bedrock-runtime"
+
+    region = settings.aws_region
+    try:
+        settings.aws_region = "not a region!"
+        broken = BedrockLLMClient()
+        assert broken.bedrock_runtime is None and broken.mock_mode
+        assert broken.complete("hello")  # mock reply
+        probe = broken.probe()
+        assert probe["ready"] is False and "mock mode" in probe["detail"]
+    finally:
+        settings.aws_region = region
+    print("✓ Bedrock client built lazily, mock mode on failure")
+
+
+def health_after_probe(client) -> dict:
+    """/health once the startup probe has finished against client"""
+    async def run():
+        async with app_module.lifespan(app_module.app):
+            await asyncio.wait_for(app_module._readiness_task, 10)
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                return (await http.get("/health")).json()
+
+    original = (llm_client._llm_client, settings.llm_readiness_probe, settings.llm_readiness_retry_seconds,
+                app_module._llm_readiness)
+    try:
+        llm_client._llm_client = client
+        settings.llm_readiness_probe, settings.llm_readiness_retry_seconds = True, 0
+        return asyncio.run(run())
+    finally:
+        (llm_client._llm_client, settings.llm_readiness_probe, settings.llm_readiness_retry_seconds,
+         app_module._llm_readiness) = original
+
+
+def test_health_reports_readiness():
+    """The background probe's result shows up in /health; a dead provider is unavailable, not an error"""
+    with MockLLMServer() as server:
+        health = health_after_probe(DeepSeekClient("test-key", api_url=server.url))
+        assert server.last_path == "/v1/models"
+    assert health["status"] == "healthy"
+    assert health["llm_readiness"]["status"] == "ready", health
+
+    dead_url = server.url  # the server has shut down
+    health = health_after_probe(DeepSeekClient("test-key", api_url=dead_url))
+    readiness = health["llm_readiness"]
+    assert health["status"] == "healthy" and readiness["status"] == "unavailable", health
+    assert "ConnectionError" in readiness["detail"]
+    print(f"✓ /health readiness: ready, then unavailable ({readiness['detail'][:40]}...)")
+
+
+if __name__ == "__main__":
+    test_startup_is_lazy()
+    test_bedrock_client_built_on_first_use()
+    test_health_reports_readiness()
+    print("\n✓ All cold start tests passed")
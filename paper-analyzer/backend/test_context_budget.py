@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test token-based prompt budgets for the extractors
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from extractors.claims_extractor import ClaimsExtractor
+from extractors.context_budget import DEFAULT_CONTEXT_TOKENS, ContextBudget, context_window
+from parsers import DiskText, ParsedPaper
+from parsers.disk_text import DiskTextWriter
+from parsers.text_normalizer import estimate_tokens
+
+
+def make_paper_text(sections: int = 40, paragraphs: int = 4) -> str:
+    """Numbered sections of multi-sentence paragraphs separated by blank lines"""
+    parts = []
+    for s in range(1, sections + 1):
+        parts.append(f"{s} Section Heading {s}")
+        for p in range(paragraphs):
+            parts.append(" ".join(f"Sentence {i} of paragraph {p} in section {s} reports a result."
+                                  for i in range(6)))
+    return "\n\n".join(parts)
+
+
+class RecordingLLM:
+    def __init__(self, model: str):
+        self.model = model
+
+    def complete_json(self, prompt, system_prompt=None):
+        self.prompt = prompt
+        return {"claims": []}
+
+
+def test_context_windows():
+    """Known model families get their window; unknown ones the default; the setting overrides"""
+    assert context_window("anthropic.claude-3-5-sonnet-20240620-v1:0") == 200000
+    assert context_window("meta.llama3-1-70b-instruct-v1:0") == 128000
+    assert context_window("meta.llama3-8b-instruct-v1:0") == 8192
+    assert context_window("deepseek-chat") == 64000
+    assert context_window("some.new-model") == DEFAULT_CONTEXT_TOKENS
+    original = settings.llm_context_tokens
+    try:
+        settings.llm_context_tokens = 16000
+        assert context_window("anthropic.claude-3-5-sonnet-20240620-v1:0") == 16000
+    finally:
+        settings.llm_context_tokens = original
+
+    budget = ContextBudget(8192, max_output_tokens=4096)
+    assert budget.input_tokens == int(8192 * 0.9) - 4096
+    assert budget.available("one two three", None) == budget.input_tokens - estimate_tokens("one two three")
+    assert ContextBudget(4096, max_output_tokens=8192).input_tokens == 0
+    print("✓ Context windows and input allowances")
+
+
+def test_fit_cuts_at_boundaries():
+    """Text over budget is cut at a section or paragraph boundary, within the allowance"""
+    text = make_paper_text()
+    budget = ContextBudget(200000)
+    assert budget.fit(text, estimate_tokens(text)) == text
+
+    for max_tokens in (500, 2000, 5000):
+        cut = budget.fit(text, max_tokens)
+        assert text.startswith(cut)
+        assert max_tokens * 0.75 <= estimate_tokens(cut) <= max_tokens, (max_tokens, estimate_tokens(cut))
+        # Ends at the end of a paragraph: the next part starts after a blank line
+        assert text[len(cut):].startswith("\n\n"), repr(text[len(cut):len(cut) + 20])
+
+    # One long unbroken paragraph falls back to sentence ends, then words
+    sentence = "This sentence is about ten tokens long. "
+    cut = budget.fit(sentence * 200, 105)
+    assert cut.endswith("long.") and estimate_tokens(cut) <= 105
+    cut = budget.fit("word " * 1000, 50)
+    assert cut.endswith("word") and estimate_tokens(cut) <= 50
+    print("✓ Cuts land on section, paragraph and sentence boundaries")
+
+
+def test_fit_reads_disk_text_prefix_only():
+    """A DiskText is sliced to the budget rather than read whole"""
+    text = make_paper_text(sections=400)
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DiskTextWriter(Path(tmp) / "paper.txt")
+        writer.write(text)
+        disk_text = writer.close()
+        assert isinstance(disk_text, DiskText)
+        cut = ContextBudget(200000).fit(disk_text, 1000)
+        assert text.startswith(cut) and estimate_tokens(cut) <= 1000
+        print("✓ DiskText cut without reading the whole file")
+
+
+def test_extractor_prompt_follows_model_window():
+    """The same paper fills a large window and is cut for a small one, never past the budget"""
+    paper = ParsedPaper(paper_id="p1", title="Budgeted Paper", full_text=make_paper_text(sections=120))
+    total = estimate_tokens(paper.llm_text)
+    prompts = {}
+    for model in ("anthropic.claude-3-5-sonnet-20240620-v1:0", "meta.llama3-8b-instruct-v1:0"):
+        llm = RecordingLLM(model)
+        extractor = ClaimsExtractor.__new__(ClaimsExtractor)
+        extractor.llm = llm
+        extractor.extract(paper)
+        budget = ContextBudget.for_client(llm, ClaimsExtractor.MAX_OUTPUT_TOKENS)
+        used = estimate_tokens(ClaimsExtractor.SYSTEM_PROMPT) + estimate_tokens(llm.prompt)
+        assert used <= budget.input_tokens, (model, used, budget.input_tokens)
+        prompts[model] = llm.prompt
+
+    assert str(paper.llm_text) in prompts["anthropic.claude-3-5-sonnet-20240620-v1:0"]
+    small = prompts["meta.llama3-8b-instruct-v1:0"]
+    assert "1 Section Heading 1" in small and "120 Section Heading 120" not in small
+    print(f"✓ {total} token paper: whole for 200k, {estimate_tokens(small)} tokens for 8k")
+
+
+if __name__ == "__main__":
+    test_context_windows()
+    test_fit_cuts_at_boundaries()
+    test_fit_reads_disk_text_prefix_only()
+    test_extractor_prompt_follows_model_window()
+    print("\n✓ All context budget tests passed")
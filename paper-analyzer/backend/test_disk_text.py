@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped DiskText full_text mode
+"""
+
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers import PaperParser, ParsedPaperCache, DiskText
+from parsers.disk_text import DiskTextWriter, CHECKPOINT_CHARS
+from test_paper_cache import make_pdf
+
+
+def test_disk_text_slicing():
+    """Slices match str slicing, including across checkpoints and multi-byte chars"""
+    text = ("Attention é 注意 🙂 " * 2000)[:CHECKPOINT_CHARS * 3 + 17]
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DiskTextWriter(Path(tmp) / "t.txt")
+        for i in range(0, len(text), 997):  # uneven pieces, like pages
+            writer.write(text[i:i + 997])
+        disk = writer.close()
+
+        assert len(disk) == len(text)
+        assert str(disk) == text
+        for key in (slice(None, 25000), slice(0, 0), slice(CHECKPOINT_CHARS - 3, CHECKPOINT_CHARS + 3),
+                    slice(CHECKPOINT_CHARS, 2 * CHECKPOINT_CHARS), slice(-100, None), slice(5, 50, 3)):
+            assert disk[key] == text[key], key
+        assert disk[CHECKPOINT_CHARS] == text[CHECKPOINT_CHARS]
+        assert disk[-1] == text[-1]
+        assert pickle.loads(pickle.dumps(disk)) == text
+        disk.close()
+        print(f"✓ DiskText slices match str over {len(text)} chars")
+
+
+def test_parse_with_disk_text():
+    """disk_text mode yields the same paper, backed by a file in the cache directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path, pages=5)
+
+        in_memory = PaperParser().parse_pdf(str(pdf_path), "mem")
+        parser = PaperParser(cache=ParsedPaperCache(tmp / "cache"), disk_text=True)
+        on_disk = parser.parse_pdf(str(pdf_path), "disk")
+
+        assert isinstance(on_disk.full_text, DiskText)
+        assert on_disk.full_text.path.parent == tmp / "cache"
+        assert on_disk.full_text == in_memory.full_text
+        assert on_disk.full_text[:25000] == in_memory.full_text[:25000]
+        assert on_disk.abstract == in_memory.abstract
+        assert on_disk.sections == in_memory.sections
+        assert on_disk.slice_pages(1, 3) == in_memory.slice_pages(1, 3)
+        assert not list((tmp / "cache").glob("*.tmp"))
+
+        # Cache hit reopens the same file
+        again = parser.parse_pdf(str(pdf_path), "disk-2")
+        assert isinstance(again.full_text, DiskText)
+        assert again.full_text == in_memory.full_text
+        print("✓ disk_text parse matches the in-memory parse")
+
+
+if __name__ == "__main__":
+    test_disk_text_slicing()
+    test_parse_with_disk_text()
+    print("\n✓ All disk text tests passed")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test the incremental JSON decoder and streamed extraction
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from extractors import ExperimentExtractor
+from extractors.deepseek_client import DeepSeekClient
+from extractors.json_stream import JSONStreamParser, parse_partial_json
+from parsers import ParsedPaper
+from test_llm_pool import MockLLMServer
+
+
+def make_experiments(count: int) -> dict:
+    """Experiments reply nested deeper than the old regex fallback could follow"""
+    return {"experiments": [{
+        "experiment_id": f"exp_{i}",
+        "name": f"Experiment {i}",
+        "description": 'Uses "quotes", {braces} and [brackets] in text',
+        "task": "classification",
+        "results": [{"method": "Ours", "metrics": {"accuracy": {"value": 0.9 + i / 100, "std": [0.01, {"runs": 3}]}}}]
+    } for i in range(count)]}
+
+
+def test_items_arrive_as_they_close():
+    """Each array item is returned by the feed() call that completes it"""
+    document = make_experiments(3)
+    text = "```json\n" + json.dumps(document, indent=2) + "\n```"
+    parser = JSONStreamParser()
+    seen = []
+    for i in range(0, len(text), 7):
+        for key, item in parser.feed(text[i:i + 7]):
+            seen.append((i, key, item["experiment_id"]))
+    assert [s[1:] for s in seen] == [("experiments", f"exp_{i}") for i in range(3)]
+    assert seen[0][0] < len(text) // 2  # the first item was out long before the reply ended
+    assert parser.result() == document
+    assert [item for _, item in JSONStreamParser().feed('[1, "two", {"3": [3]}, null]')] == [1, "two", {"3": [3]}, None]
+    print(f"✓ Items at offsets {[s[0] for s in seen]} of {len(text)}")
+
+
+def test_truncated_reply_recovered():
+    """Every prefix of a reply decodes; complete items survive the cut"""
+    text = json.dumps(make_experiments(4))
+    for cut in range(1, len(text)):
+        parse_partial_json(text[:cut])
+    recovered = parse_partial_json(text[:int(len(text) * 0.8)])
+    assert recovered["experiments"][:3] == make_experiments(3)["experiments"]
+    assert parse_partial_json('Sure! {"a": 1, "b": [1, 2') == {"a": 1, "b": [1]}
+    assert parse_partial_json('{"a": 1, "b"') == {"a": 1}
+    # An item cut off mid-way is dropped rather than saved as an empty or partial record
+    assert parse_partial_json('[{"a":1},{"b":"q') == [{"a": 1}]
+    assert parse_partial_json('{"items": [{"a": 1}, {"b": [1, 2], "c": 3') == {"items": [{"a": 1}]}
+    assert parse_partial_json('{"items": [{"a": 1}, {') == {"items": [{"a": 1}]}
+    print("✓ Truncated replies recovered")
+
+
+def test_brackets_in_prose_before_document():
+    """Bracketed prose before the JSON is skipped, in whole and in streamed replies"""
+    assert parse_partial_json('Sure, here [is] the json: {"x": [1]}') == {"x": [1]}
+    assert parse_partial_json('Fill in {name} (see [Smith et al.]): [{"a": 1}, {"b": "q') == [{"a": 1}]
+    text = 'Sure, here [is] the {json}: ' + json.dumps(make_experiments(2))
+    parser = JSONStreamParser()
+    items = [(key, item["experiment_id"]) for i in range(0, len(text), 5) for key, item in parser.feed(text[i:i + 5])]
+    assert items == [("experiments", "exp_0"), ("experiments", "exp_1")]
+    assert parser.result() == make_experiments(2)
+    assert "error" not in DeepSeekClient("test-key")._parse_json('Sure, here [is] the json: {"x": [1]}')
+    print("✓ Brackets in prose skipped")
+
+
+def test_client_fallback_handles_deep_nesting():
+    """complete_json's fallback recovers nested and truncated replies the regex could not"""
+    client = DeepSeekClient("test-key")
+    document = make_experiments(2)
+    assert client._parse_json("Here you go:\n" + json.dumps(document) + "\nHope this helps!") == document
+    truncated = client._parse_json(json.dumps(document)[:-40])
+    assert truncated["experiments"][0] == document["experiments"][0]
+    assert "error" in client._parse_json("no json at all")
+    print("✓ Fallback parses deeply nested replies")
+
+
+def test_extract_stream_yields_items_early():
+    """extract_stream()/extract_stream_async() yield Experiment objects while the reply streams"""
+    text = json.dumps(make_experiments(3))
+    chunks = [text[i:i + 20] for i in range(0, len(text), 20)]
+    with MockLLMServer(stream_chunks=chunks) as server:
+        extractor = ExperimentExtractor(llm_client=DeepSeekClient("test-key", api_url=server.url))
+        paper = ParsedPaper(paper_id="p", title="T", authors=["A"], abstract="", full_text="Body",
+                            sections=[], num_pages=1)
+        items = list(extractor.extract_stream(paper))
+        assert [e.experiment_id for e in items] == ["exp_0", "exp_1", "exp_2"]
+
+        async def run():
+            found = [e async for e in extractor.extract_stream_async(paper)]
+            await extractor.llm.aclose()
+            return found
+
+        assert [e.to_dict() for e in asyncio.run(run())] == [e.to_dict() for e in items]
+        print(f"✓ Streamed {len(items)} experiments from {len(chunks)} chunks")
+
+
+if __name__ == "__main__":
+    test_items_arrive_as_they_close()
+    test_truncated_reply_recovered()
+    test_brackets_in_prose_before_document()
+    test_client_fallback_handles_deep_nesting()
+    test_extract_stream_yields_items_early()
+    print("\n✓ All JSON stream tests passed")
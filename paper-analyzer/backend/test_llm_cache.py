@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test the persistent LLM response cache
+"""
+
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from extractors import ExperimentExtractor
+from extractors.deepseek_client import DeepSeekClient
+from extractors.llm_client import BedrockLLMClient
+from extractors.response_cache import CachedLLMClient, LLMResponseCache, cache_key, cache_namespace
+from parsers import ParsedPaper
+from test_llm_pool import MockLLMServer
+
+
+def test_cache_persists_in_wal_mode():
+    """Entries survive reopening the file; the database runs in WAL mode"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "llm.sqlite3"
+        key = cache_key("deepseek", "deepseek-chat", 0.1, 4096, "system", "prompt")
+        assert key != cache_key("deepseek", "deepseek-chat", 0.1, 2048, "system", "prompt")
+
+        cache = LLMResponseCache(path)
+        assert cache.get(key) is None
+        cache.put(key, "reply", tokens=42)
+        cache.close()
+
+        cache = LLMResponseCache(path)
+        assert cache.get(key) == "reply"
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["tokens_saved"] == 42 and stats["entries"] == 1
+        cache.close()
+        assert sqlite3.connect(str(path)).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        print(f"✓ Reopened cache hit: {stats}")
+
+
+def test_lru_eviction_ttl_and_namespaces():
+    """Least recently used entries go first; expired entries miss; namespaces drop separately"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(Path(tmp) / "llm.sqlite3", max_bytes=250)
+        for name in ("a", "b"):
+            cache.put(name, "x" * 100, tokens=1)
+            time.sleep(0.01)
+        assert cache.get("a") is not None  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.put("c", "x" * 100, tokens=1)
+        assert cache.get("b") is None and cache.get("a") and cache.get("c")
+        assert cache.stats()["evictions"] == 1
+
+        with cache_namespace("ExperimentExtractor"):
+            cache.put("d", "x", tokens=1)
+        assert cache.invalidate("ExperimentExtractor") == 1
+        assert cache.get("d") is None and cache.get("a") is not None
+        cache.close()
+
+        cache = LLMResponseCache(Path(tmp) / "ttl.sqlite3", ttl_seconds=0.05)
+        cache.put("e", "x", tokens=1)
+        assert cache.get("e") == "x"
+        time.sleep(0.1)
+        assert cache.get("e") is None and cache.stats()["expired"] == 1
+        cache.close()
+        print("✓ LRU eviction, TTL expiry and namespace invalidation")
+
+
+def test_cached_client_skips_repeated_calls():
+    """Identical calls are answered from the cache, sync and async; mock replies are never stored"""
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer() as server:
+        cache = LLMResponseCache(Path(tmp) / "llm.sqlite3")
+        client = CachedLLMClient(DeepSeekClient("test-key", api_url=server.url), cache)
+
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        assert server.requests == 1
+        client.complete_json("Output only JSON", max_tokens=100)  # different key
+        assert server.requests == 2
+
+        async def run():
+            first = await client.complete_async("hi")
+            second = await client.complete_async("hi")
+            await client.aclose()
+            return first, second
+
+        assert asyncio.run(run()) == ('{"ok": true}', '{"ok": true}')
+        assert server.requests == 3
+        assert "".join(client.complete_streaming("stream please")) == "pooled reply"  # not cached
+
+        mock_client = BedrockLLMClient()
+        mock_client.mock_mode = True
+        CachedLLMClient(mock_client, cache).complete("contribution")
+        stats = cache.stats()
+        assert stats["hits"] == 2 and stats["entries"] == 3 and stats["tokens_saved"] > 0
+        cache.close()
+        print(f"✓ Repeated calls served from cache: {stats}")
+
+
+def test_mock_fallback_on_first_call_not_cached():
+    """A client that falls back to mock mode while connecting during the call leaves the cache empty"""
+    region = settings.aws_region
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(Path(tmp) / "llm.sqlite3")
+        try:
+            settings.aws_region = "not a region!"
+            bedrock = BedrockLLMClient()
+            assert not bedrock.mock_mode  # only known once the call connects
+            client = CachedLLMClient(bedrock, cache)
+            client.complete_json("Extract contributions. Output only JSON")
+            asyncio.run(client.complete_async("contribution"))
+            assert bedrock.mock_mode
+        finally:
+            settings.aws_region = region
+        assert cache.stats()["entries"] == 0
+        cache.close()
+        print("✓ Mock replies of a failed lazy connect not cached")
+
+
+class ThreadRecordingCache(LLMResponseCache):
+    """LLMResponseCache noting the thread of every read and write"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def put(self, key, response, tokens, namespace=None):
+        self.threads.append(threading.get_ident())
+        return super().put(key, response, tokens, namespace)
+
+
+def test_async_calls_keep_sqlite_off_event_loop():
+    """The async calls read and write the cache in a worker thread, under the caller's namespace"""
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer() as server:
+        cache = ThreadRecordingCache(Path(tmp) / "llm.sqlite3")
+        client = CachedLLMClient(DeepSeekClient("test-key", api_url=server.url), cache)
+
+        async def run():
+            with cache_namespace("AsyncCaller"):
+                assert await client.complete_json_async("Output only JSON") == {"ok": True}
+                assert await client.complete_json_async("Output only JSON") == {"ok": True}
+                await client.complete_async("hi")
+            await client.aclose()
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        assert len(cache.threads) == 5 and loop_thread not in cache.threads
+        assert server.requests == 2
+        assert cache.stats()["namespaces"] == {"AsyncCaller": 2}
+        cache.close()
+        print("✓ Async cache reads and writes run off the event loop")
+
+
+def test_truncated_json_not_cached():
+    """A reply cut off at max_tokens is repaired for the caller but asked again next time"""
+    truncated = '```json\n{"experiments": [{"name": "A"}, {"name": "B", "task": "classi'
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer(reply=truncated) as server:
+        cache = LLMResponseCache(Path(tmp) / "llm.sqlite3")
+        client = CachedLLMClient(DeepSeekClient("test-key", api_url=server.url), cache)
+        assert client.complete_json("Output only JSON") == {"experiments": [{"name": "A"}]}
+        assert asyncio.run(client.complete_json_async("Output only JSON")) == {"experiments": [{"name": "A"}]}
+        assert server.requests == 2 and cache.stats()["entries"] == 0
+
+        server.reply = '```json\n{"experiments": [{"name": "A"}]}\n```'
+        client.complete_json("Output only JSON")
+        client.complete_json("Output only JSON")
+        assert server.requests == 3 and cache.stats()["entries"] == 1
+        cache.close()
+        print("✓ Truncated JSON replies not cached, complete ones are")
+
+
+def test_extractor_namespace():
+    """Extractor calls are cached under the extractor's class name"""
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer() as server:
+        cache = LLMResponseCache(Path(tmp) / "llm.sqlite3")
+        extractor = ExperimentExtractor(llm_client=CachedLLMClient(DeepSeekClient("test-key", api_url=server.url), cache))
+        paper = ParsedPaper(paper_id="p", title="T", authors=["A"], abstract="", full_text="Body",
+                            sections=[], num_pages=1)
+        extractor.extract(paper)
+        assert asyncio.run(extractor.extract_async(paper)) == []
+        assert server.requests == 1
+        assert cache.stats()["namespaces"] == {"ExperimentExtractor": 1}
+        cache.close()
+        print("✓ Extraction cached under ExperimentExtractor")
+
+
+if __name__ == "__main__":
+    test_cache_persists_in_wal_mode()
+    test_lru_eviction_ttl_and_namespaces()
+    test_cached_client_skips_repeated_calls()
+    test_mock_fallback_on_first_call_not_cached()
+    test_async_calls_keep_sqlite_off_event_loop()
+    test_truncated_json_not_cached()
+    test_extractor_namespace()
+    print("\n✓ All LLM cache tests passed")
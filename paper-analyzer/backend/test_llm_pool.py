@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Test that DeepSeekClient reuses pooled keep-alive connections
+"""
+
+import base64
+import binascii
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from extractors.deepseek_client import DeepSeekClient
+from parsers.text_normalizer import estimate_tokens
+
+
+def eventstream_message(headers: dict, payload: bytes) -> bytes:
+    """One AWS event stream message (string headers only), as Bedrock response streams send them"""
+    header_bytes = b"".join(
+        struct.pack("!B", len(name)) + name.encode() + struct.pack("!BH", 7, len(value)) + value.encode()
+        for name, value in headers.items())
+    prelude = struct.pack("!II", 16 + len(header_bytes) + len(payload), len(header_bytes))
+    message = prelude + struct.pack("!I", binascii.crc32(prelude)) + header_bytes + payload
+    return message + struct.pack("!I", binascii.crc32(message))
+
+
+def bedrock_stream_events(model_id: str, words, metrics=None) -> list:
+    """
+    Response-stream chunk bodies of the model family _request_body picks for model_id
+
+    metrics (amazon-bedrock-invocationMetrics) goes on the last chunk, as Bedrock sends it.
+    """
+    if "anthropic" in model_id or "claude" in model_id:
+        events = ([{"type": "message_start", "message": {"role": "assistant", "content": []}},
+                   {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}]
+                  + [{"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": word}}
+                     for word in words]
+                  + [{"type": "content_block_stop", "index": 0},
+                     {"type": "message_delta", "delta": {"stop_reason": "end_turn"}},
+                     {"type": "message_stop"}])
+    elif "meta" in model_id or "llama" in model_id:
+        events = ([{"generation": word, "stop_reason": None} for word in words]
+                  + [{"generation": "", "stop_reason": "stop"}])
+    else:
+        events = ([{"choices": [{"index": 0, "delta": {"role": "assistant", "content": word}}]} for word in words]
+                  + [{"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}])
+    if metrics:
+        events[-1]["amazon-bedrock-invocationMetrics"] = metrics
+    return events
+
+
+def prompt_text(payload: dict) -> tuple:
+    """(whole prompt, the part up to the last cache_control marker) of a chat or Anthropic request body"""
+    parts = [payload[key] for key in ("system", "prompt") if isinstance(payload.get(key), str)]
+    marked = None
+    for message in payload.get("messages", []):
+        content = message["content"]
+        blocks = [{"text": content}] if isinstance(content, str) else content
+        for block in blocks:
+            parts.append(block["text"])
+            if "cache_control" in block:
+                marked = len(parts)
+    whole = "".join(parts)
+    return whole, "".join(parts[:marked]) if marked else ""
+
+
+class MockLLMServer:
+    """
+    Local OpenAI-style chat completions server with HTTP/1.1 keep-alive
+
+    connect_delay emulates the per-connection handshake cost (TCP + TLS
+    round trips) of a remote API; every connection pays it once.
+    response_delay emulates generation time; every request pays it.
+    Bedrock InvokeModel paths (/model/<id>/invoke) get an Anthropic-style body;
+    /model/<id>/invoke-with-response-stream gets an event stream of the
+    stream_chunks in the format of the model family named in <id>.
+    failures lists HTTP error statuses returned, in order, before requests
+    succeed; a string entry is sent as that exception event of a response stream.
+    reply is the completion text; stream_chunks are the deltas of a streamed one.
+
+    Replies carry token usage (estimated) with a provider prompt cache:
+    chat completions report the longest prefix shared with an earlier
+    prompt as prompt_cache_hit_tokens, as DeepSeek does; Bedrock replies
+    report the prompt up to a cache_control marker as cache_read_input_tokens
+    once it has been written. prefill_delay emulates prompt processing:
+    seconds per 1000 prompt tokens not served from the cache.
+    """
+
+    def __init__(self, connect_delay: float = 0.0, ssl_context=None, response_delay: float = 0.0,
+                 failures=(), reply: str = '{"ok": true}', stream_chunks=("pooled ", "reply"),
+                 prefill_delay: float = 0.0):
+        self.failures = list(failures)
+        self.reply = reply
+        self.stream_chunks = list(stream_chunks)
+        self.prefill_delay = prefill_delay
+        self.connections = 0
+        self.requests = 0
+        self.last_path = None
+        self.last_headers = None
+        self.last_payload = None
+        self._prompts = []  # chat completion prompts seen, for prefix cache hits
+        self._cached_prefixes = set()  # Bedrock prefixes written by cache_control markers
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # as real API servers do; headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                time.sleep(connect_delay)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    server.last_path, server.last_headers = self.path, dict(self.headers)
+                    server.last_payload = payload
+                    failure = server.failures.pop(0) if server.failures else None
+                time.sleep(response_delay)
+                if isinstance(failure, str):
+                    self._send(200, "application/vnd.amazon.eventstream", eventstream_message(
+                        {":message-type": "exception", ":exception-type": failure,
+                         ":content-type": "application/json"},
+                        json.dumps({"message": f"mock {failure}"}).encode()))
+                    return
+                if failure is not None:
+                    error_type = {403: "AccessDeniedException", 429: "ThrottlingException"}.get(
+                        failure, "ServiceUnavailableException")
+                    data = json.dumps({"message": f"mock {failure}"}).encode()
+                    self.send_response(failure)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("x-amzn-ErrorType", error_type)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                if self.path.endswith("/invoke-with-response-stream"):
+                    model_id = unquote(self.path.split("/")[2])
+                    usage = server._bedrock_usage(payload, "".join(server.stream_chunks))
+                    metrics = {"inputTokenCount": usage["input_tokens"], "outputTokenCount": usage["output_tokens"],
+                               "cacheReadInputTokenCount": usage["cache_read_input_tokens"],
+                               "cacheWriteInputTokenCount": usage["cache_creation_input_tokens"],
+                               "invocationLatency": 1, "firstByteLatency": 1}
+                    events = bedrock_stream_events(model_id, server.stream_chunks, metrics)
+                    self._send(200, "application/vnd.amazon.eventstream", b"".join(
+                        eventstream_message({":event-type": "chunk", ":message-type": "event",
+                                             ":content-type": "application/json"},
+                                            json.dumps({"bytes": base64.b64encode(json.dumps(e).encode()).decode()}).encode())
+                        for e in events))
+                    return
+                if self.path.startswith("/model/"):
+                    body = json.dumps({"content": [{"type": "text", "text": server.reply}],
+                                       "usage": server._bedrock_usage(payload, server.reply)})
+                    content_type = "application/json"
+                elif payload.get("stream"):
+                    events = [{"choices": [{"delta": {"content": word}}]} for word in server.stream_chunks]
+                    if (payload.get("stream_options") or {}).get("include_usage"):
+                        events.append({"choices": [],
+                                       "usage": server._chat_usage(payload, "".join(server.stream_chunks))})
+                    body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+                    content_type = "text/event-stream"
+                else:
+                    body = json.dumps({"choices": [{"message": {"content": server.reply}}],
+                                       "usage": server._chat_usage(payload, server.reply)})
+                    content_type = "application/json"
+                self._send(200, content_type, body.encode())
+
+            def do_GET(self):
+                # OpenAI-style model list (what DeepSeekClient.probe() asks for)
+                with server._lock:
+                    server.requests += 1
+                    server.last_path, server.last_headers = self.path, dict(self.headers)
+                self._send(200, "application/json", json.dumps(
+                    {"object": "list", "data": [{"id": "deepseek-chat", "object": "model"}]}).encode())
+
+            def _send(self, status, content_type, data):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._lock = threading.Lock()
+        class Server(ThreadingHTTPServer):
+            request_queue_size = 128  # the default backlog of 5 drops concurrent connects
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        if ssl_context is not None:
+            self._server.socket = ssl_context.wrap_socket(self._server.socket, server_side=True)
+        scheme = "https" if ssl_context is not None else "http"
+        self.base_url = f"{scheme}://127.0.0.1:{self._server.server_address[1]}"
+        self.url = f"{self.base_url}/v1/chat/completions"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _chat_usage(self, payload: dict, reply: str) -> dict:
+        """DeepSeek-style usage: the longest prefix shared with an earlier prompt is a cache hit"""
+        prompt, _ = prompt_text(payload)
+        with self._lock:
+            shared = max((len(os.path.commonprefix([prompt, seen])) for seen in self._prompts), default=0)
+            self._prompts.append(prompt)
+        total, hit = estimate_tokens(prompt), estimate_tokens(prompt[:shared])
+        time.sleep(self.prefill_delay * (total - hit) / 1000)
+        return {"prompt_tokens": total, "completion_tokens": estimate_tokens(reply),
+                "prompt_cache_hit_tokens": hit, "prompt_cache_miss_tokens": total - hit}
+
+    def _bedrock_usage(self, payload: dict, reply: str) -> dict:
+        """Anthropic-style usage: the prompt up to a cache_control marker is written once, then read"""
+        prompt, marked = prompt_text(payload)
+        read = written = 0
+        if marked:
+            with self._lock:
+                cached = marked in self._cached_prefixes
+                self._cached_prefixes.add(marked)
+            read, written = (estimate_tokens(marked), 0) if cached else (0, estimate_tokens(marked))
+        time.sleep(self.prefill_delay * (estimate_tokens(prompt) - read) / 1000)
+        return {"input_tokens": estimate_tokens(prompt) - read - written, "output_tokens": estimate_tokens(reply),
+                "cache_read_input_tokens": read, "cache_creation_input_tokens": written}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def test_calls_reuse_one_connection():
+    """Sequential complete/complete_streaming calls share one keep-alive connection"""
+    with MockLLMServer() as server:
+        client = DeepSeekClient("test-key", api_url=server.url)
+        for _ in range(5):
+            assert client.complete_json("Output only JSON") == {"ok": True}
+        assert "".join(client.complete_streaming("stream please")) == "pooled reply"
+        assert client.complete("again") == '{"ok": true}'
+
+        stats = client.stats()
+        assert server.requests == 7 and server.connections == 1, (server.requests, server.connections)
+        assert stats == {"requests": 7, "connections_opened": 1, "connections_reused": 6,
+                         "reuse_rate": round(6 / 7, 4)}, stats
+        client.close()
+        print(f"✓ 7 calls over 1 connection: {stats}")
+
+
+def test_pool_limits_concurrent_connections():
+    """Concurrent calls open at most pool_maxsize connections per host"""
+    with MockLLMServer(connect_delay=0.02) as server:
+        client = DeepSeekClient("test-key", api_url=server.url, pool_maxsize=2, pool_block=True)
+        threads = [threading.Thread(target=lambda: [client.complete("hi") for _ in range(3)])
+                   for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = client.stats()
+        assert server.requests == 18 and server.connections <= 2, server.connections
+        assert stats["connections_opened"] == server.connections
+        client.close()
+        print(f"✓ 18 concurrent calls over {server.connections} connections")
+
+
+def test_close_keeps_counts():
+    """close() drops pooled connections; the client reconnects and keeps counting"""
+    with MockLLMServer() as server:
+        client = DeepSeekClient("test-key", api_url=server.url)
+        client.complete("one")
+        client.close()
+        client.complete("two")
+        assert server.connections == 2
+        assert client.stats()["connections_opened"] == 2
+        client.close()
+        print("✓ Reconnect after close() counted")
+
+
+if __name__ == "__main__":
+    test_calls_reuse_one_connection()
+    test_pool_limits_concurrent_connections()
+    test_close_keeps_counts()
+    print("\n✓ All LLM connection pool tests passed")
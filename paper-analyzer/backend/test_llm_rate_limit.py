@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test the process-wide LLM concurrency and rate limiter
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from extractors.deepseek_client import DeepSeekClient
+from extractors.rate_limiter import LLMRateLimiter, RateLimitedLLMClient
+from test_llm_pool import MockLLMServer
+
+
+def test_max_in_flight_is_fifo():
+    """At most max_in_flight calls run; waiting threads are admitted in arrival order"""
+    limiter = LLMRateLimiter(max_in_flight=2)
+    order, running, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def call(i):
+        charged = limiter.acquire(10)
+        with lock:
+            order.append(i)
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        limiter.release(charged)
+
+    threads = []
+    for i in range(8):
+        threads.append(threading.Thread(target=call, args=(i,)))
+        threads[-1].start()
+        time.sleep(0.005)  # fix the arrival order
+    for thread in threads:
+        thread.join()
+
+    stats = limiter.stats()
+    assert peak[0] == 2 and order == list(range(8)), order
+    assert stats["calls"] == 8 and stats["calls_waited"] >= 5 and stats["max_queue_depth"] >= 5
+    assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+    print(f"✓ 8 calls, 2 at a time, in order: {stats}")
+
+
+def test_token_bucket_delays_and_refunds():
+    """Calls wait for the token bucket to refill; unused tokens are given back"""
+    limiter = LLMRateLimiter(max_in_flight=0, tokens_per_minute=120)  # 2 tokens/s
+    limiter.release(limiter.acquire(60))
+    charged = limiter.acquire(60)
+    start = time.perf_counter()
+    limiter.release(charged, used=59)  # refund 1 token: the next call needs 2 more
+    limiter.release(limiter.acquire(3))
+    waited = time.perf_counter() - start
+    assert 0.8 < waited < 1.5, waited
+    stats = limiter.stats()
+    assert stats["tokens_charged"] == 123 and stats["tokens_refunded"] == 1
+    print(f"✓ Token bucket waited {waited:.2f}s")
+
+
+def test_request_bucket_and_async_callers():
+    """Async callers wait without blocking the loop and share the queue with threads"""
+    limiter = LLMRateLimiter(max_in_flight=0, requests_per_minute=120)  # 2 requests/s
+    for _ in range(120):
+        limiter.release(limiter.acquire(1))  # drain the bucket
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        for _ in range(2):
+            limiter.release(await limiter.acquire_async(1))
+        elapsed = time.perf_counter() - start
+        tick_task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    assert 0.8 < elapsed < 1.5, elapsed
+    assert ticks > 40  # the loop kept running while the calls waited
+    print(f"✓ 2 async calls waited {elapsed:.2f}s, loop ticked {ticks} times")
+
+
+def test_cancelled_waiter_leaves_queue():
+    """A cancelled async waiter does not block the callers behind it"""
+    limiter = LLMRateLimiter(max_in_flight=1)
+
+    async def run():
+        held = await limiter.acquire_async(1)
+        waiter = asyncio.create_task(limiter.acquire_async(1))
+        await asyncio.sleep(0.05)
+        assert limiter.stats()["queue_depth"] == 1
+        waiter.cancel()
+        await asyncio.sleep(0)
+        limiter.release(held)
+        limiter.release(await asyncio.wait_for(limiter.acquire_async(1), 1.0))
+
+    asyncio.run(run())
+    assert limiter.stats()["queue_depth"] == 0
+    print("✓ Cancelled waiter removed from the queue")
+
+
+def test_limited_client_admits_each_call_once():
+    """The wrapped client limits complete/complete_json/streaming and keeps the client's own API"""
+    with MockLLMServer() as server:
+        limiter = LLMRateLimiter(max_in_flight=1)
+        client = RateLimitedLLMClient(DeepSeekClient("test-key", api_url=server.url), limiter)
+
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        assert "".join(client.complete_streaming("stream please")) == "pooled reply"
+
+        async def run():
+            parsed = await client.complete_json_async("Output only JSON")
+            chunks = [chunk async for chunk in client.stream_async("stream please")]
+            await client.aclose()
+            return parsed, chunks
+
+        assert asyncio.run(run()) == ({"ok": True}, ["pooled ", "reply"])
+        stats = limiter.stats()
+        assert stats["calls"] == 4 == server.requests and stats["in_flight"] == 0
+        assert stats["tokens_refunded"] > 0
+        assert client.stats()["requests"] == 4  # delegated to the DeepSeek client
+        print(f"✓ 4 limited calls: {stats}")
+
+
+if __name__ == "__main__":
+    test_max_in_flight_is_fifo()
+    test_token_bucket_delays_and_refunds()
+    test_request_bucket_and_async_callers()
+    test_cancelled_waiter_leaves_queue()
+    test_limited_client_admits_each_call_once()
+    print("\n✓ All LLM rate limit tests passed")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test classified retries and the circuit breaker of the LLM clients
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from extractors.deepseek_client import DeepSeekClient
+from extractors.llm_client import BedrockLLMClient
+from extractors.retry import CircuitBreaker, CircuitOpenError, LLMError, RetryPolicy, classify
+from test_llm_pool import MockLLMServer
+
+
+def fast_policy(max_attempts: int = 4, failure_threshold: int = 5, reset_timeout: float = 30.0) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0.01, max_delay=0.05,
+                       breaker=CircuitBreaker(failure_threshold, reset_timeout))
+
+
+def test_classification_and_backoff():
+    """Throttling/5xx are transient, auth/not-found are not; backoff is capped full jitter"""
+    assert classify(LLMError("slow down", status=429))[0]
+    assert classify(LLMError("busy", status=503))[0]
+    assert classify(LLMError("throttled", code="ThrottlingException", retry_after=2.0)) == (True, 2.0)
+    assert not classify(LLMError("denied", status=403, code="AccessDeniedException"))[0]
+    assert not classify(LLMError("missing", status=404, code="ResourceNotFoundException"))[0]
+    assert not classify(KeyError("choices"))[0]
+
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    delays = [policy.backoff(retry) for retry in range(1, 8) for _ in range(50)]
+    assert min(delays) >= 0 and max(delays) <= 5.0
+    assert policy.backoff(1, retry_after=3.0) >= 3.0
+    print("✓ Errors classified, backoff within bounds")
+
+
+def test_deepseek_retries_transient_errors():
+    """429 and 503 are retried, sync and async, streaming included"""
+    with MockLLMServer(failures=[429, 503]) as server:
+        client = DeepSeekClient("test-key", api_url=server.url, retry=fast_policy())
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        assert server.requests == 3
+
+        server.failures = [503]
+        assert "".join(client.complete_streaming("stream please")) == "pooled reply"
+
+        async def run():
+            server.failures = [429]
+            text = await client.complete_async("hi")
+            server.failures = [502]
+            chunks = [chunk async for chunk in client.stream_async("stream please")]
+            await client.aclose()
+            return text, chunks
+
+        assert asyncio.run(run()) == ('{"ok": true}', ["pooled ", "reply"])
+        stats = client.retry_stats()
+        assert stats["calls"] == 4 and stats["retries"] == 5 and stats["succeeded"] == 4
+        assert stats["breaker_state"] == "closed"
+        print(f"✓ Transient errors retried: {stats}")
+
+
+def test_permanent_errors_fail_fast():
+    """Auth errors are raised after one attempt and do not trip the breaker"""
+    with MockLLMServer(failures=[403] * 3) as server:
+        client = DeepSeekClient("test-key", api_url=server.url, retry=fast_policy(failure_threshold=1))
+        for _ in range(3):
+            try:
+                client.complete("hi")
+                assert False, "expected an HTTP error"
+            except Exception as e:
+                assert "403" in str(e)
+        stats = client.retry_stats()
+        assert server.requests == 3 and stats["failed_permanent"] == 3 and stats["retries"] == 0
+        assert stats["breaker_state"] == "closed"
+        print("✓ 403 raised without retries")
+
+
+def test_breaker_opens_and_recovers():
+    """Repeated transient failures open the circuit; a half-open trial closes it again"""
+    with MockLLMServer(failures=[503] * 4) as server:
+        client = DeepSeekClient("test-key", api_url=server.url,
+                                retry=fast_policy(max_attempts=2, failure_threshold=2, reset_timeout=0.3))
+        for _ in range(2):
+            try:
+                client.complete("hi")
+                assert False, "expected an HTTP error"
+            except CircuitOpenError:
+                raise
+            except Exception:
+                pass
+        assert client.retry_stats()["breaker_state"] == "open" and server.requests == 4
+
+        try:
+            client.complete("hi")
+            assert False, "expected CircuitOpenError"
+        except CircuitOpenError as e:
+            print(f"  fast failure: {e}")
+        assert server.requests == 4  # rejected without a request
+
+        time.sleep(0.35)
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        stats = client.retry_stats()
+        assert stats["breaker_state"] == "closed" and stats["times_opened"] == 1 and stats["rejected_open"] == 1
+        print(f"✓ Circuit opened and recovered: {stats}")
+
+
+def test_bedrock_no_longer_falls_back_to_mock():
+    """Bedrock retries throttling and raises permanent errors instead of switching to mock data"""
+    with MockLLMServer(failures=[429]) as server:
+        client = BedrockLLMClient(retry=fast_policy())
+        client.mock_mode = False
+        client.session = boto3.Session(aws_access_key_id="AKIDTEST", aws_secret_access_key="secret",
+                                       region_name="us-east-1")
+        client.bedrock_runtime = client.session.client(
+            "bedrock-runtime", endpoint_url=server.base_url,
+            config=Config(retries={"total_max_attempts": 1, "mode": "standard"}))
+
+        assert client.complete_json("Output only JSON") == {"ok": True}
+        assert server.requests == 2
+
+        server.failures = [403]
+        try:
+            client.complete("hi")
+            assert False, "expected ClientError"
+        except ClientError as e:
+            assert e.response["Error"]["Code"] == "AccessDeniedException"
+
+        async def run():
+            server.failures = [429, 503]
+            result = await client.complete_json_async("Output only JSON")
+            server.failures = [403]
+            try:
+                await client.complete_async("hi")
+                assert False, "expected LLMError"
+            except LLMError as e:
+                assert e.code == "AccessDeniedException" and e.status == 403
+            await client.aclose()
+            return result
+
+        assert asyncio.run(run()) == {"ok": True}
+        assert not client.mock_mode
+        stats = client.retry_stats()
+        assert stats["retries"] == 3 and stats["failed_permanent"] == 2
+        print(f"✓ Bedrock retried throttling, raised AccessDenied, stayed live: {stats}")
+
+
+def test_cancelled_trial_releases_breaker():
+    """A half-open trial that is cancelled or closed early leaves the breaker admitting the next call"""
+    policy = fast_policy(max_attempts=1, failure_threshold=1, reset_timeout=0.0)
+
+    def fail():
+        raise LLMError("busy", status=503)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def hang_stream():
+        await asyncio.sleep(10)
+        yield "never"
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        for abandon in (lambda: asyncio.wait_for(policy.call_async(hang), 0.05),
+                        lambda: asyncio.wait_for(policy.iterate_async(hang_stream).__anext__(), 0.05)):
+            try:
+                policy.call(fail)
+            except LLMError:
+                pass
+            assert policy.breaker.state == "open"  # reset_timeout=0: the next call is the half-open trial
+            try:
+                await abandon()
+                assert False, "expected a timeout"
+            except asyncio.TimeoutError:
+                pass
+            assert policy.breaker.state == "half_open"
+            assert await policy.call_async(ok) == "ok"
+            assert policy.breaker.state == "closed"
+
+    asyncio.run(run())
+
+    # A stream closed after its first item has already closed the breaker; closing one before any releases the trial
+    try:
+        policy.call(fail)
+    except LLMError:
+        pass
+    stream = policy.iterate(lambda: iter(["a", "b"]))
+    assert next(stream) == "a"
+    stream.close()
+    assert policy.breaker.state == "closed"
+    print("✓ Cancelled half-open trials release the breaker")
+
+
+if __name__ == "__main__":
+    test_classification_and_backoff()
+    test_deepseek_retries_transient_errors()
+    test_permanent_errors_fail_fast()
+    test_breaker_opens_and_recovers()
+    test_bedrock_no_longer_falls_back_to_mock()
+    test_cancelled_trial_releases_breaker()
+    print("\n✓ All LLM retry tests passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed parsed-paper cache
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz
+from parsers import PaperParser, ParsedPaperCache
+
+
+def make_pdf(path: Path, pages: int = 3) -> None:
+    """Write a small multi-page paper-like PDF"""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if i == 0:
+            page.insert_text((72, 72), "A Study of Cached Parsing Pipelines")
+            page.insert_text((72, 100), "Alice Smith, Bob Jones")
+            page.insert_text((72, 130), "Abstract")
+            page.insert_text((72, 150), "We show that parsing once is enough.")
+        page.insert_text((72, 200), f"{i + 1} Section Number {i + 1}")
+        page.insert_text((72, 220), f"Body text on page {i + 1}.")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_cache_roundtrip():
+    """Second parse of identical bytes comes from the cache, not PyMuPDF"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path)
+
+        parser = PaperParser(cache=ParsedPaperCache(tmp / "cache"))
+        first = parser.parse_pdf(str(pdf_path), "paper-1")
+
+        # A hit must not touch fitz at all
+        def fail(*args, **kwargs):
+            raise AssertionError("PDF was re-parsed despite a cache entry")
+        parser._iter_page_texts = fail
+
+        second = parser.parse_pdf(str(pdf_path), "paper-2")
+
+        assert second.paper_id == "paper-2"
+        assert second.full_text == first.full_text
+        assert second.sections == first.sections
+        assert second.page_offsets == first.page_offsets
+        assert second.metadata["sha256"] == first.metadata["sha256"]
+
+        stats = parser.cache.stats()
+        print(f"✓ Cache stats: {stats}")
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+def test_page_offsets():
+    """Page offsets point at the start of each page in full_text"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=4)
+
+        paper = PaperParser().parse_pdf(str(pdf_path), "paper-1")
+
+        assert paper.num_pages == 4
+        assert len(paper.page_offsets) == 4
+        assert paper.page_offsets[0] == 0
+        for i, offset in enumerate(paper.page_offsets):
+            assert f"page {i + 1}." in paper.full_text[offset:offset + 200]
+        print(f"✓ Page offsets: {paper.page_offsets}")
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip()
+    test_page_offsets()
+    print("\n✓ All parsed-paper cache tests passed")
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Test sandboxed parsing against a corpus of malformed and huge PDFs
+"""
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz
+from parsers import PaperParser, ParsedPaperCache, ParseSandbox, ParseFailure
+from parsers.sandbox import _descendants
+from test_paper_cache import make_pdf
+
+
+def _flate_bomb(unit: bytes, megabytes: int) -> bytes:
+    """Deflate megabytes of a repeated unit without holding it in memory"""
+    compressor = zlib.compressobj(9)
+    chunk = unit * ((1 << 20) // len(unit))
+    return b"".join(compressor.compress(chunk) for _ in range(megabytes)) + compressor.flush()
+
+
+def _set_raw_stream(doc, xref: int, data: bytes) -> None:
+    doc.update_stream(xref, data, compress=False)
+    doc.xref_set_key(xref, "Filter", "/FlateDecode")
+
+
+def make_content_bomb(path: Path, megabytes: int = 150) -> None:
+    """Small PDF whose page content inflates to megabytes of no-op operators (slow, not big)"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Content bomb")
+    _set_raw_stream(doc, page.get_contents()[0], _flate_bomb(b"q Q ", megabytes))
+    doc.save(str(path))
+    doc.close()
+
+
+def make_font_bomb(path: Path, megabytes: int = 600) -> None:
+    """Small PDF whose embedded font inflates to megabytes that MuPDF loads into memory"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Font bomb", fontname="helv")
+    font_xref = page.get_fonts()[0][0]
+    font_file = doc.get_new_xref()
+    doc.update_object(font_file, "<< >>")
+    _set_raw_stream(doc, font_file, _flate_bomb(b"\0", megabytes))
+    descriptor = doc.get_new_xref()
+    doc.update_object(descriptor, "<< /Type /FontDescriptor /FontName /Helvetica /Flags 32 "
+                                  "/FontBBox [0 0 1000 1000] /ItalicAngle 0 /Ascent 800 /Descent -200 "
+                                  f"/CapHeight 700 /StemV 80 /FontFile2 {font_file} 0 R >>")
+    doc.xref_set_key(font_xref, "Subtype", "/TrueType")
+    doc.xref_set_key(font_xref, "FontDescriptor", f"{descriptor} 0 R")
+    doc.save(str(path))
+    doc.close()
+
+
+def make_malformed_corpus(root: Path) -> dict:
+    """Write the malformed/huge corpus; returns {name: path}"""
+    corpus = {name: root / f"{name}.pdf" for name in
+              ("empty", "garbage", "html", "truncated", "many_pages", "content_bomb", "font_bomb")}
+    corpus["empty"].write_bytes(b"")
+    corpus["garbage"].write_bytes(os.urandom(64 * 1024))
+    corpus["html"].write_bytes(b"<html><body>Not a PDF</body></html>")
+    make_pdf(root / "valid.pdf", pages=6)
+    valid = (root / "valid.pdf").read_bytes()
+    corpus["truncated"].write_bytes(valid[:len(valid) // 2])
+    make_pdf(corpus["many_pages"], pages=1500)
+    make_content_bomb(corpus["content_bomb"])
+    make_font_bomb(corpus["font_bomb"])
+    return corpus
+
+
+def test_malformed_corpus_gets_structured_failures():
+    """Every corpus file ends in a ParseOutcome; bad PDFs fail without hurting this process"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = make_malformed_corpus(tmp)
+        parser = PaperParser(cache=ParsedPaperCache(tmp / "cache"))
+        sandbox = ParseSandbox(workers=1, timeout=1.0, max_rss_mb=300)
+        try:
+            outcomes = {name: sandbox.run(parser, "parse_pdf", str(path), name, None)
+                        for name, path in corpus.items()}
+            for name, outcome in outcomes.items():
+                print(f"  {name:13s} {outcome.status:8s} {outcome.seconds:6.2f}s "
+                      f"{outcome.peak_rss_mb:6.0f} MB  {outcome.error[:60]}")
+
+            for name in ("empty", "garbage"):
+                assert outcomes[name].status == "error", name
+            # MuPDF repairs broken xrefs and sniffs other formats (HTML opens as a document)
+            for name in ("html", "truncated"):
+                assert outcomes[name].status in ("ok", "error"), name
+            assert outcomes["content_bomb"].status == "timeout"
+            assert outcomes["font_bomb"].status == "memory"
+            assert outcomes["content_bomb"].seconds < 3 and outcomes["font_bomb"].seconds < 3
+
+            # Fresh workers replaced the killed ones
+            ok = sandbox.run(parser, "parse_pdf", str(tmp / "valid.pdf"), "valid", None)
+            assert ok.ok and ok.result.num_pages == 6
+            stats = sandbox.stats()
+            assert stats["failures"]["timeout"] == 1 and stats["failures"]["memory"] == 1
+            assert stats["workers_killed"] >= 2
+            print(f"✓ Corpus handled: {stats}")
+        finally:
+            sandbox.close()
+
+
+def test_huge_pdf_parses_within_limits():
+    """A long but valid PDF parses normally and lands in the parent's cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "many_pages.pdf"
+        make_pdf(pdf_path, pages=1500)
+        parser = PaperParser(cache=ParsedPaperCache(tmp / "cache"))
+        sandbox = ParseSandbox(workers=1, timeout=60.0)
+        try:
+            paper = sandbox.parse_pdf(parser, str(pdf_path), "big")
+            assert paper.num_pages == 1500
+            assert parser.cache.stats()["parse_seconds"] > 0
+
+            # Second request is a cache hit in this process, no worker round trip
+            jobs = sandbox.stats()["jobs"]
+            assert sandbox.parse_pdf(parser, str(pdf_path), "big").num_pages == 1500
+            assert sandbox.stats()["jobs"] == jobs
+            print("✓ 1500-page PDF parsed in the sandbox, then served from cache")
+        finally:
+            sandbox.close()
+
+
+def test_parse_failure_raised():
+    """parse_pdf/quick_parse raise ParseFailure carrying the outcome"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "garbage.pdf"
+        pdf_path.write_bytes(b"%PDF-1.7\n" + os.urandom(4096))
+        sandbox = ParseSandbox(workers=1)
+        try:
+            sandbox.quick_parse(PaperParser(), str(pdf_path), "garbage")
+            assert False, "expected ParseFailure"
+        except ParseFailure as e:
+            assert e.outcome.status == "error"
+            print(f"✓ ParseFailure: {e}")
+        finally:
+            sandbox.close()
+
+
+def test_crashed_worker_is_replaced():
+    """A worker that dies mid-job (e.g. a segfault in MuPDF) is reported as crashed"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        make_content_bomb(tmp / "slow.pdf")
+        make_pdf(tmp / "valid.pdf")
+        sandbox = ParseSandbox(workers=1, timeout=30.0)
+        try:
+            def kill_worker():
+                time.sleep(1.0)
+                for child in multiprocessing.active_children():
+                    if child.name == "parse-sandbox":
+                        child.kill()
+            killer = threading.Thread(target=kill_worker)
+            killer.start()
+            outcome = sandbox.run(PaperParser(), "parse_pdf", str(tmp / "slow.pdf"), "slow", None)
+            killer.join()
+            assert outcome.status == "crashed", outcome
+            assert sandbox.run(PaperParser(), "parse_pdf", str(tmp / "valid.pdf"), "valid", None).ok
+            print(f"✓ Crashed worker replaced: {outcome.error}")
+        finally:
+            sandbox.close()
+
+
+def test_workers_recycled_after_max_jobs():
+    """Workers are replaced after max_jobs_per_worker parses"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path)
+        sandbox = ParseSandbox(workers=1, max_jobs_per_worker=2)
+        try:
+            pids = [sandbox.run(PaperParser(), "parse_pdf", str(pdf_path), f"p{i}", None).worker_pid
+                    for i in range(5)]
+            assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+            assert sandbox.stats()["workers_recycled"] == 2
+            print(f"✓ Worker pids across 5 jobs: {pids}")
+        finally:
+            sandbox.close()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def test_workers_run_page_parallel_extraction():
+    """PARSE_WORKERS applies in the sandbox: the worker keeps an extraction pool across jobs and exits with it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=12)
+        serial = PaperParser().parse_pdf(str(pdf_path), "p")
+        parser = PaperParser(workers=2, parallel_min_pages=4)
+        sandbox = ParseSandbox(workers=1, timeout=60.0)
+        try:
+            first = sandbox.run(parser, "parse_pdf", str(pdf_path), "p", None)
+            assert first.ok and first.result.full_text == serial.full_text
+            pool = _descendants(first.worker_pid)
+            assert len(pool) == 2, pool
+            second = sandbox.run(parser, "parse_pdf", str(pdf_path), "p", None)
+            assert second.worker_pid == first.worker_pid and _descendants(second.worker_pid) == pool
+        finally:
+            sandbox.close()
+        deadline = time.time() + 10
+        while any(_alive(pid) for pid in pool) and time.time() < deadline:
+            time.sleep(0.05)
+        assert not any(_alive(pid) for pid in pool)
+        print(f"✓ Sandbox worker {first.worker_pid} extracted pages with pool {pool}")
+
+    # Workers are not daemonic: a process that never calls close() must still exit
+    script = (f"import sys; sys.path.insert(0, {str(Path(__file__).parent)!r})\n"
+              "from parsers import PaperParser, ParseSandbox\n"
+              "from test_paper_cache import make_pdf\n"
+              "import tempfile, pathlib\n"
+              "path = pathlib.Path(tempfile.mkdtemp()) / 'p.pdf'\n"
+              "make_pdf(path, pages=8)\n"
+              "sandbox = ParseSandbox(workers=1)\n"
+              "outcome = sandbox.run(PaperParser(workers=2, parallel_min_pages=1), 'parse_pdf', str(path), 'p', None)\n"
+              "assert outcome.ok, outcome\n")
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60, capture_output=True)
+    print("✓ Process with live sandbox workers exits without close()")
+
+
+if __name__ == "__main__":
+    test_malformed_corpus_gets_structured_failures()
+    test_huge_pdf_parses_within_limits()
+    test_parse_failure_raised()
+    test_crashed_worker_is_replaced()
+    test_workers_recycled_after_max_jobs()
+    test_workers_run_page_parallel_extraction()
+    print("\n✓ All parse sandbox tests passed")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for PaperParser text extraction and structure detection
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers import PaperParser, ParsedPaper
+from parsers.pdf_parser import _PaperScanner
+from test_paper_cache import make_pdf
+
+
+def scan_pages(pages):
+    """Run the single-pass scanner over raw page texts"""
+    scanner = _PaperScanner()
+    sections = []
+    for number, text in enumerate(pages):
+        sections.extend(scanner.feed_page(number, text))
+    sections.extend(scanner.finish())
+    return scanner, sections
+
+
+def test_parallel_matches_serial():
+    """Parallel extraction joins pages in order and matches serial output"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=7)
+
+        serial = PaperParser().parse_pdf(str(pdf_path), "p")
+
+        parser = PaperParser(workers=2, parallel_min_pages=0)
+        try:
+            parallel = parser.parse_pdf(str(pdf_path), "p")
+        finally:
+            parser.close()
+
+        assert parallel.full_text == serial.full_text
+        assert parallel.page_offsets == serial.page_offsets
+        assert parallel.sections == serial.sections
+        print(f"✓ Parallel output matches serial ({parallel.num_pages} pages)")
+
+
+def test_short_paper_stays_serial():
+    """Papers below the page threshold never start the process pool"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=2)
+
+        parser = PaperParser(workers=4, parallel_min_pages=10)
+        parser.parse_pdf(str(pdf_path), "p")
+
+        assert parser._executor is None
+        print("✓ Short paper parsed serially")
+
+
+def test_iter_parse_events():
+    """iter_parse streams pages and closed sections before the final paper"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=5)
+
+        parser = PaperParser()
+        events = list(parser.iter_parse(str(pdf_path), "p"))
+        kinds = [e.kind for e in events]
+
+        assert kinds[-1] == "paper"
+        assert kinds.count("page") == 5
+        paper = events[-1].paper
+        assert [e.section for e in events if e.kind == "section"] == paper.sections
+        assert paper.full_text == parser.parse_pdf(str(pdf_path), "p").full_text
+
+        # Section 1 is closed by the heading on page 2, before page 3 is read
+        first_section = kinds.index("section")
+        assert kinds[:first_section].count("page") == 2
+        print(f"✓ Event order: {' '.join(kinds)}")
+
+
+def test_iter_parse_early_stop():
+    """Consumers can stop after the opening sections"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=5)
+
+        pages_read = 0
+        for event in PaperParser().iter_parse(str(pdf_path), "p"):
+            if event.kind == "page":
+                pages_read += 1
+            if event.kind == "section":
+                break
+
+        assert pages_read == 2
+        print(f"✓ Stopped after {pages_read} of 5 pages")
+
+
+def test_scanner_fields_and_page_spans():
+    """Title, authors, abstract and section page spans from one pass"""
+    pages = [
+        "ICML 2024\nDeep Nets for Everything\nAda Lovelace, Alan Turing\n"
+        "Abstract\nWe propose a method.\nIt works.\n1 Introduction\nIntro text.\n",
+        "More intro.\n2 Method\nMethod text.\n2.1 Details\nDetail text\n",
+        "continues here.\n3 Results\nAll good.",
+    ]
+    scanner, sections = scan_pages(pages)
+    full_text = "\n".join(pages)
+
+    assert scanner.title == "Deep Nets for Everything"
+    assert scanner.authors == ["Ada Lovelace", "Alan Turing"]
+    assert scanner.abstract(full_text) == "We propose a method.\nIt works."
+
+    spans = [(s.number, s.title, s.level, s.start_page, s.end_page) for s in sections]
+    assert spans == [
+        ("1", "Introduction", 1, 0, 1),
+        ("2", "Method", 1, 1, 1),
+        ("2.1", "Details", 2, 1, 2),
+        ("3", "Results", 1, 2, 2),
+    ]
+    # Content spans the page break exactly as full_text.split('\n') would
+    assert sections[2].content == "Detail text\n\ncontinues here."
+    print(f"✓ Sections: {spans}")
+
+
+def test_scanner_abstract_without_introduction():
+    """No end keyword: abstract runs to the end of the text"""
+    pages = ["A Paper With No Intro Heading\nABSTRACT: short summary here"]
+    scanner, _ = scan_pages(pages)
+    assert scanner.abstract(pages[0]) == ": short summary here"
+    assert scanner.authors == []
+
+
+def test_page_index():
+    """page_of / slice_pages map between offsets and pages"""
+    pages = ["first page\n", "second\n", "", "fourth page text"]
+    paper = ParsedPaper(paper_id="p", title="t", full_text="\n".join(pages),
+                        page_offsets=[0, 12, 20, 21])
+
+    assert paper.page_offsets.typecode == 'I'
+    for number, page_text in enumerate(pages):
+        assert paper.slice_pages(number, number + 1) == page_text
+        if page_text:
+            offset = paper.full_text.index(page_text)
+            assert paper.page_of(offset) == number
+            assert paper.page_of(offset + len(page_text) - 1) == number
+
+    assert paper.slice_pages(1, 3) == "second\n\n"
+    assert paper.slice_pages(0, 99) == paper.full_text
+    assert paper.slice_pages(3, 1) == ""
+    assert paper.page_of(10 ** 6) == 3
+    print("✓ Page index lookups")
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_short_paper_stays_serial()
+    test_iter_parse_events()
+    test_iter_parse_early_stop()
+    test_scanner_fields_and_page_spans()
+    test_scanner_abstract_without_introduction()
+    test_page_index()
+    print("\n✓ All parser tests passed")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test the shared-prefix prompt layout and the prompt cache usage recorded per call
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import extractors
+from config import settings
+from extractors.base import LLMExtractor
+from extractors.context_budget import ContextBudget
+from extractors.deepseek_client import DeepSeekClient
+from extractors.prompt_cache import shared_prefix, usage_from_bedrock, usage_from_openai
+from parsers import ParsedPaper
+from parsers.text_normalizer import estimate_tokens
+from test_bedrock_streaming import live_client
+from test_context_budget import make_paper_text
+from test_llm_pool import MockLLMServer
+
+# Every single-prompt extractor, as the API's extract routes run them
+ALL_EXTRACTORS = tuple(getattr(extractors, name) for name in extractors.__all__
+                       if name.endswith("Extractor") and issubclass(getattr(extractors, name), LLMExtractor))
+
+
+class RecordingLLM:
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = []
+
+    def complete_json(self, prompt, system_prompt=None):
+        self.calls.append((system_prompt, prompt))
+        return {}
+
+
+def make_extractor(cls, llm):
+    """Extractor using llm instead of the global client"""
+    extractor = cls.__new__(cls)
+    extractor.llm = llm
+    return extractor
+
+
+def make_paper(sections: int = 30) -> ParsedPaper:
+    return ParsedPaper(paper_id="p1", title="Shared Prefix Paper", full_text=make_paper_text(sections=sections))
+
+
+def test_extractors_share_paper_prefix():
+    """All extractors send the same system prompt and a byte-identical paper prefix, then their own task"""
+    assert len(ALL_EXTRACTORS) == 17
+    paper = make_paper()
+    llm = RecordingLLM("anthropic.claude-3-7-sonnet-20250219-v1:0")
+    for cls in ALL_EXTRACTORS:
+        make_extractor(cls, llm).extract(paper)
+
+    system_prompts = {system for system, _ in llm.calls}
+    assert system_prompts == {LLMExtractor.SYSTEM_PROMPT}
+    prefix = os.path.commonprefix([prompt for _, prompt in llm.calls])
+    assert prefix.endswith("=== EXTRACTION TASK ===\n\n"), prefix[-80:]
+    assert str(paper.llm_text) in prefix
+    tasks = {prompt[len(prefix):] for _, prompt in llm.calls}
+    assert len(tasks) == 17
+    print(f"✓ 17 prompts share a {estimate_tokens(prefix)} token prefix")
+
+    # A small window cuts the paper the same way for every task that fits the reserve (all of them here)
+    llm = RecordingLLM("meta.llama3-8b-instruct-v1:0")
+    paper = make_paper(sections=120)
+    budget = ContextBudget.for_client(llm, LLMExtractor.MAX_OUTPUT_TOKENS)
+    for cls in ALL_EXTRACTORS:
+        make_extractor(cls, llm).extract(paper)
+    prefixes = [prompt[:prompt.index("=== EXTRACTION TASK ===")] for _, prompt in llm.calls]
+    shared = max(prefixes.count(prefix) for prefix in prefixes)
+    assert shared == 17, shared
+    for system_prompt, prompt in llm.calls:
+        assert estimate_tokens(system_prompt) + estimate_tokens(prompt) <= budget.input_tokens
+    print(f"✓ 8k window: {shared} of 17 prompts share the cut paper prefix")
+
+
+def test_usage_parsing():
+    """Provider usage objects map to input/cached/output token counts"""
+    assert usage_from_openai({"prompt_tokens": 1000, "completion_tokens": 50, "prompt_cache_hit_tokens": 900,
+                              "prompt_cache_miss_tokens": 100}) == {
+        "input_tokens": 1000, "cached_tokens": 900, "output_tokens": 50}
+    assert usage_from_openai({"prompt_tokens": 10, "completion_tokens": 5,
+                              "prompt_tokens_details": {"cached_tokens": 8}})["cached_tokens"] == 8
+    assert usage_from_bedrock({"usage": {"input_tokens": 100, "output_tokens": 20, "cache_read_input_tokens": 900,
+                                         "cache_creation_input_tokens": 0}}) == {
+        "input_tokens": 1000, "cached_tokens": 900, "cache_write_tokens": 0, "output_tokens": 20}
+    assert usage_from_bedrock({"type": "message_delta", "usage": {"output_tokens": 7}}) == {"output_tokens": 7}
+    assert usage_from_bedrock({"prompt_token_count": 30, "generation_token_count": 4, "generation": ""}) == {
+        "input_tokens": 30, "output_tokens": 4}
+    assert usage_from_bedrock({"generation": "x"}) == {}
+    print("✓ DeepSeek and Bedrock usage parsed")
+
+
+def test_deepseek_reports_prefix_cache_hits():
+    """After the first extraction of a paper, most input tokens come from DeepSeek's prefix cache"""
+    paper = make_paper()
+    with MockLLMServer() as server:
+        client = DeepSeekClient("test-key", api_url=server.url)
+        for cls in ALL_EXTRACTORS:
+            make_extractor(cls, client).extract(paper)
+        items = list(make_extractor(extractors.ClaimsExtractor, client).extract_stream(paper))
+        assert items == []
+        client.close()
+
+    stats = client.usage_stats()
+    assert stats["calls"] == 18 and len(stats["by_namespace"]) == 17
+    assert stats["recent_calls"][0]["cached_tokens"] == 0
+    assert stats["cache_hit_rate"] > 0.85, stats["cache_hit_rate"]
+    # The streamed call's usage comes from its last chunk
+    streamed = stats["recent_calls"][-1]
+    assert streamed["namespace"] == "ClaimsExtractor" and streamed["cached_tokens"] > 0
+    print(f"✓ DeepSeek: {stats['cached_tokens']} of {stats['input_tokens']} input tokens cached "
+          f"({stats['cache_hit_rate']:.0%})")
+
+
+def test_bedrock_marks_prefix_for_supported_models():
+    """Anthropic models with prompt caching get a cache_control block after the prefix; others a plain prompt"""
+    paper = make_paper()
+    model_id, caching = settings.bedrock_model_id, settings.llm_prompt_caching
+    try:
+        with MockLLMServer() as server:
+            settings.bedrock_model_id = "anthropic.claude-3-7-sonnet-20250219-v1:0"
+            client = live_client(server)
+            for cls in (extractors.ClaimsExtractor, extractors.DatasetsExtractor, extractors.MetricsExtractor):
+                make_extractor(cls, client).extract(paper)
+            blocks = server.last_payload["messages"][0]["content"]
+            assert isinstance(blocks, list) and len(blocks) == 2
+            assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+            assert blocks[0]["text"].endswith("=== EXTRACTION TASK ===\n\n") and "cache_control" not in blocks[1]
+            stats = client.usage_stats()
+            calls = stats["recent_calls"]
+            assert calls[0]["cache_write_tokens"] > 0 and calls[0]["cached_tokens"] == 0
+            assert all(call["cached_tokens"] == calls[0]["cache_write_tokens"] for call in calls[1:])
+            print(f"✓ Claude 3.7: prefix written once, read by {len(calls) - 1} calls ({stats['cache_hit_rate']:.0%})")
+
+            # Streaming records the invocation metrics of the last chunk
+            _, system_prompt = client._json_prompts("", LLMExtractor.SYSTEM_PROMPT)
+            with shared_prefix(blocks[0]["text"]):
+                text = "".join(client.complete_streaming(blocks[0]["text"] + "stream the task", system_prompt))
+            assert text == "pooled reply"
+            assert client.usage_stats()["recent_calls"][-1]["cached_tokens"] == calls[0]["cache_write_tokens"]
+
+            settings.llm_prompt_caching = False
+            make_extractor(extractors.ClaimsExtractor, client).extract(paper)
+            assert isinstance(server.last_payload["messages"][0]["content"], str)
+            settings.llm_prompt_caching = True
+
+            settings.bedrock_model_id = "anthropic.claude-3-5-sonnet-20240620-v1:0"
+            make_extractor(extractors.ClaimsExtractor, client).extract(paper)
+            assert isinstance(server.last_payload["messages"][0]["content"], str)
+            print("✓ No marker when disabled or unsupported by the model")
+    finally:
+        settings.bedrock_model_id, settings.llm_prompt_caching = model_id, caching
+
+
+if __name__ == "__main__":
+    test_extractors_share_paper_prefix()
+    test_usage_parsing()
+    test_deepseek_reports_prefix_cache_hits()
+    test_bedrock_marks_prefix_for_supported_models()
+    print("\n✓ All prompt cache tests passed")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the first-page fast path: quick upload response, full parse in the background
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+import api.app as app_module
+from parsers import PaperParser, hash_file
+from parsers.pdf_parser import QUICK_PARSE_MAX_PAGES
+from test_paper_cache import make_pdf
+from test_upload_dedup import use_temp_data_dirs
+
+
+def test_quick_parse_matches_full_parse():
+    """Leading-page fields match the full parse; the result is marked partial"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_pdf(pdf_path, pages=6)
+        parser = PaperParser()
+        quick = parser.quick_parse(str(pdf_path), "p1", max_pages=1)
+        full = parser.parse_pdf(str(pdf_path), "p1")
+
+        assert (quick.title, quick.authors) == (full.title, full.authors)
+        assert quick.abstract.startswith("We show that parsing once is enough.")
+        assert quick.num_pages == full.num_pages == 6
+        assert len(quick.page_offsets) <= QUICK_PARSE_MAX_PAGES  # keeps reading while the abstract is open
+        assert quick.metadata["partial"] is True
+        assert quick.sections == [] and quick.full_text == ""
+        print(f"✓ Quick parse: {quick.title!r}, {quick.authors}")
+
+
+def test_quick_upload_fills_cache_in_background():
+    """Upload answers from page one, then the background parse replaces the metadata"""
+    original = (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+                app_module._paper_index, app_module._paper_parser)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        use_temp_data_dirs(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path, pages=5)
+
+        try:
+            with TestClient(app_module.app) as client:
+                with open(pdf_path, "rb") as f:
+                    response = client.post("/api/papers", files={"file": ("paper.pdf", f, "application/pdf")})
+                assert response.status_code == 200
+                paper = response.json()
+                assert paper["status"] == "parsing"
+                assert paper["title"] == "A Study of Cached Parsing Pipelines"
+                assert paper["num_pages"] == 5
+
+                deadline = time.time() + 30
+                while client.get(f"/api/jobs/{paper['paper_id']}").json()["status"] not in ("processed", "failed"):
+                    assert time.time() < deadline
+                    time.sleep(0.05)
+
+                assert client.get(f"/api/papers/{paper['paper_id']}").json()["status"] == "processed"
+                assert app_module._paper_parser.cache.contains(hash_file(pdf_path))
+
+                # Extraction-time load is a cache hit, not a second parse
+                hits = app_module._paper_parser.cache.hits
+                stored = app_module.UPLOAD_DIR / f"{paper['paper_id']}.pdf"
+                full = client.portal.call(app_module.load_full_paper, paper["paper_id"], stored)
+                assert full.num_pages == 5
+                assert app_module._paper_parser.cache.hits == hits + 1
+                print(f"✓ Quick upload {paper['paper_id']} fully parsed in the background")
+        finally:
+            (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+             app_module._paper_index, app_module._paper_parser) = original
+
+
+if __name__ == "__main__":
+    test_quick_parse_matches_full_parse()
+    test_quick_upload_fills_cache_in_background()
+    print("\n✓ All quick upload tests passed")
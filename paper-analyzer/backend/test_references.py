@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test bibliography detection, entry splitting and title/year parsing
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers.references import ReferenceSplitter, parse_reference
+from parsers.text_normalizer import TextNormalizer
+
+NUMBERED_PAGES = [
+    "5 Conclusion\nWe conclude the paper here.\nReferences\n"
+    "[1] Jimmy Lei Ba, Jamie Ryan Kiros, and Geoffrey E Hinton. Layer normalization. arXiv\n"
+    "preprint arXiv:1607.06450, 2016.\n"
+    "[2] Dzmitry Bahdanau, Kyunghyun Cho, and Yoshua Bengio. Neural machine translation by jointly\n"
+    "learning to align and translate. CoRR, abs/1409.0473, 2014.",
+    "[3] A. Vaswani, N. Shazeer. “Attention is all you need,” in NeurIPS, 2017.\n"
+    "A Proofs\nProof of Theorem 1 follows.",
+]
+
+AUTHOR_YEAR_TEXT = (
+    "Intro text.\nReferences\n"
+    "Audemard, G. and Simon, L. (2009). Predicting learnt clauses quality in\n"
+    "modern sat solvers. In IJCAI.\n"
+    "Balyo, T., Heule, M. J. H., and Järvisalo, M. 2017. SAT Competition. In\n"
+    "Proceedings of SAT Competition.\n"
+    "Saeed Amizadeh, Sergiy Matusevych, and Markus Weimer. Learning to solve circuit-SAT: An\n"
+    "unsupervised differentiable approach. In ICLR, 2019."
+)
+
+
+def test_numbered_bibliography_across_pages():
+    """Numbered list spanning a page break is removed and parsed; appendix stays in the body"""
+    normalizer = TextNormalizer()
+    for page in NUMBERED_PAGES:
+        normalizer.observe_page(page)
+    body = "\n".join(normalizer.clean_pages(NUMBERED_PAGES))
+    refs = normalizer.references
+
+    assert "References" not in body and "Layer normalization" not in body
+    assert "We conclude the paper here." in body
+    assert "A Proofs\nProof of Theorem 1 follows." in body
+    assert [r.label for r in refs] == ["1", "2", "3"]
+    assert refs[0].title == "Layer normalization" and refs[0].year == "2016"
+    assert refs[1].title == "Neural machine translation by jointly learning to align and translate"
+    assert refs[2].title == "Attention is all you need" and refs[2].year == "2017"
+    report = normalizer.report()
+    assert report["references"] == 3
+    assert report["clean_chars"] == len(body)
+    print(f"✓ Numbered bibliography: {len(refs)} entries, {report['reference_chars_removed']} chars removed")
+
+
+def test_author_year_bibliography():
+    """Author-year entries are split on author-looking lines after a full stop"""
+    splitter = ReferenceSplitter()
+    body = splitter.feed(AUTHOR_YEAR_TEXT) + splitter.finish()
+    refs = splitter.references
+
+    assert body == "Intro text."
+    assert len(refs) == 3
+    assert [r.year for r in refs] == ["2009", "2017", "2019"]
+    assert refs[0].title == "Predicting learnt clauses quality in modern sat solvers"
+    assert refs[1].title == "SAT Competition"
+    assert refs[2].title.startswith("Learning to solve circuit-SAT")
+    print("✓ Author-year bibliography parsed")
+
+
+def test_table_of_contents_heading_is_not_a_bibliography():
+    """A heading followed by fewer than MIN_REFERENCES entries is given back to the body"""
+    text = "Contents\n1 Introduction\nReferences\nAppendix\nA Proofs"
+    splitter = ReferenceSplitter()
+    body = splitter.feed(text) + splitter.finish()
+    assert body == text
+    assert splitter.references == []
+    assert parse_reference(1, "", "Smith, J.: Deep nets. In: Proc. (2020)").title == "Deep nets"
+    print("✓ Table-of-contents heading left in place")
+
+
+if __name__ == "__main__":
+    test_numbered_bibliography_across_pages()
+    test_author_year_bibliography()
+    test_table_of_contents_heading_is_not_a_bibliography()
+    print("\n✓ All reference tests passed")
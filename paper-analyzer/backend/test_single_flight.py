@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test single-flight coalescing of concurrent extractions
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+import api.app as app_module
+from api.single_flight import SingleFlight
+from extractors import ExperimentExtractor
+from extractors.deepseek_client import DeepSeekClient
+from test_llm_pool import MockLLMServer
+from test_paper_cache import make_pdf
+from test_upload_dedup import use_temp_data_dirs
+
+
+def test_concurrent_requests_share_one_extraction():
+    """Simultaneous POSTs for the same extraction make one LLM call and one write"""
+    original = (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR, app_module._paper_index,
+                app_module._paper_parser, app_module._experiment_extractor, app_module._single_flight)
+    flags = (app_module.settings.upload_quick_parse, app_module.settings.parse_sandbox)
+    with tempfile.TemporaryDirectory() as tmp, MockLLMServer(response_delay=0.3) as server:
+        tmp = Path(tmp)
+        use_temp_data_dirs(tmp)
+        app_module.settings.upload_quick_parse = False
+        app_module.settings.parse_sandbox = False
+        app_module._single_flight = None
+        llm = DeepSeekClient("test-key", api_url=server.url)
+        app_module._experiment_extractor = ExperimentExtractor(llm_client=llm)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path)
+
+        async def run():
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                with open(pdf_path, "rb") as f:
+                    upload = await client.post("/api/papers", files={"file": ("paper.pdf", f, "application/pdf")})
+                paper_id = upload.json()["paper_id"]
+                url = f"/api/papers/{paper_id}/extract/experiments"
+                responses = await asyncio.gather(*(client.post(url) for _ in range(5)))
+            await llm.aclose()
+            return paper_id, responses
+
+        try:
+            paper_id, responses = asyncio.run(run())
+            assert all(r.status_code == 200 for r in responses)
+            assert len({r.text for r in responses}) == 1
+            assert server.requests == 1
+            assert (app_module.EXTRACTED_DIR / f"{paper_id}_experiments.json").exists()
+            assert not list(app_module.EXTRACTED_DIR.glob("*.tmp"))
+            stats = app_module._single_flight.stats()
+            assert stats["computed"] == 1 and stats["coalesced"] == 4 and stats["in_flight"] == 0
+            print(f"✓ 5 concurrent requests, 1 LLM call: {stats}")
+        finally:
+            (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR, app_module._paper_index,
+             app_module._paper_parser, app_module._experiment_extractor, app_module._single_flight) = original
+            app_module.settings.upload_quick_parse, app_module.settings.parse_sandbox = flags
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    """The first caller going away leaves the extraction running for the others"""
+    flight = SingleFlight(tempfile.mkdtemp())
+    runs = []
+
+    async def compute():
+        runs.append(1)
+        await asyncio.sleep(0.2)
+        return "result"
+
+    async def run():
+        first = asyncio.create_task(flight.run("key", compute, lambda: None))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(flight.run("key", compute, lambda: None))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == ("result", False) and len(runs) == 1
+    print("✓ Shared extraction survived the leader's cancellation")
+
+
+def _worker_run(lock_dir: str, result_file: str, results) -> None:
+    """One 'uvicorn worker': extract unless another worker already saved the result"""
+    flight = SingleFlight(lock_dir)
+    path = Path(result_file)
+
+    async def compute():
+        await asyncio.sleep(0.5)
+        path.write_text("extracted")
+        return "extracted"
+
+    def saved():
+        return path.read_text() if path.exists() else None
+
+    results.put(asyncio.run(flight.run(("paper", "ExperimentExtractor", 1), compute, saved)))
+
+
+def test_lock_file_coalesces_across_processes():
+    """A second process waits for the first one's lock and then finds the saved result"""
+    if not SingleFlight(tempfile.mkdtemp()).stats()["cross_process"]:
+        print("⚠️  No fcntl here, skipping")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        args = (str(Path(tmp) / "locks"), str(Path(tmp) / "result.json"), results)
+        workers = [context.Process(target=_worker_run, args=args) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+            time.sleep(0.1)
+        outcomes = sorted(results.get(timeout=30) for _ in workers)
+        for worker in workers:
+            worker.join()
+        assert outcomes == [("extracted", False), ("extracted", True)], outcomes
+        print(f"✓ Two processes, one extraction: {outcomes}")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_extraction()
+    test_cancelled_caller_does_not_cancel_shared_work()
+    test_lock_file_coalesces_across_processes()
+    print("\n✓ All single-flight tests passed")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test table rebuilding from captions and word positions
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz
+from parsers import PaperParser, ParsedPaperCache, Table, format_tables
+from parsers.tables import extract_tables, has_table_caption
+from parsers.text_normalizer import estimate_tokens
+from extractors.context_budget import ContextBudget
+from extractors.ablation_extractor import AblationExtractor
+from extractors.experiment_extractor import ExperimentExtractor
+
+ROWS = [
+    ("Model", "BLEU", "Params", "Time (h)"),
+    ("Baseline", "25.8", "65M", "12.1"),
+    ("Ours w/o attention", "26.4", "60M", "9.8"),
+    ("Ours", "28.4", "213M", "3.5"),
+]
+COLUMN_X = (72, 230, 300, 370)
+
+
+def make_table_pdf(path: Path, caption_below: bool = False) -> None:
+    """Two-page paper; page 2 has a booktabs-style table (no rules) with prose around it"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), "Tables Without Rules")
+    page.insert_text((72, 100), "Alice Smith")
+    page.insert_text((72, 130), "Abstract")
+    page.insert_text((72, 150), "We rebuild tables from word positions.")
+
+    page = doc.new_page()
+    page.insert_text((72, 72), "4 Results")
+    page.insert_text((72, 90), "The results of all models are summarised in the table below for reference.")
+    caption_y, first_row_y = (260, 160) if caption_below else (130, 160)
+    page.insert_text((72, caption_y), "Table 2: Translation quality and training cost on WMT14.")
+    for i, row in enumerate(ROWS):
+        for x, cell in zip(COLUMN_X, row):
+            page.insert_text((x, first_row_y + 18 * i), cell)
+    page.insert_text((72, 320), "Our model outperforms the baseline by a wide margin while training much faster.")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_table_rebuilt_below_caption():
+    """Rows and columns come back intact, prose around the table is left out"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_table_pdf(pdf_path)
+        doc = fitz.open(pdf_path)
+        assert not has_table_caption(doc[0].get_text())
+        assert has_table_caption(doc[1].get_text())
+        tables = extract_tables(doc, [1])
+        doc.close()
+
+        assert len(tables) == 1
+        table = tables[0]
+        assert table.label == "2" and table.page == 1
+        assert table.caption.startswith("Translation quality")
+        assert table.rows == [list(row) for row in ROWS], table.rows
+        print(f"✓ Rebuilt:\n{table.to_text()}")
+
+
+def test_table_rebuilt_above_caption():
+    """Captions below their table (IEEE/ACM style) are found too"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_table_pdf(pdf_path, caption_below=True)
+        doc = fitz.open(pdf_path)
+        tables = extract_tables(doc, [1])
+        doc.close()
+        assert len(tables) == 1 and tables[0].rows == [list(row) for row in ROWS], tables
+        print("✓ Table found above its caption")
+
+
+def test_parser_and_cache_keep_tables():
+    """PaperParser attaches tables; a cache hit restores them"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_table_pdf(pdf_path)
+        parser = PaperParser(cache=ParsedPaperCache(tmp / "cache"))
+        first = parser.parse_pdf(str(pdf_path), "p1")
+        second = parser.parse_pdf(str(pdf_path), "p1")
+        assert parser.cache.stats()["hits"] == 1
+        assert len(first.tables) == 1 and second.tables == first.tables
+        assert isinstance(second.tables[0], Table)
+
+        assert PaperParser(tables=False).parse_pdf(str(pdf_path), "p1").tables == []
+        print("✓ Tables survive the parse cache")
+
+
+def test_format_tables_budget():
+    """Tables that do not fit are skipped; preferred captions go first"""
+    tables = [Table("1", "Main results", 3, [["a", "b"]] * 20),
+              Table("2", "Ablation of the encoder", 5, [["x", "y"]] * 3)]
+    full = format_tables(tables, 10000)
+    assert full.index("Table 1") < full.index("Table 2")
+    assert format_tables(tables, 10000, prefer=AblationExtractor.ABLATION_CAPTION_PATTERN).startswith("Table 2")
+    small = format_tables(tables, 80)
+    assert "Table 1" not in small and "Table 2" in small
+    assert "... 19 more rows" in format_tables(tables, 10000, max_rows=1)
+    assert format_tables([], 1000) == ""
+    print("✓ Table block stays within its budget")
+
+
+def test_experiment_prompt_includes_tables():
+    """Tables go into the experiment prompt within the same overall budget"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "paper.pdf"
+        make_table_pdf(pdf_path)
+        paper = PaperParser().parse_pdf(str(pdf_path), "p1")
+        paper.clean_text = "x" * 50000
+
+        class RecordingLLM:
+            model = "meta.llama3-8b-instruct-v1:0"  # 8k context window
+
+            def complete_json(self, prompt, system_prompt=None):
+                self.prompt = prompt
+                return {"experiments": []}
+
+        llm = RecordingLLM()
+        ExperimentExtractor(llm_client=llm).extract(paper)
+        assert "Ours w/o attention | 26.4 | 60M | 9.8" in llm.prompt
+        # The table's share comes out of the text's token budget
+        budget = ContextBudget.for_client(llm)
+        assert "x" * 50000 not in llm.prompt
+        assert estimate_tokens(ExperimentExtractor.SYSTEM_PROMPT) + estimate_tokens(llm.prompt) <= budget.input_tokens
+        print("✓ Experiment prompt carries the table")
+
+
+if __name__ == "__main__":
+    test_table_rebuilt_below_caption()
+    test_table_rebuilt_above_caption()
+    test_parser_and_cache_keep_tables()
+    test_format_tables_budget()
+    test_experiment_prompt_includes_tables()
+    print("\n✓ All table tests passed")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test header/footer removal, hyphen joining and whitespace collapsing
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from parsers import PaperParser, ParsedPaperCache
+from parsers.text_normalizer import TextNormalizer, estimate_tokens
+from test_paper_cache import make_pdf
+
+
+TOPICS = ["graphs", "solvers", "datasets", "training", "results"]
+
+
+def make_pages() -> list:
+    pages = []
+    for i, topic in enumerate(TOPICS):
+        pages.append(
+            "Published as a conference paper at ICLR 2024\n"
+            f"This page covers {topic} and the ﬁrst   idea of a hyphen-\n"
+            f"ated word about {topic}.\n\n\n\n"
+            f"Closing remarks on {topic}.\n"
+            f"{i + 1}"
+        )
+    return pages
+
+
+def test_normalizer_cleans_pages():
+    """Repeated headers, page numbers, ligatures and hyphen breaks are removed"""
+    pages = make_pages()
+    normalizer = TextNormalizer()
+    for page in pages:
+        normalizer.observe_page(page)
+    clean = "\n".join(normalizer.clean_pages(pages))
+    report = normalizer.report()
+
+    assert "Published as a conference paper" not in clean
+    assert "hyphenated word" in clean
+    assert "first idea" in clean
+    assert "\n\n\n" not in clean
+    assert report["header_footer_lines_removed"] == 5
+    assert report["page_numbers_removed"] == 5
+    assert report["raw_chars"] == len("\n".join(pages))
+    assert report["clean_chars"] == len(clean)
+    assert 0 < report["char_reduction"] < 1
+    assert report["clean_tokens_est"] < report["raw_tokens_est"]
+    print(f"✓ Normalizer report: {report}")
+
+
+def test_hyphen_across_page_break():
+    """A word split across pages is rejoined into a single chunk"""
+    pages = ["Intro text with a split exam-", "ple continues here.", "Last page."]
+    normalizer = TextNormalizer()
+    for page in pages:
+        normalizer.observe_page(page)
+    chunks = list(normalizer.clean_pages(pages))
+    assert chunks == ["Intro text with a split example continues here.", "Last page."]
+    assert estimate_tokens("example") == 2
+    print("✓ Cross-page hyphen rejoined")
+
+
+def test_parser_stores_clean_text():
+    """clean_text and the report are produced by the parser and survive the cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path, pages=4)
+
+        for disk_text in (False, True):
+            parser = PaperParser(cache=ParsedPaperCache(tmp / f"cache_{disk_text}"), disk_text=disk_text)
+            paper = parser.parse_pdf(str(pdf_path), "p1")
+            assert paper.llm_text == paper.clean_text
+            assert len(paper.clean_text) <= len(paper.full_text)
+            assert paper.metadata["normalization"]["raw_chars"] == len(paper.full_text)
+
+            cached = parser.parse_pdf(str(pdf_path), "p2")
+            assert str(cached.clean_text) == str(paper.clean_text)
+            assert cached.metadata["normalization"] == paper.metadata["normalization"]
+
+        raw = PaperParser(normalize=False).parse_pdf(str(pdf_path), "p3")
+        assert raw.clean_text == ""
+        assert raw.llm_text == raw.full_text
+        print("✓ Parser stores clean_text next to full_text")
+
+
+if __name__ == "__main__":
+    test_normalizer_cleans_pages()
+    test_hyphen_across_page_break()
+    test_parser_stores_clean_text()
+    print("\n✓ All text normalizer tests passed")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test that re-uploading the same PDF returns the existing paper
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.testclient import TestClient
+import api.app as app_module
+from parsers import PaperParser, ParsedPaperCache, ParseFailure, ParseOutcome
+from test_paper_cache import make_pdf
+
+
+def use_temp_data_dirs(root: Path) -> None:
+    """Point the app at empty data directories"""
+    app_module.UPLOAD_DIR = root / "uploads"
+    app_module.EXTRACTED_DIR = root / "extracted"
+    app_module.UPLOAD_DIR.mkdir()
+    app_module.EXTRACTED_DIR.mkdir()
+    app_module._paper_index = None
+    app_module._paper_parser = PaperParser(cache=ParsedPaperCache(root / "cache"))
+
+
+def test_duplicate_upload_returns_existing_paper():
+    """Second upload of identical bytes reuses paper_id and cached extractions"""
+    original = (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+                app_module._paper_index, app_module._paper_parser)
+    quick_parse = app_module.settings.upload_quick_parse
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        use_temp_data_dirs(tmp)
+        app_module.settings.upload_quick_parse = False  # index the first upload synchronously
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path)
+        client = TestClient(app_module.app)
+
+        def upload(name):
+            with open(pdf_path, "rb") as f:
+                response = client.post("/api/papers", files={"file": (name, f, "application/pdf")})
+            assert response.status_code == 200
+            return response.json()
+
+        try:
+            first = upload("paper.pdf")
+            assert first["duplicate"] is False
+
+            contributions = [{"contribution_type": "Novel Algorithm", "specific_innovation": "x",
+                              "problem_addressed": "y", "evidence_location": "Section 1", "comment": ""}]
+            contrib_file = app_module.EXTRACTED_DIR / f"{first['paper_id']}_contributions.json"
+            contrib_file.write_text(json.dumps(contributions))
+
+            second = upload("renamed.pdf")
+            assert second["duplicate"] is True
+            assert second["paper_id"] == first["paper_id"]
+            assert second["extractions"] == {"contributions": contributions}
+            assert len(list(app_module.UPLOAD_DIR.iterdir())) == 1
+            print(f"✓ Duplicate upload mapped to {second['paper_id']}")
+        finally:
+            (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR,
+             app_module._paper_index, app_module._paper_parser) = original
+            app_module.settings.upload_quick_parse = quick_parse
+
+
+def test_duplicate_upload_while_parsing():
+    """The same PDF uploaded again during its background parse maps to the first paper; a failed parse frees it"""
+    original = (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR, app_module._paper_index,
+                app_module._paper_parser, app_module.parse_pdf_file)
+    release = threading.Event()
+    fail = []
+
+    def slow_parse_pdf_file(*args):
+        release.wait(30)
+        if fail:
+            raise ParseFailure(ParseOutcome(status="error", error="broken"))
+        return original[4](*args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        use_temp_data_dirs(tmp)
+        pdf_path = tmp / "paper.pdf"
+        make_pdf(pdf_path)
+        app_module.parse_pdf_file = slow_parse_pdf_file
+        try:
+            with TestClient(app_module.app) as client:
+                def upload(name):
+                    with open(pdf_path, "rb") as f:
+                        response = client.post("/api/papers", files={"file": (name, f, "application/pdf")})
+                    assert response.status_code == 200
+                    return response.json()
+
+                def wait_for_job(job_id):
+                    deadline = time.time() + 30
+                    while client.get(f"/api/jobs/{job_id}").json()["status"] not in ("processed", "failed"):
+                        assert time.time() < deadline
+                        time.sleep(0.05)
+
+                first = upload("paper.pdf")
+                assert first["status"] == "parsing" and first["duplicate"] is False
+                second = upload("again.pdf")
+                assert second["duplicate"] is True and second["paper_id"] == first["paper_id"]
+                assert second["status"] == "parsing" and second["title"] == first["title"]
+                assert len(list(app_module.UPLOAD_DIR.glob("*.pdf"))) == 1
+                assert list(app_module._parse_tasks) == [first["paper_id"]]  # one full parse
+
+                release.set()
+                wait_for_job(first["paper_id"])
+                third = upload("third.pdf")
+                assert third["duplicate"] is True and third["status"] == "processed"
+                print(f"✓ Upload during parse mapped to {second['paper_id']}")
+
+                # A failed parse lets the next upload of the same bytes start over
+                (tmp / "retry").mkdir()
+                use_temp_data_dirs(tmp / "retry")
+                release.clear()
+                fail.append(True)
+                failing = upload("paper.pdf")
+                release.set()
+                wait_for_job(failing["paper_id"])
+                fail.clear()
+                retried = upload("paper.pdf")
+                assert retried["duplicate"] is False and retried["paper_id"] != failing["paper_id"]
+                wait_for_job(retried["paper_id"])
+                print("✓ Failed parse releases the pending upload")
+        finally:
+            (app_module.UPLOAD_DIR, app_module.EXTRACTED_DIR, app_module._paper_index,
+             app_module._paper_parser, app_module.parse_pdf_file) = original
+
+
+if __name__ == "__main__":
+    test_duplicate_upload_returns_existing_paper()
+    test_duplicate_upload_while_parsing()
+    print("\n✓ All upload dedup tests passed")